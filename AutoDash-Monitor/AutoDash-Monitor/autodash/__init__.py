@@ -1 +1,5 @@
-from .main import main
+# The GUI (PyQt5/pyqtgraph) is only imported when main() is called, so the
+# sampler, logger and log reader can be used on machines without Qt.
+def main(**kwargs):
+    from .main import main as _main
+    return _main(**kwargs)
@@ -0,0 +1,194 @@
+import time
+_t0 = time.perf_counter()
+import argparse, os, signal, sys, threading
+
+def _rss_mb():
+    import psutil
+    return psutil.Process().memory_info().rss / 1048576
+
+def run_headless(args):
+    from .monitor import Monitor
+    from .sampler import Sampler
+    from .logging_utils import BinaryLogger
+    from .alerts import AlertEngine, AlertLog
+
+    # no Qt, no process table, no long-term tiers: just sample and log
+    monitor = Monitor(history_len=300, tiers=[], core_history_len=1)
+    sampler = Sampler(monitor, interval=args.interval, proc_limit=0)
+    logger = None
+    alerts = AlertEngine()
+    if not args.no_log:
+        logger = BinaryLogger(log_dir=args.log_dir)
+        sampler.bus.subscribe(lambda f: logger.log(f.snap, f.t), interval=args.log_interval)
+        alerts.sinks.append(AlertLog(args.log_dir))
+    if not args.quiet:
+        alerts.sinks.append(lambda a: print(f"alert {a.state}: {a.message}", file=sys.stderr, flush=True))
+    sampler.bus.subscribe(alerts.evaluate)
+    if not args.quiet:
+        sampler.bus.subscribe(lambda f: print(f"cpu {f.snap['cpu_total']:5.1f}%  ram {f.snap['ram_percent']:5.1f}%  "
+                                              f"net ↓{f.snap['net_down_bps']/1024:.0f} ↑{f.snap['net_up_bps']/1024:.0f} KB/s", flush=True),
+                              interval=args.log_interval)
+
+    exporter = None
+    if args.export:
+        from .exporter import MetricsExporter
+        exporter = MetricsExporter(sampler.bus, monitor.history, *args.export)
+        exporter.start()
+        print(f"autodash headless: serving metrics on http://{exporter.address[0]}:{exporter.address[1]}/metrics", file=sys.stderr)
+
+    agent = None
+    if args.agent:
+        from .remote import Agent
+        agent = Agent(sampler.bus, args.agent, name=args.name, interval=args.log_interval)
+        agent.start()
+        print(f"autodash headless: streaming as {agent.name!r} to {args.agent[0]}:{args.agent[1]}", file=sys.stderr)
+
+    done = threading.Event()
+    signal.signal(signal.SIGINT, lambda *a: done.set())
+    signal.signal(signal.SIGTERM, lambda *a: done.set())
+    sampler.start()
+    print(f"autodash headless: startup {(time.perf_counter() - _t0) * 1000:.0f} ms, RSS {_rss_mb():.1f} MB, "
+          f"logging to {logger.file_path if logger else 'nowhere'}", file=sys.stderr, flush=True)
+    done.wait(args.duration)
+    sampler.stop()
+    monitor.close()
+    if exporter: exporter.stop()
+    if agent: agent.stop()
+    if logger: logger.close()
+    if args.profile:
+        from .profiler import PROFILER
+        me = PROFILER.process()
+        print(PROFILER.format(), file=sys.stderr)
+        print(f"own CPU {me['cpu_percent']:.2f}% of one core, RSS {me['rss'] / 1048576:.1f} MB, {me['threads']} threads", file=sys.stderr)
+    print(f"autodash headless: stopped, RSS {_rss_mb():.1f} MB", file=sys.stderr)
+
+def _speed(value):
+    if value == "max": return None
+    try:
+        x = float(value)
+    except ValueError:
+        x = None
+    if x is None or not 1.0 <= x <= 100.0:
+        raise argparse.ArgumentTypeError(f"expected 1 to 100 or max, got {value!r}")
+    return x
+
+def _load_replay(args, **kwargs):
+    from .replay import ReplayMonitor, load_records, log_files
+    records = load_records(args.replay)
+    if not len(records):
+        sys.exit(f"no samples in {', '.join(log_files(args.replay)) or ' '.join(args.replay)}")
+    print(f"autodash replay: {len(records)} samples at {'max' if not args.speed else f'{args.speed:g}x'} speed",
+          file=sys.stderr, flush=True)
+    return ReplayMonitor(records, speed=args.speed, **kwargs)
+
+def run_replay(args):
+    # headless replay: alerts against recorded samples, then the throughput summary
+    from .sampler import Sampler
+    from .alerts import AlertEngine
+
+    monitor = _load_replay(args, history_len=300, tiers=[], core_history_len=1)
+    sampler = Sampler(monitor, proc_limit=0, tick_hist=monitor.stats.tick)
+    alerts = AlertEngine()
+    if not args.quiet:
+        alerts.sinks.append(lambda a: print(f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(a.t))} "
+                                            f"alert {a.state}: {a.message}", flush=True))
+    sampler.bus.subscribe(alerts.evaluate)
+    exporter = None
+    if args.export:
+        from .exporter import MetricsExporter
+        exporter = MetricsExporter(sampler.bus, monitor.history, *args.export)
+        exporter.start()
+    signal.signal(signal.SIGINT, lambda *a: monitor.finished.set())
+    sampler.start()
+    monitor.finished.wait(args.duration)
+    sampler.stop()
+    if exporter: exporter.stop()
+    print(monitor.stats.format(), file=sys.stderr)
+
+def run_bench(args):
+    from .monitor import Monitor
+    from .sampler import Sampler
+    from .stress import Benchmark, WORKLOADS, save_results, load_results, format_results
+
+    workloads = args.bench.split(",") if args.bench != "all" else list(WORKLOADS)
+    unknown = [w for w in workloads if w not in WORKLOADS]
+    if unknown:
+        sys.exit(f"unknown workload(s): {', '.join(unknown)} (choose from {', '.join(WORKLOADS)})")
+    baseline = load_results(args.compare) if args.compare else None
+    os.makedirs(args.bench_dir, exist_ok=True)
+    # the sampler runs alongside so the results carry the load and thermal curve
+    monitor = Monitor(history_len=60, tiers=[], core_history_len=1)
+    sampler = Sampler(monitor, proc_limit=0)
+    sampler.start()
+    try:
+        bench = Benchmark(sampler.bus, workloads=workloads, seconds=args.bench_seconds, load=args.load / 100.0,
+                          tmp_dir=args.bench_dir)
+        results = bench.run(progress=lambda msg: print(f"running {msg} ...", file=sys.stderr, flush=True))
+    finally:
+        sampler.stop()
+        monitor.close()
+    path = save_results(results, args.bench_dir)
+    print(format_results(results, baseline))
+    print(f"saved {path}", file=sys.stderr)
+
+def _address(value):
+    host, _, port = value.rpartition(":")
+    return (host or "127.0.0.1", int(port))
+
+def build_parser():
+    p = argparse.ArgumentParser(prog="autodash", description="AutoDash system monitor")
+    p.add_argument("--headless", action="store_true", help="sample and log without the GUI (no Qt import)")
+    p.add_argument("--interval", type=float, default=None, help="sampler tick in seconds (default: fastest collector)")
+    p.add_argument("--log-interval", type=float, default=1.0, help="seconds between logged rows")
+    p.add_argument("--log-dir", default="logs")
+    p.add_argument("--no-log", action="store_true", help="don't write metric logs (headless)")
+    p.add_argument("--duration", type=float, default=None, help="stop after N seconds (headless)")
+    p.add_argument("--quiet", action="store_true", help="don't print samples to stdout (headless)")
+    p.add_argument("--export", type=_address, metavar="[HOST:]PORT",
+                   help="serve Prometheus text at /metrics and JSON at /metrics.json, /history.json")
+    p.add_argument("--agent", type=_address, metavar="HOST:PORT",
+                   help="stream samples to a collector (implies --headless)")
+    p.add_argument("--name", default=None, help="host name reported by --agent (default: hostname)")
+    p.add_argument("--collect", type=_address, metavar="[HOST:]PORT",
+                   help="accept --agent streams and show them in a Fleet tab (GUI)")
+    p.add_argument("--gpu-backend", choices=["nvml", "sysfs", "gputil", "fake", "none"],
+                   help="GPU metrics source (default: first that works of nvml, sysfs, gputil)")
+    p.add_argument("--cgroup", nargs="?", const="auto", metavar="PATH",
+                   help="report CPU, memory, disk I/O and pressure of a cgroup v2 (default: our own) instead of the host")
+    p.add_argument("--profile", action="store_true",
+                   help="time AutoDash's own stages (Diagnostics tab; printed on exit when headless)")
+    p.add_argument("--bench", nargs="?", const="all", metavar="WORKLOADS",
+                   help="run benchmarks (comma-separated: cpu,numpy,memory,disk_seq,disk_rand; default all) and exit")
+    p.add_argument("--bench-seconds", type=float, default=5.0, help="measured seconds per benchmark run")
+    p.add_argument("--bench-dir", default="benchmarks", help="where results (and disk test files) go")
+    p.add_argument("--load", type=float, default=100.0, help="duty cycle per benchmark worker, in percent")
+    p.add_argument("--compare", metavar="RESULTS.json", help="show throughput relative to an earlier --bench result")
+    p.add_argument("--replay", nargs="+", metavar="LOG",
+                   help="play recorded logs (metrics_*.csv / .adl files, globs or a log directory) instead of live data")
+    p.add_argument("--speed", type=_speed, default=1.0, metavar="X|max",
+                   help="replay speed: 1 to 100 times recorded time, or max (default 1)")
+    p.add_argument("--exit-at-end", action="store_true",
+                   help="close the window when the replay ends (e.g. with QT_QPA_PLATFORM=offscreen as a render benchmark)")
+    return p
+
+def cli(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.gpu_backend:
+        os.environ["AUTODASH_GPU_BACKEND"] = args.gpu_backend
+    if args.cgroup:
+        os.environ["AUTODASH_CGROUP"] = args.cgroup
+    if args.profile:
+        from .profiler import PROFILER
+        PROFILER.enable()
+    if args.bench:
+        return run_bench(args)
+    if args.replay and args.headless:
+        return run_replay(args)
+    if args.headless or args.agent:
+        return run_headless(args)
+    from .main import main
+    replay = _load_replay(args) if args.replay else None
+    return main(export=args.export, collect=args.collect, replay=replay, exit_at_end=args.exit_at_end)
+
+if __name__ == "__main__":
+    cli()
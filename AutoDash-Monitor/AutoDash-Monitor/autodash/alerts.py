@@ -0,0 +1,380 @@
+import collections, datetime, fnmatch, math, os, re, threading, traceback
+
+from .profiler import PROFILER
+
+# ---------------- streaming statistics (O(1) per sample) ----------------
+
+class EWMA:
+    # Time-aware exponential average: a sample's weight halves every `halflife` seconds.
+    def __init__(self, halflife):
+        self.halflife = halflife
+        self.value = None
+        self._t = None
+
+    def add(self, t, v):
+        if self.value is None:
+            self.value = v
+        else:
+            alpha = 1.0 - math.exp(-max(0.0, t - self._t) * math.log(2) / self.halflife)
+            self.value += alpha * (v - self.value)
+        self._t = t
+        return self.value
+
+class RollingStats:
+    # Mean and standard deviation over the last `window` seconds, updated with
+    # Welford's method as samples enter and leave the deque. Removing large values
+    # from a window of small ones loses precision, so mean and M2 are recomputed
+    # from the window after each window's worth of evictions, and whenever M2 gets
+    # small next to the magnitudes seen since (amortized O(1) per sample). A window
+    # of equal values has std exactly 0.
+    def __init__(self, window):
+        self.window = window
+        self._q = collections.deque()
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._scale = 0.0  # largest |value| since the last recompute
+        self._evicted = 0
+        self._run = 0  # trailing samples equal to the newest one
+
+    def add(self, t, v):
+        q = self._q
+        self._run = self._run + 1 if q and q[-1][1] == v else 1
+        q.append((t, v))
+        n = len(q)
+        d = v - self._mean
+        self._mean += d / n
+        self._m2 += d * (v - self._mean)
+        self._scale = max(self._scale, abs(v))
+        while q[0][0] < t - self.window:
+            _, old = q.popleft()
+            n -= 1
+            d = old - self._mean
+            self._mean -= d / n
+            self._m2 -= d * (old - self._mean)
+            self._evicted += 1
+        if self._run < n and (self._evicted >= n or self._m2 < 1e-9 * n * self._scale * self._scale):
+            self._resync()
+
+    def _resync(self):
+        vals = [v for _, v in self._q]
+        self._mean = math.fsum(vals) / len(vals)
+        self._m2 = math.fsum((v - self._mean) ** 2 for v in vals)
+        self._scale = max(map(abs, vals))
+        self._evicted = 0
+
+    def __len__(self):
+        return len(self._q)
+
+    @property
+    def mean(self):
+        if not self._q: return None
+        return self._q[-1][1] if self._run >= len(self._q) else self._mean
+
+    @property
+    def std(self):
+        n = len(self._q)
+        if n < 2: return None
+        if self._run >= n: return 0.0
+        return math.sqrt(max(0.0, self._m2 / (n - 1)))
+
+class P2Quantile:
+    # Jain & Chlamtac's P-square estimator: five markers track the p-quantile
+    # without storing samples.
+    def __init__(self, p):
+        self.p = p
+        self._init = []
+        self.q = None
+
+    def add(self, x):
+        if self.q is None:
+            self._init.append(x)
+            if len(self._init) == 5:
+                p = self.p
+                self.q = sorted(self._init)
+                self.n = [0, 1, 2, 3, 4]
+                self.want = [0.0, 2 * p, 4 * p, 2 + 2 * p, 4.0]
+                self.step = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+            return
+        q, n = self.q, self.n
+        if x < q[0]:
+            q[0] = x; k = 0
+        elif x >= q[4]:
+            q[4] = x; k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]: k += 1
+        for i in range(k + 1, 5): n[i] += 1
+        for i in range(5): self.want[i] += self.step[i]
+        for i in (1, 2, 3):
+            d = self.want[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                qp = q[i] + d / (n[i + 1] - n[i - 1]) * ((n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                                                         + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+                if not q[i - 1] < qp < q[i + 1]:
+                    qp = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = qp; n[i] += d
+
+    def value(self):
+        if self.q is not None: return self.q[2]
+        if not self._init: return None
+        s = sorted(self._init)
+        return s[min(len(s) - 1, int(self.p * len(s)))]
+
+class WindowQuantile:
+    # P-square over tumbling windows: reports the last complete window's quantile
+    # (the running one until the first window closes).
+    def __init__(self, p, window):
+        self.p, self.window = p, window
+        self._cur, self._prev, self._start = P2Quantile(p), None, None
+
+    def add(self, t, v):
+        if self._start is None: self._start = t
+        if t - self._start >= self.window:
+            self._prev, self._cur, self._start = self._cur, P2Quantile(self.p), t
+        self._cur.add(v)
+        return (self._prev or self._cur).value()
+
+# Rule statistics: name -> factory(window) -> f(t, v) returning the value compared
+# against the threshold (None while warming up).
+def _value(window):
+    return lambda t, v: v
+
+def _ewma(window):
+    return EWMA(window / 2).add
+
+def _mean(window):
+    rs = RollingStats(window)
+    def f(t, v):
+        rs.add(t, v); return rs.mean
+    return f
+
+def _std(window):
+    rs = RollingStats(window)
+    def f(t, v):
+        rs.add(t, v); return rs.std
+    return f
+
+def _zscore(window):
+    # deviation of the new sample from the window *before* it, in standard deviations
+    rs = RollingStats(window)
+    def f(t, v):
+        z = None
+        if len(rs) >= 10:
+            std = rs.std
+            z = (v - rs.mean) / std if std else 0.0
+        rs.add(t, v)
+        return z
+    return f
+
+def _quantile(p):
+    return lambda window: WindowQuantile(p, window).add
+
+STATS = {"value": _value, "ewma": _ewma, "mean": _mean, "std": _std, "z": _zscore,
+         "p50": _quantile(0.5), "p90": _quantile(0.9), "p95": _quantile(0.95), "p99": _quantile(0.99)}
+
+# ---------------- metrics ----------------
+
+SCALAR_FIELDS = ["cpu_total", "ram_percent", "net_up_bps", "net_down_bps", "disk_read_bps", "disk_write_bps",
+                 "cpu_throttled", "psi_cpu_some", "psi_memory_some", "psi_memory_full", "psi_io_some", "psi_io_full"]
+
+def metrics(snap):
+    # flat name -> number view of a snapshot; per-core, per-GPU and per-device values are
+    # cpu_core[i], gpu_temp[i], disk_busy[sda], nic_down_bps[eth0] ...
+    m = {k: snap.get(k) for k in SCALAR_FIELDS}
+    gpu = snap.get("gpu") or {}
+    m["gpu_load"] = gpu.get("load")
+    m["gpu_temp"] = gpu.get("temp")
+    for g in snap.get("gpus") or ():
+        m[f"gpu_load[{g['index']}]"] = g.get("load")
+        m[f"gpu_temp[{g['index']}]"] = g.get("temp")
+    temps = [e["current"] for entries in (snap.get("temps") or {}).values() for e in entries if e["current"] is not None]
+    m["temp_max"] = max(temps) if temps else None
+    for i, v in enumerate(snap.get("cpu_per_core") or ()):
+        m[f"cpu_core[{i}]"] = v
+    for name, d in (snap.get("nics") or {}).items():
+        m[f"nic_up_bps[{name}]"] = d["up_bps"]
+        m[f"nic_down_bps[{name}]"] = d["down_bps"]
+    for name, d in (snap.get("disks") or {}).items():
+        m[f"disk_busy[{name}]"] = d["busy"]
+        m[f"disk_read_lat_ms[{name}]"] = d["read_lat_ms"]
+        m[f"disk_write_lat_ms[{name}]"] = d["write_lat_ms"]
+    return m
+
+# ---------------- rules ----------------
+
+_RULE_RE = re.compile(r"""^\s*(?:(?P<stat>\w+)\(\s*(?P<m1>[\w\[\]*]+)\s*(?:,\s*(?P<window>[\d.]+)\s*s)?\s*\)|(?P<m2>[\w\[\]*]+))
+                          \s*(?P<op>[<>])\s*(?P<threshold>[-+\d.eE]+)
+                          (?:\s+for\s+(?P<for_s>[\d.]+)\s*s)?\s*$""", re.X)
+
+Alert = collections.namedtuple("Alert", ["t", "rule", "key", "state", "value", "severity", "message"])
+
+class Rule:
+    # `expr` reads "[stat(]metric[, N s)] > threshold [for N s]", e.g.
+    #   "cpu_total > 95 for 30s", "z(disk_write_bps, 120s) > 4 for 5s", "cpu_core[*] > 98 for 60s"
+    # A firing rule resolves once the statistic is back past `clear` (hysteresis;
+    # defaults to the threshold) and can't fire again for `cooldown` seconds.
+    def __init__(self, name, expr, clear=None, cooldown=300.0, severity="warning", message=None):
+        m = _RULE_RE.match(expr)
+        if not m: raise ValueError(f"bad alert rule: {expr!r}")
+        self.name = name
+        self.expr = expr
+        self.stat = m["stat"] or "value"
+        if self.stat not in STATS: raise ValueError(f"unknown statistic {self.stat!r} in {expr!r}")
+        self.metric = m["m1"] or m["m2"]
+        self.window = float(m["window"] or 60.0)
+        self.op = m["op"]
+        self.threshold = float(m["threshold"])
+        self.clear = self.threshold if clear is None else float(clear)
+        self.for_s = float(m["for_s"] or 0.0)
+        self.cooldown = cooldown
+        self.severity = severity
+        self.message = message or f"{expr}: {{key}} = {{value:.1f}}"
+        self.enabled = True
+
+    def set_threshold(self, threshold):
+        # keeps the hysteresis gap
+        self.clear += threshold - self.threshold
+        self.threshold = threshold
+
+    def breached(self, x):
+        return x > self.threshold if self.op == ">" else x < self.threshold
+
+    def cleared(self, x):
+        return x < self.clear if self.op == ">" else x > self.clear
+
+    def keys(self, available):
+        if "*" not in self.metric:
+            return [self.metric] if self.metric in available else []
+        # brackets are literal in metric names, not fnmatch character classes
+        pattern = self.metric.replace("[", "[[]")
+        return [k for k in available if fnmatch.fnmatchcase(k, pattern)]
+
+DEFAULT_RULES = [
+    Rule("cpu", "cpu_total > 95 for 30s", clear=85, message="CPU usage high: {value:.0f}%"),
+    Rule("ram", "ram_percent > 95 for 10s", clear=90, message="RAM usage high: {value:.0f}%"),
+    Rule("gpu_temp", "gpu_temp[*] > 85 for 10s", clear=80, message="GPU temperature high: {key} {value:.0f}°C"),
+    Rule("temp", "temp_max > 85 for 10s", clear=80, message="Temperature high: {value:.0f}°C"),
+    Rule("core", "cpu_core[*] > 98 for 120s", clear=90, cooldown=900, severity="info",
+         message="{key} pegged at {value:.0f}% for 2 min"),
+    Rule("disk", "z(disk_write_bps, 120s) > 6 for 5s", clear=2, severity="info",
+         message="Unusual disk write rate ({value:.1f}σ above the last 2 min)"),
+    Rule("disk_busy", "mean(disk_busy[*], 30s) > 95 for 60s", clear=80, severity="info",
+         message="{key} saturated ({value:.0f}% busy)"),
+    # cgroup mode only (the fields are missing otherwise)
+    Rule("throttle", "cpu_throttled > 50 for 60s", clear=20, severity="info",
+         message="CPU quota throttling in {value:.0f}% of periods"),
+    Rule("memory_pressure", "psi_memory_full > 10 for 30s", clear=2,
+         message="Memory pressure: all tasks stalled {value:.0f}% of the time"),
+    Rule("net", "z(net_down_bps, 120s) > 6 for 5s", clear=2, severity="info",
+         message="Unusual download rate ({value:.1f}σ above the last 2 min)"),
+]
+
+class _State:
+    __slots__ = ("stat", "since", "firing", "last_fired")
+
+    def __init__(self, stat):
+        self.stat = stat
+        self.since = None
+        self.firing = False
+        self.last_fired = None
+
+class AlertEngine:
+    # Evaluates rules against every frame on the sampler thread (subscribe
+    # `evaluate` to the bus). Each (rule, metric key) pair has its own statistic
+    # and state: ok -> pending (breached, waiting out `for`) -> firing -> resolved.
+    # Events go to `sinks`, plain callables taking an Alert.
+    # Keys that have been gone for `forget_after` seconds (an unplugged disk, a
+    # NIC that went away) lose their state, as their history columns do.
+    def __init__(self, rules=None, sinks=None, forget_after=300.0):
+        self.rules = [Rule(r.name, r.expr, r.clear, r.cooldown, r.severity, r.message)
+                      for r in (DEFAULT_RULES if rules is None else rules)]
+        self.sinks = list(sinks or [])
+        self.forget_after = forget_after
+        self._states = {}
+        self._keys = None
+        self._matched = {}
+        self._gone = {}  # key -> time it was last missing from a frame's metrics
+        self._lock = threading.Lock()
+
+    def rule(self, name):
+        return next((r for r in self.rules if r.name == name), None)
+
+    def add_rule(self, rule):
+        with self._lock:
+            self.rules = [r for r in self.rules if r.name != rule.name] + [rule]
+            self._keys = None  # re-match wildcards
+            self._states = {k: s for k, s in self._states.items() if k[0] != rule.name}
+
+    def active(self):
+        with self._lock:
+            return [(name, key) for (name, key), st in self._states.items() if st.firing]
+
+    def evaluate(self, frame):
+        with PROFILER.stage("alerts"):
+            m = metrics(frame.snap)
+            t = frame.t
+            events = []
+            with self._lock:
+                keys = tuple(m)
+                if keys != self._keys:  # cores, GPUs or devices came or went
+                    for key in set(self._keys or ()).difference(keys): self._gone[key] = t
+                    for key in keys: self._gone.pop(key, None)
+                    self._keys = keys
+                    self._matched = {r.name: r.keys(self._keys) for r in self.rules}
+                if self._gone: self._forget(t)
+                for rule in self.rules:
+                    if not rule.enabled: continue
+                    for key in self._matched.get(rule.name, ()):
+                        v = m[key]
+                        if v is None or v != v: continue  # missing or NaN: no sample, state unchanged
+                        st = self._states.get((rule.name, key))
+                        if st is None:
+                            st = self._states[(rule.name, key)] = _State(STATS[rule.stat](rule.window))
+                        ev = self._step(rule, key, st, t, float(v))
+                        if ev: events.append(ev)
+            for ev in events:
+                for sink in self.sinks:
+                    try:
+                        sink(ev)
+                    except Exception:
+                        traceback.print_exc()
+            return events
+
+    def _forget(self, t):
+        expired = {key for key, since in self._gone.items() if t - since >= self.forget_after}
+        if not expired: return
+        for key in expired: del self._gone[key]
+        self._states = {k: s for k, s in self._states.items() if k[1] not in expired}
+
+    def _step(self, rule, key, st, t, v):
+        x = st.stat(t, v)
+        if x is None: return None
+        if not st.firing:
+            if not rule.breached(x):
+                st.since = None
+                return None
+            if st.since is None: st.since = t
+            if t - st.since < rule.for_s: return None
+            if st.last_fired is not None and t - st.last_fired < rule.cooldown: return None
+            st.firing, st.last_fired = True, t
+            return Alert(t, rule.name, key, "firing", x, rule.severity, rule.message.format(key=key, value=x))
+        if rule.cleared(x):
+            st.firing, st.since = False, None
+            return Alert(t, rule.name, key, "resolved", x, rule.severity, f"Cleared: {rule.expr} ({key} = {x:.1f})")
+        return None
+
+class AlertLog:
+    # Appends one tab-separated line per alert event to logs/alerts_<date>.log.
+    def __init__(self, log_dir="logs"):
+        self.log_dir = log_dir
+        os.makedirs(self.log_dir, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def __call__(self, alert):
+        when = datetime.datetime.fromtimestamp(alert.t)
+        path = os.path.join(self.log_dir, f"alerts_{when.date().isoformat()}.log")
+        line = "\t".join([when.isoformat(timespec="seconds"), alert.state, alert.severity, alert.rule,
+                          alert.key, f"{alert.value:.3f}", alert.message]) + "\n"
+        with self._lock, open(path, "a", encoding="utf-8") as f:
+            f.write(line)
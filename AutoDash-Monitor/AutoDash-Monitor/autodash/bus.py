@@ -0,0 +1,46 @@
+import threading, traceback
+
+class Subscription:
+    def __init__(self, bus, callback, interval=None):
+        self.bus = bus
+        self.callback = callback
+        self.interval = interval
+        self.due = None
+
+    def offer(self, frame):
+        if self.interval:
+            if self.due is not None and frame.t < self.due - 0.01:
+                return
+            # anchored schedule keeps the average rate exact; resync if we fell behind
+            self.due = (self.due or frame.t) + self.interval
+            if self.due < frame.t: self.due = frame.t + self.interval
+        self.callback(frame)
+
+    def cancel(self):
+        self.bus.unsubscribe(self)
+
+class SnapshotBus:
+    # Fan-out of sampler frames. Consumers only ever see published frames, so any
+    # number of them can attach without touching Monitor's rate/history state.
+    def __init__(self):
+        self._subs = []
+        self._lock = threading.Lock()
+        self.latest = None
+
+    def subscribe(self, callback, interval=None):
+        sub = Subscription(self, callback, interval)
+        with self._lock:
+            self._subs = self._subs + [sub]
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            self._subs = [s for s in self._subs if s is not sub]
+
+    def publish(self, frame):
+        self.latest = frame
+        for sub in self._subs:
+            try:
+                sub.offer(frame)
+            except Exception:
+                traceback.print_exc()
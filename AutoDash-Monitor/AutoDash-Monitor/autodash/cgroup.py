@@ -0,0 +1,162 @@
+import os
+from collections import namedtuple
+
+# cgroup v2 files read each tick. They are opened once and re-read with pread, so
+# a read is one syscall per file and no path lookups. (Rewrite files in place when
+# faking a cgroupfs in tests: a replaced file keeps being read from the old inode.)
+FILES = ["cpu.stat", "cpu.max", "memory.current", "memory.max", "memory.stat", "io.stat",
+         "cpu.pressure", "memory.pressure", "io.pressure"]
+
+# io.stat per device, shaped like psutil's disk counters so devices.disk_rates can
+# take it; io.stat has no time/busy counters, those read as NaN
+IOCounters = namedtuple("IOCounters", ["read_bytes", "write_bytes", "read_count", "write_count"])
+# cpu.stat counters; nr_* exist only with the cpu controller enabled (NaN otherwise)
+CPUCounters = namedtuple("CPUCounters", ["usage_usec", "nr_periods", "nr_throttled"])
+CPU_FIELDS = list(CPUCounters._fields)
+
+def find_cgroup(root="/sys/fs/cgroup", proc_cgroup="/proc/self/cgroup"):
+    # this process's cgroup v2 directory, or None (cgroup v1 only)
+    if not os.path.exists(os.path.join(root, "cgroup.controllers")):
+        root = os.path.join(root, "unified")  # hybrid hierarchy
+        if not os.path.exists(os.path.join(root, "cgroup.controllers")):
+            return None
+    path = "/"
+    try:
+        with open(proc_cgroup) as f:
+            for line in f:
+                if line.startswith("0::"):
+                    path = line[3:].strip()
+    except OSError:
+        pass
+    full = os.path.normpath(os.path.join(root, path.lstrip("/")))
+    # inside a cgroup namespace the listed path may not exist under our mount
+    return full if os.path.isdir(full) else os.path.normpath(root)
+
+def _pairs(text):
+    # "key value" lines (cpu.stat, memory.stat) -> {key: int}
+    out = {}
+    for line in text.splitlines():
+        k, _, v = line.partition(" ")
+        if v.strip().isdigit(): out[k] = int(v)
+    return out
+
+def parse_pressure(text):
+    # PSI: "some avg10=1.23 avg60=... total=N" (+ a "full" line) -> {"some": avg10, "full": avg10}
+    out = {}
+    for line in text.splitlines():
+        if not line.strip(): continue
+        kind, *fields = line.split()
+        for f in fields:
+            if f.startswith("avg10="):
+                out[kind] = float(f[6:])
+    return out
+
+def parse_io_stat(text):
+    # "8:0 rbytes=... wbytes=... rios=... wios=... dbytes=... dios=..." -> {"8:0": IOCounters}
+    out = {}
+    for line in text.splitlines():
+        if not line.strip(): continue
+        dev, *fields = line.split()
+        kv = dict(f.split("=", 1) for f in fields if "=" in f)
+        try:
+            out[dev] = IOCounters(int(kv.get("rbytes", 0)), int(kv.get("wbytes", 0)),
+                                  int(kv.get("rios", 0)), int(kv.get("wios", 0)))
+        except ValueError:
+            continue
+    return out
+
+class CgroupReader:
+    # Counters of one cgroup v2 directory (a real one or a fake tree). Files the
+    # kernel doesn't provide (controller not enabled) are skipped.
+    def __init__(self, path, sys_block="/sys/dev/block"):
+        self.path = path
+        self.sys_block = sys_block
+        self._fds = {}
+        for name in FILES:
+            try:
+                self._fds[name] = os.open(os.path.join(path, name), os.O_RDONLY)
+            except OSError:
+                pass
+        if not self._fds:
+            raise OSError(f"no cgroup v2 files in {path}")
+        self._devnames = {}
+
+    def close(self):
+        for fd in self._fds.values():
+            os.close(fd)
+        self._fds = {}
+
+    def has(self, name):
+        return name in self._fds
+
+    def read_text(self, name):
+        fd = self._fds.get(name)
+        if fd is None: return None
+        chunks, off = [], 0
+        while True:
+            b = os.pread(fd, 65536, off)
+            chunks.append(b)
+            off += len(b)
+            if len(b) < 65536: break
+        return b"".join(chunks).decode("ascii", "replace")
+
+    def _int(self, name):
+        text = self.read_text(name)
+        if text is None: return None
+        text = text.strip()
+        return int(text) if text.isdigit() else None  # "max" = no limit
+
+    def cpu_counters(self):
+        stat = _pairs(self.read_text("cpu.stat") or "")
+        return CPUCounters(*(stat.get(f, float("nan")) for f in CPU_FIELDS))
+
+    def cpu_limit(self):
+        # CPUs' worth of quota from cpu.max ("max 100000" = unlimited -> None)
+        text = self.read_text("cpu.max")
+        if not text: return None
+        quota, _, period = text.strip().partition(" ")
+        if not quota.isdigit() or not period.strip().isdigit(): return None
+        return int(quota) / int(period)
+
+    def memory(self):
+        # -> (used, limit): current minus reclaimable page cache (inactive_file, as
+        # docker stats and kubectl top do), and memory.max or None when unlimited
+        current = self._int("memory.current")
+        if current is not None:
+            inactive = _pairs(self.read_text("memory.stat") or "").get("inactive_file", 0)
+            current = max(0, current - inactive)
+        return current, self._int("memory.max")
+
+    def pressure(self, resource):
+        text = self.read_text(f"{resource}.pressure")
+        return parse_pressure(text) if text else {}
+
+    def io_counters(self):
+        # {device name: IOCounters}; MAJ:MIN is resolved through /sys/dev/block once
+        text = self.read_text("io.stat")
+        if text is None: return {}
+        return {self._devname(dev): c for dev, c in parse_io_stat(text).items()}
+
+    def _devname(self, dev):
+        name = self._devnames.get(dev)
+        if name is None:
+            name = dev
+            try:
+                with open(os.path.join(self.sys_block, dev, "uevent")) as f:
+                    for line in f:
+                        if line.startswith("DEVNAME="): name = line[8:].strip()
+            except OSError:
+                pass
+            self._devnames[dev] = name
+        return name
+
+def open_cgroup(spec=None):
+    # spec: a cgroup v2 directory, "auto" for this process's own cgroup, or None to
+    # use AUTODASH_CGROUP; -> CgroupReader, or None for host-wide collection
+    spec = spec or os.environ.get("AUTODASH_CGROUP")
+    if not spec or spec == "off":
+        return None
+    path = find_cgroup() if spec == "auto" else spec
+    if path is None:
+        raise OSError("no cgroup v2 hierarchy mounted")
+    return CgroupReader(path)
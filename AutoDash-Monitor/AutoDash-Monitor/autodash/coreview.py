@@ -0,0 +1,72 @@
+import math
+import numpy as np
+from PyQt5.QtCore import QRectF
+from PyQt5.QtGui import QPainter, QImage
+from PyQt5.QtWidgets import QWidget, QToolTip
+
+from .profiler import PROFILER
+
+def make_lut(n=256):
+    # idle navy -> accent blue -> amber -> red, as an (n, 4) uint8 RGBA table
+    stops = [(0.0, (15, 30, 48)), (0.35, (55, 149, 255)), (0.7, (255, 176, 55)), (1.0, (255, 77, 77))]
+    x = np.linspace(0.0, 1.0, n)
+    lut = np.empty((n, 4), dtype=np.uint8)
+    for ch in range(3):
+        lut[:, ch] = np.interp(x, [s[0] for s in stops], [s[1][ch] for s in stops])
+    lut[:, 3] = 255
+    return lut
+
+CORE_LUT = make_lut()
+EMPTY = np.array([11, 15, 20, 255], dtype=np.uint8)
+
+def colorize(values, lut=CORE_LUT, lo=0.0, hi=100.0):
+    # values -> RGBA uint8 array of the same shape (+4); NaN maps to the background color
+    v = np.asarray(values, dtype=np.float32)
+    idx = np.clip((v - lo) * ((len(lut) - 1) / (hi - lo)), 0, len(lut) - 1)
+    rgba = lut[np.nan_to_num(idx).astype(np.intp)]
+    rgba[np.isnan(v)] = EMPTY
+    return rgba
+
+class CoreStrip(QWidget):
+    # All cores as one grid of heat cells, drawn with a single drawImage call.
+    # The image is len(cores) pixels scaled up, so cost doesn't grow with widget size.
+    def __init__(self, cores, max_columns=32, parent=None):
+        super().__init__(parent)
+        self.cores = max(1, cores)
+        self.rows = math.ceil(self.cores / max_columns)
+        self.columns = math.ceil(self.cores / self.rows)
+        self._values = np.full(self.rows * self.columns, np.nan, dtype=np.float32)
+        self._rgba = None
+        self._image = None
+        self.setMouseTracking(True)
+        self.setMinimumHeight(min(160, 18 * self.rows + 4))
+
+    def setValues(self, values):
+        v = np.asarray(values, dtype=np.float32)[:self.cores]
+        if np.array_equal(v, self._values[:len(v)]): return
+        self._values[:len(v)] = v
+        self._image = None
+        self.update()
+
+    def _cell_rect(self):
+        return QRectF(self.rect()).adjusted(2, 2, -2, -2)
+
+    def paintEvent(self, e):
+        with PROFILER.stage("paint.cores"):
+            if self._image is None:
+                # keep the array alive: QImage wraps its buffer without copying
+                self._rgba = np.ascontiguousarray(colorize(self._values.reshape(self.rows, self.columns)))
+                self._image = QImage(self._rgba.data, self.columns, self.rows, self.columns * 4, QImage.Format_RGBA8888)
+            p = QPainter(self)
+            p.drawImage(self._cell_rect(), self._image)
+            p.end()
+
+    def mouseMoveEvent(self, e):
+        r = self._cell_rect()
+        if not r.contains(e.pos()) or r.width() <= 0 or r.height() <= 0: return
+        col = int((e.pos().x() - r.x()) * self.columns / r.width())
+        row = int((e.pos().y() - r.y()) * self.rows / r.height())
+        i = row * self.columns + col
+        if i < self.cores:
+            v = self._values[i]
+            QToolTip.showText(e.globalPos(), f"CPU {i + 1}: {'--' if np.isnan(v) else f'{v:.0f}%'}", self)
@@ -0,0 +1,97 @@
+import os, sys
+import numpy as np
+
+NIC_FIELDS = ["bytes_sent", "bytes_recv", "packets_sent", "packets_recv"]
+# read_time/write_time are cumulative ms spent on I/O; busy_time is Linux-only (NaN elsewhere)
+DISK_FIELDS = ["read_bytes", "write_bytes", "read_count", "write_count", "read_time", "write_time", "busy_time"]
+
+class CounterRates:
+    # Deltas of cumulative per-device counters, all devices and fields in one
+    # vectorized step. Rows follow the current device names: a device that
+    # appears has no previous row (NaN for its first read), one that disappears
+    # is dropped. psutil already undoes 32-bit wraparound (nowrap=True), so a
+    # counter that went backwards was reset (driver reload, re-created
+    # interface): NaN for that read.
+    def __init__(self, fields):
+        self.fields = list(fields)
+        self.names = []
+        self._index = {}
+        self._prev = np.empty((0, len(self.fields)))
+        self._t = None
+
+    def update(self, counters, now):
+        # counters: {name: namedtuple with self.fields} -> (names, deltas (n, fields), seconds elapsed)
+        names = list(counters)
+        cur = np.array([[getattr(c, f, np.nan) for f in self.fields] for c in counters.values()],
+                       dtype=np.float64).reshape(len(names), len(self.fields))
+        if names == self.names:
+            prev = self._prev
+        else:
+            rows = np.array([self._index.get(n, -1) for n in names], dtype=np.intp)
+            prev = np.full_like(cur, np.nan)
+            known = rows >= 0
+            prev[known] = self._prev[rows[known]]
+            self.names, self._index = names, {n: i for i, n in enumerate(names)}
+        delta = cur - prev
+        delta[delta < 0] = np.nan
+        dt = np.nan if self._t is None else max(1e-6, now - self._t)
+        self._prev, self._t = cur, now
+        return names, delta, dt
+
+_whole_disk = {}
+
+def is_whole_disk(name):
+    # On Linux perdisk also lists partitions (sda1, nvme0n1p2); only /sys/block entries are whole devices
+    if not sys.platform.startswith("linux"): return True
+    v = _whole_disk.get(name)
+    if v is None:
+        v = _whole_disk[name] = os.path.exists(f"/sys/block/{name}")
+    return v
+
+def hidden_disk(name):
+    # virtual block devices that count toward totals but clutter the per-device view
+    return name.startswith(("loop", "ram"))
+
+def _rows(names, cols, values):
+    # (n, k) float array -> {name: {col: float or None}}
+    values = np.where(np.isfinite(values), values, np.nan).tolist()
+    return {n: {c: (None if v != v else v) for c, v in zip(cols, row)} for n, row in zip(names, values)}
+
+NIC_COLUMNS = ["up_bps", "down_bps", "up_pps", "down_pps"]
+DISK_COLUMNS = ["read_bps", "write_bps", "read_iops", "write_iops", "read_lat_ms", "write_lat_ms", "busy"]
+
+def nic_rates(rates, counters, now):
+    names, d, dt = rates.update(counters, now)
+    r = d / dt
+    total = np.nansum(np.clip(r[:, :2], 0, None), axis=0) if len(names) else np.zeros(2)
+    return _rows(names, NIC_COLUMNS, r), float(total[0]), float(total[1])
+
+def disk_rates(rates, counters, now):
+    names, d, dt = rates.update(counters, now)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        r = np.empty((len(names), len(DISK_COLUMNS)))
+        r[:, :4] = d[:, :4] / dt
+        # average ms per completed I/O over the interval; undefined without I/O
+        r[:, 4] = np.where(d[:, 2] > 0, d[:, 4] / d[:, 2], np.nan)
+        r[:, 5] = np.where(d[:, 3] > 0, d[:, 5] / d[:, 3], np.nan)
+        r[:, 6] = np.clip(d[:, 6] / (dt * 10.0), 0, 100)  # busy ms per second -> %
+    total = np.nansum(np.clip(r[:, :2], 0, None), axis=0) if len(names) else np.zeros(2)
+    shown = [i for i, n in enumerate(names) if not hidden_disk(n)]
+    return _rows([names[i] for i in shown], DISK_COLUMNS, r[shown]), float(total[0]), float(total[1])
+
+# per-device history series: (snapshot field, key prefix, [(column, series suffix)])
+DEVICE_SERIES = [
+    ("nics", "nic", [("up_bps", "up"), ("down_bps", "down")]),
+    ("disks", "disk", [("read_bps", "read"), ("write_bps", "write"), ("read_iops", "read_iops"),
+                       ("write_iops", "write_iops"), ("read_lat_ms", "read_lat"), ("write_lat_ms", "write_lat"),
+                       ("busy", "busy")]),
+]
+
+def device_series(snap):
+    # {"nic.eth0.up": ..., "disk.nvme0n1.busy": ...} for the history store
+    row = {}
+    for field, prefix, cols in DEVICE_SERIES:
+        for name, d in (snap.get(field) or {}).items():
+            for col, suffix in cols:
+                row[f"{prefix}.{name}.{suffix}"] = d[col]
+    return row
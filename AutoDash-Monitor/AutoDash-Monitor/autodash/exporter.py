@@ -0,0 +1,190 @@
+import json, math, selectors, socket, threading
+from collections.abc import Mapping
+
+from .profiler import PROFILER
+
+def to_jsonable(obj):
+    if isinstance(obj, Mapping):  # dicts, frozen MappingProxyType, Snapshot
+        return {k: to_jsonable(v) for k, v in obj.items()}
+    if hasattr(obj, "_asdict"):  # psutil namedtuples, e.g. sensors_battery()
+        return to_jsonable(obj._asdict())
+    if isinstance(obj, (list, tuple)):
+        return [to_jsonable(v) for v in obj]
+    if isinstance(obj, float) and not math.isfinite(obj):
+        return None
+    return obj
+
+def _esc(v):
+    return str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+GPU_METRICS = [
+    ("gpu_load_percent", "GPU load.", "load"),
+    ("gpu_temperature_celsius", "GPU temperature.", "temp"),
+    ("gpu_memory_used_bytes", "GPU memory in use.", "vram_used"),
+    ("gpu_memory_total_bytes", "GPU memory size.", "vram_total"),
+    ("gpu_power_watts", "GPU power draw.", "power"),
+    ("gpu_power_limit_watts", "GPU power limit.", "power_limit"),
+    ("gpu_clock_core_mhz", "GPU core clock.", "clock_core"),
+    ("gpu_clock_memory_mhz", "GPU memory clock.", "clock_mem"),
+]
+
+NIC_METRICS = [
+    ("network_device_bytes_per_second", "Per-interface throughput.", [("up", "up_bps"), ("down", "down_bps")]),
+    ("network_device_packets_per_second", "Per-interface packet rate.", [("up", "up_pps"), ("down", "down_pps")]),
+]
+DISK_METRICS = [
+    ("disk_device_bytes_per_second", "Per-disk throughput.", [("read", "read_bps"), ("write", "write_bps")]),
+    ("disk_device_iops", "Per-disk completed I/O operations per second.", [("read", "read_iops"), ("write", "write_iops")]),
+    ("disk_device_latency_ms", "Per-disk average time per I/O.", [("read", "read_lat_ms"), ("write", "write_lat_ms")]),
+    ("disk_device_busy_percent", "Per-disk time spent doing I/O.", [(None, "busy")]),
+]
+
+def prometheus_text(frame):
+    s = frame.snap
+    out = []
+    def metric(name, help_, samples):
+        samples = [(labels, v) for labels, v in samples if v is not None]
+        if not samples: return
+        out.append(f"# HELP autodash_{name} {help_}")
+        out.append(f"# TYPE autodash_{name} gauge")
+        for labels, v in samples:
+            lab = "{" + ",".join(f'{k}="{_esc(x)}"' for k, x in labels.items()) + "}" if labels else ""
+            out.append(f"autodash_{name}{lab} {float(v)!r}")
+    batt = s.get("battery")
+    metric("sample_timestamp_seconds", "Unix time of the sample.", [({}, frame.t)])
+    metric("cpu_percent", "Total CPU utilisation.", [({}, s.get("cpu_total"))])
+    metric("cpu_core_percent", "Per logical CPU utilisation.", [({"core": i}, v) for i, v in enumerate(s.get("cpu_per_core") or ())])
+    metric("memory_used_bytes", "Used memory.", [({}, s.get("ram_used"))])
+    metric("memory_total_bytes", "Total memory.", [({}, s.get("ram_total"))])
+    metric("memory_percent", "Used memory percentage.", [({}, s.get("ram_percent"))])
+    metric("network_bytes_per_second", "Network throughput.", [({"direction": "up"}, s.get("net_up_bps")), ({"direction": "down"}, s.get("net_down_bps"))])
+    metric("disk_bytes_per_second", "Disk throughput.", [({"direction": "read"}, s.get("disk_read_bps")), ({"direction": "write"}, s.get("disk_write_bps"))])
+    for field, table in (("nics", NIC_METRICS), ("disks", DISK_METRICS)):
+        devices = (s.get(field) or {}).items()
+        for name, help_, keys in table:
+            metric(name, help_, [({"device": dev, "direction": d} if d else {"device": dev}, v[key])
+                                 for d, key in keys for dev, v in devices])
+    gpus = [({"gpu": g["index"], "name": g.get("name") or ""}, g) for g in s.get("gpus") or ()]
+    for name, help_, key in GPU_METRICS:
+        metric(name, help_, [(labels, g.get(key)) for labels, g in gpus])
+    metric("temperature_celsius", "Sensor temperatures.", [({"sensor": name, "label": e["label"]}, e["current"])
+                                                          for name, entries in (s.get("temps") or {}).items() for e in entries])
+    metric("battery_percent", "Battery charge.", [({}, batt.percent if batt else None)])
+    metric("cpu_throttled_percent", "Share of cgroup CPU periods throttled.", [({}, s.get("cpu_throttled"))])
+    metric("pressure_percent", "Pressure stall information (avg10).",
+           [({"resource": r, "kind": k}, s.get(f"psi_{r}_{k}"))
+            for r, k in (("cpu", "some"), ("memory", "some"), ("memory", "full"), ("io", "some"), ("io", "full"))])
+    return "\n".join(out) + "\n"
+
+def _response(body, content_type, status="200 OK"):
+    head = (f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\nContent-Length: {len(body)}\r\n"
+            f"Cache-Control: no-cache\r\nConnection: close\r\n\r\n")
+    return head.encode("ascii") + body
+
+NOT_FOUND = _response(b"not found\n", "text/plain", "404 Not Found")
+NOT_READY = _response(b"no sample yet\n", "text/plain", "503 Service Unavailable")
+PATHS = ("/metrics", "/metrics.json", "/history.json")
+
+class MetricsExporter:
+    # Serves the latest frame as Prometheus text (/metrics) and JSON
+    # (/metrics.json, /history.json) from a selector loop on its own thread.
+    # Responses are rendered once per published frame, so a scrape is just a
+    # dict lookup and a send of prebuilt bytes.
+    def __init__(self, bus, history=None, host="127.0.0.1", port=9108, interval=1.0, history_points=300):
+        self.bus = bus
+        self.history = history
+        self.history_points = history_points
+        self._responses = {}
+        self._sel = selectors.DefaultSelector()
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind((host, port))
+        self._sock.listen(128)
+        self._sock.setblocking(False)
+        self.address = self._sock.getsockname()
+        self._sel.register(self._sock, selectors.EVENT_READ, None)
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._sel.register(self._wake_r, selectors.EVENT_READ, "wake")
+        self._stop = False
+        self._thread = None
+        self._sub = bus.subscribe(self.render, interval)
+        if bus.latest: self.render(bus.latest)
+
+    def render(self, frame):
+        with PROFILER.stage("export"):
+            body = json.dumps({"t": frame.t, "snapshot": to_jsonable(frame.snap)}).encode("utf-8")
+            responses = {
+                "/metrics": _response(prometheus_text(frame).encode("utf-8"), "text/plain; version=0.0.4; charset=utf-8"),
+                "/metrics.json": _response(body, "application/json"),
+            }
+            if self.history is not None:
+                v = self.history.views(None, self.history_points)  # columns may come and go meanwhile
+                hist = {k: to_jsonable(a.tolist()) for k, a in v.items()}
+                responses["/history.json"] = _response(json.dumps(hist).encode("utf-8"), "application/json")
+            self._responses = responses  # swapped atomically; the server thread never sees a partial set
+
+    def start(self):
+        if self._thread: return
+        self._thread = threading.Thread(target=self._serve, name="autodash-exporter", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._sub.cancel()
+        self._stop = True
+        try: self._wake_w.send(b"x")
+        except OSError: pass
+        if self._thread: self._thread.join(2.0)
+        self._thread = None
+        for key in list(self._sel.get_map().values()):
+            key.fileobj.close()
+        self._sel.close()
+        self._wake_w.close()
+
+    def _serve(self):
+        while not self._stop:
+            for key, events in self._sel.select(timeout=1.0):
+                if key.data is None:
+                    self._accept()
+                elif key.data == "wake":
+                    key.fileobj.recv(64)
+                else:
+                    self._handle(key, events)
+
+    def _accept(self):
+        try:
+            conn, _ = self._sock.accept()
+        except BlockingIOError:
+            return
+        conn.setblocking(False)
+        self._sel.register(conn, selectors.EVENT_READ, {"in": b"", "out": None})
+
+    def _close(self, conn):
+        self._sel.unregister(conn)
+        conn.close()
+
+    def _handle(self, key, events):
+        conn, st = key.fileobj, key.data
+        try:
+            if events & selectors.EVENT_READ and st["out"] is None:
+                chunk = conn.recv(4096)
+                if not chunk:
+                    return self._close(conn)
+                st["in"] += chunk
+                if b"\r\n\r\n" not in st["in"] and len(st["in"]) < 8192:
+                    return
+                line = st["in"].split(b"\r\n", 1)[0].decode("latin-1").split()
+                path = line[1].split("?", 1)[0] if len(line) >= 2 else ""
+                resp = self._responses.get(path)
+                if resp is None:
+                    resp = NOT_READY if path in PATHS and not self._responses else NOT_FOUND
+                st["out"] = memoryview(resp)
+                self._sel.modify(conn, selectors.EVENT_WRITE, st)
+            if st["out"] is not None:
+                sent = conn.send(st["out"])
+                st["out"] = st["out"][sent:]
+                if not len(st["out"]):
+                    self._close(conn)
+        except (BlockingIOError, InterruptedError):
+            pass
+        except OSError:
+            self._close(conn)
@@ -0,0 +1,189 @@
+import time
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
+from PyQt5.QtWidgets import QWidget, QFrame, QGridLayout, QVBoxLayout, QHBoxLayout, QLabel, QScrollArea, QSplitter
+import pyqtgraph as pg
+
+from .gauge import Gauge
+
+STALE_AFTER = 5.0  # seconds without a sample before a tile is dimmed
+
+FLEET_QSS = '''
+HostTile { background: #0f151d; border: 1px solid #1e2a36; border-radius: 8px; }
+HostTile[selected="true"] { border: 1px solid #3795ff; }
+HostTile[stale="true"] QLabel { color: #5a6b7c; }
+'''
+
+def _rate(n):
+    for unit in ["B/s", "KB/s", "MB/s", "GB/s"]:
+        if n < 1024.0: return f"{n:.0f} {unit}"
+        n /= 1024.0
+    return f"{n:.0f} TB/s"
+
+class HostTile(QFrame):
+    clicked = pyqtSignal(str)
+
+    def __init__(self, name, parent=None):
+        super().__init__(parent)
+        self.name = name
+        self._stale = None
+        lay = QVBoxLayout(self)
+        lay.setContentsMargins(6, 6, 6, 6)
+        self.title = QLabel(name)
+        self.title.setAlignment(Qt.AlignCenter)
+        lay.addWidget(self.title)
+        row = QHBoxLayout()
+        self.cpu = Gauge(label="CPU")
+        self.ram = Gauge(label="RAM")
+        for g in (self.cpu, self.ram):
+            g.setMinimumSize(90, 90)
+            row.addWidget(g)
+        lay.addLayout(row)
+        self.io = QLabel("--")
+        self.io.setAlignment(Qt.AlignCenter)
+        lay.addWidget(self.io)
+        self.setProperty("selected", False)
+
+    def gauges(self):
+        return [self.cpu, self.ram]
+
+    def render(self, host, now):
+        s = host.snap
+        self.cpu.setValue(s.get("cpu_total"))
+        self.ram.setValue(s.get("ram_percent"))
+        self.io.setText(f"↓ {_rate(s.get('net_down_bps') or 0)}  ↑ {_rate(s.get('net_up_bps') or 0)}\n"
+                        f"R {_rate(s.get('disk_read_bps') or 0)}  W {_rate(s.get('disk_write_bps') or 0)}")
+        stale = not host.connected or host.t is None or now - host.t > STALE_AFTER
+        if stale != self._stale:
+            self._stale = stale
+            self.setProperty("stale", stale)
+            self.title.setText(self.name + (" (offline)" if not host.connected else ""))
+            self.style().unpolish(self); self.style().polish(self)
+            for lab in (self.title, self.io):
+                lab.style().unpolish(lab); lab.style().polish(lab)
+
+    def setSelected(self, on):
+        self.setProperty("selected", on)
+        self.style().unpolish(self); self.style().polish(self)
+
+    def mousePressEvent(self, e):
+        self.clicked.emit(self.name)
+        super().mousePressEvent(e)
+
+class FleetView(QWidget):
+    # One tile per remote host plus the Graphs tab's plots for the selected host.
+    # The collector only records which hosts changed; this view drains that set
+    # once per `interval` and repaints just those tiles (hidden or scrolled-out
+    # tiles stay pending until they are shown), inside a single update batch.
+    def __init__(self, collector, columns=6, interval=1.0, parent=None):
+        super().__init__(parent)
+        self.collector = collector
+        self.columns = columns
+        self.tiles = {}
+        self._pending = set()
+        self._selected = None
+        self._theme = "dark"
+        self.setStyleSheet(FLEET_QSS)
+
+        lay = QVBoxLayout(self)
+        self.status = QLabel(f"Listening on {collector.address[0]}:{collector.address[1]} · no hosts yet")
+        lay.addWidget(self.status)
+        split = QSplitter(Qt.Vertical)
+        lay.addWidget(split, 1)
+        self.scroll = QScrollArea()
+        self.scroll.setWidgetResizable(True)
+        self.grid_host = QWidget()
+        self.grid = QGridLayout(self.grid_host)
+        self.grid.setAlignment(Qt.AlignTop | Qt.AlignLeft)
+        self.scroll.setWidget(self.grid_host)
+        self.scroll.verticalScrollBar().valueChanged.connect(lambda *a: self.refresh(drain=False))
+        split.addWidget(self.scroll)
+
+        plots = QWidget()
+        pl = QHBoxLayout(plots)
+        self.plot_cpu = pg.PlotWidget(title="CPU / RAM (%)", axisItems={"bottom": pg.DateAxisItem()})
+        self.plot_net = pg.PlotWidget(title="Network (dl/ul)", axisItems={"bottom": pg.DateAxisItem()})
+        for p in (self.plot_cpu, self.plot_net):
+            p.showGrid(x=True, y=True, alpha=0.2)
+            pl.addWidget(p)
+        self.cur_cpu = self.plot_cpu.plot(pen=pg.mkPen(width=2))
+        self.cur_ram = self.plot_cpu.plot(pen=pg.mkPen(style=Qt.DashLine, width=2))
+        self.cur_net_down = self.plot_net.plot(pen=pg.mkPen(width=2))
+        self.cur_net_up = self.plot_net.plot(pen=pg.mkPen(style=Qt.DashLine, width=2))
+        self._curves = [(self.cur_cpu, "cpu_total"), (self.cur_ram, "ram_used"),
+                        (self.cur_net_down, "net_down"), (self.cur_net_up, "net_up")]
+        split.addWidget(plots)
+        split.setSizes([600, 250])
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(int(interval * 1000))
+
+    def setTheme(self, theme):
+        self._theme = theme
+        for tile in self.tiles.values():
+            for g in tile.gauges(): g.setTheme(theme)
+
+    def _add_tile(self, name):
+        tile = HostTile(name)
+        for g in tile.gauges(): g.setTheme(self._theme)
+        tile.clicked.connect(self.select)
+        n = len(self.tiles)
+        self.grid.addWidget(tile, n // self.columns, n % self.columns)
+        self.tiles[name] = tile
+        if self._selected is None: self.select(name)
+        return tile
+
+    def select(self, name):
+        if self._selected in self.tiles: self.tiles[self._selected].setSelected(False)
+        self._selected = name
+        self.tiles[name].setSelected(True)
+        self.plot_cpu.setTitle(f"{name} · CPU / RAM (%)")
+        self.plot_net.setTitle(f"{name} · Network (dl/ul)")
+        self._render_graphs()
+
+    def _tile_visible(self, tile):
+        return not tile.visibleRegion().isEmpty()
+
+    def refresh(self, drain=True):
+        now = time.time()
+        hosts = self.collector.hosts
+        if drain:
+            self._pending |= self.collector.drain()
+            # connected hosts that went quiet produce no updates; dim them here
+            self._pending.update(n for n, tile in self.tiles.items()
+                                 if tile._stale is False and now - hosts[n].t > STALE_AFTER)
+        if not self._pending or not self.isVisible() or self.window().isMinimized(): return
+        self.grid_host.setUpdatesEnabled(False)
+        try:
+            new = set(n for n in self._pending if n not in self.tiles)
+            for name in sorted(new):
+                self._add_tile(name)
+            done = set()
+            for name in self._pending:
+                tile = self.tiles[name]
+                # new tiles aren't laid out yet, so they get their first sample regardless
+                if name in new or self._tile_visible(tile):
+                    tile.render(hosts[name], now)
+                    done.add(name)
+            selected = self._selected in self._pending
+            self._pending -= done
+        finally:
+            self.grid_host.setUpdatesEnabled(True)
+        if selected: self._render_graphs()
+        if drain:
+            s = self.collector.summary()
+            self.status.setText(f"Listening on {self.collector.address[0]}:{self.collector.address[1]} · "
+                                f"{s['hosts']} hosts, {s['connected']} connected, {s['stale']} stale")
+
+    def _render_graphs(self):
+        host = self.collector.hosts.get(self._selected)
+        if host is None: return
+        v = host.history.views(["t"] + [col for _, col in self._curves])
+        ram_total = host.snap.get("ram_total")
+        for curve, col in self._curves:
+            y = v[col]
+            if col == "ram_used":
+                # plotted next to CPU as a percentage of the host's total memory
+                if not ram_total: continue
+                y = y * (100.0 / ram_total)
+            curve.setData(v["t"], y, connect="finite")
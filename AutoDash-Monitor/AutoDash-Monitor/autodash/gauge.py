@@ -1,7 +1,21 @@
-from PyQt5.QtCore import Qt, QRectF, pyqtProperty, QPointF
-from PyQt5.QtGui import QPainter, QPen, QFont, QConicalGradient, QColor
+import math
+from PyQt5.QtCore import Qt, QRectF, QPointF, pyqtProperty
+from PyQt5.QtGui import QPainter, QPen, QFont, QColor, QPixmap
 from PyQt5.QtWidgets import QWidget
 
+from .profiler import PROFILER
+
+THEMES = {
+    "dark": {"track": QColor(30, 42, 54), "arc": QColor(55, 149, 255), "text": QColor(158, 207, 255),
+             "label": QColor(120, 160, 200), "tick": QColor(70, 95, 120)},
+    "light": {"track": QColor(215, 223, 231), "arc": QColor(42, 123, 223), "text": QColor(2, 75, 148),
+              "label": QColor(70, 100, 130), "tick": QColor(160, 175, 190)},
+}
+
+START_ANGLE = 225  # degrees
+SPAN_ANGLE = 270
+TICKS = 10
+
 class Gauge(QWidget):
     def __init__(self, minimum=0, maximum=100, value=0, unit="%", label="Gauge", parent=None):
         super().__init__(parent)
@@ -10,6 +24,12 @@ class Gauge(QWidget):
         self._value = value
         self._unit = unit
         self._label = label
+        self._theme = "dark"
+        # static layer (track, ticks, label) cached per size/theme/label
+        self._static = None
+        self._static_key = None
+        self._value_font = None
+        self._painted_value = None
         self.setMinimumSize(140, 140)
 
     def setRange(self, minimum, maximum):
@@ -20,7 +40,12 @@ class Gauge(QWidget):
         self._unit = unit; self.update()
 
     def setLabel(self, label):
-        self._label = label; self.update()
+        if label != self._label:
+            self._label = label; self.update()
+
+    def setTheme(self, theme):
+        if theme != self._theme:
+            self._theme = theme; self.update()
 
     def getValue(self):
         return self._value
@@ -30,46 +55,88 @@ class Gauge(QWidget):
         v = float(max(self._min, min(self._max, v)))
         if v != self._value:
             self._value = v
-            self.update()
+            if self._needs_repaint(v):
+                self.update()
 
     value = pyqtProperty(float, fget=getValue, fset=setValue)
 
-    def paintEvent(self, e):
+    def _geometry(self):
         side = min(self.width(), self.height())
         rect = QRectF((self.width() - side) / 2 + 10, (self.height() - side) / 2 + 10, side - 20, side - 20)
-        start_angle = 225  # degrees
-        span_angle = 270
+        return side, rect
 
-        p = QPainter(self)
+    def _frac(self, v):
+        frac = 0 if self._max == self._min else (v - self._min) / (self._max - self._min)
+        return max(0.0, min(1.0, frac))
+
+    def _needs_repaint(self, v):
+        # Skip repaints whose arc moves less than a pixel and whose text is unchanged.
+        p = self._painted_value
+        if p is None or int(p) != int(v):
+            return True
+        radius = max(0.0, min(self.width(), self.height()) - 20) / 2
+        arc_px = radius * math.radians(SPAN_ANGLE) * abs(self._frac(v) - self._frac(p))
+        return arc_px >= 1.0
+
+    def _static_layer(self, side, rect):
+        dpr = self.devicePixelRatioF()
+        key = (self.width(), self.height(), dpr, self._theme, self._label)
+        if key == self._static_key:
+            return self._static
+        colors = THEMES[self._theme]
+        pm = QPixmap(int(self.width() * dpr), int(self.height() * dpr))
+        pm.setDevicePixelRatio(dpr)
+        pm.fill(Qt.transparent)
+        p = QPainter(pm)
         p.setRenderHint(QPainter.Antialiasing)
 
         # background arc
-        pen = QPen(QColor(30, 42, 54), 14)
-        p.setPen(pen)
-        p.drawArc(rect, int((90 - start_angle) * 16), int(-span_angle * 16))
-
-        # progress arc
-        frac = 0 if self._max == self._min else (self._value - self._min) / (self._max - self._min)
-        frac = max(0.0, min(1.0, frac))
-        pen2 = QPen(QColor(55, 149, 255), 16)
-        p.setPen(pen2)
-        p.drawArc(rect, int((90 - start_angle) * 16), int(-span_angle * frac * 16))
-
-        # value text
-        p.setPen(QColor(158, 207, 255))
-        font = QFont(self.font())
-        font.setPointSize(int(side / 10))
-        font.setBold(True)
-        p.setFont(font)
-        value_text = f"{int(self._value)}{self._unit}"
-        p.drawText(self.rect(), Qt.AlignCenter, value_text)
+        p.setPen(QPen(colors["track"], 14))
+        p.drawArc(rect, int((90 - START_ANGLE) * 16), int(-SPAN_ANGLE * 16))
+
+        # tick marks just inside the track
+        p.setPen(QPen(colors["tick"], 2))
+        c = rect.center()
+        r_out, r_in = rect.width() / 2 - 10, rect.width() / 2 - (16 if side > 180 else 14)
+        for i in range(TICKS + 1):
+            a = math.radians(START_ANGLE - SPAN_ANGLE * i / TICKS)
+            dx, dy = math.cos(a), -math.sin(a)
+            p.drawLine(QPointF(c.x() + dx * r_in, c.y() + dy * r_in), QPointF(c.x() + dx * r_out, c.y() + dy * r_out))
 
         # bottom label
-        p.setPen(QColor(120, 160, 200))
+        p.setPen(colors["label"])
         font2 = QFont(self.font())
-        font2.setPointSize(int(side / 14))
+        font2.setPointSize(max(1, int(side / 14)))
         p.setFont(font2)
         p.drawText(self.rect().adjusted(0, int(side * 0.35), 0, 0), Qt.AlignHCenter | Qt.AlignTop, self._label)
-
         p.end()
 
+        font = QFont(self.font())
+        font.setPointSize(max(1, int(side / 10)))
+        font.setBold(True)
+        self._value_font = font
+        self._static, self._static_key = pm, key
+        return pm
+
+    def paintEvent(self, e):
+        with PROFILER.stage("paint.gauge"):
+            side, rect = self._geometry()
+            colors = THEMES[self._theme]
+
+            p = QPainter(self)
+            p.drawPixmap(0, 0, self._static_layer(side, rect))
+            p.setRenderHint(QPainter.Antialiasing)
+
+            # progress arc
+            frac = self._frac(self._value)
+            p.setPen(QPen(colors["arc"], 16))
+            p.drawArc(rect, int((90 - START_ANGLE) * 16), int(-SPAN_ANGLE * frac * 16))
+
+            # value text
+            p.setPen(colors["text"])
+            p.setFont(self._value_font)
+            value_text = f"{int(self._value)}{self._unit}"
+            p.drawText(self.rect(), Qt.AlignCenter, value_text)
+
+            p.end()
+            self._painted_value = self._value
@@ -0,0 +1,235 @@
+import ctypes, glob, math, os, sys, time
+
+# Every backend reports a list of dicts with these keys (None when unknown).
+# Units: load %, temp °C, vram bytes, power W, clocks MHz.
+GPU_FIELDS = ["index", "name", "load", "temp", "vram_total", "vram_used", "power", "power_limit",
+              "clock_core", "clock_mem", "backend"]
+
+def empty_gpu():
+    return dict.fromkeys(GPU_FIELDS)
+
+class GPUBackend:
+    name = "none"
+
+    def read(self):
+        return []
+
+    def close(self):
+        pass
+
+# ---------------- NVML ----------------
+
+class _Utilization(ctypes.Structure):
+    _fields_ = [("gpu", ctypes.c_uint), ("memory", ctypes.c_uint)]
+
+class _Memory(ctypes.Structure):
+    _fields_ = [("total", ctypes.c_ulonglong), ("free", ctypes.c_ulonglong), ("used", ctypes.c_ulonglong)]
+
+NVML_TEMPERATURE_GPU = 0
+NVML_CLOCK_GRAPHICS = 0
+NVML_CLOCK_MEM = 2
+
+def _load_nvml():
+    if sys.platform == "win32":
+        paths = [os.path.join(os.environ.get("WINDIR", r"C:\Windows"), "System32", "nvml.dll"),
+                 os.path.join(os.environ.get("ProgramFiles", r"C:\Program Files"), "NVIDIA Corporation", "NVSMI", "nvml.dll")]
+    else:
+        paths = ["libnvidia-ml.so.1", "libnvidia-ml.so"]
+    for p in paths:
+        try:
+            return ctypes.CDLL(p)
+        except OSError:
+            pass
+    raise OSError("NVML library not found")
+
+class NVMLBackend(GPUBackend):
+    # Talks to the driver in-process through libnvidia-ml: initialised once, device
+    # handles and names looked up once, then each read is a handful of cheap calls
+    # (no nvidia-smi subprocess).
+    name = "nvml"
+
+    def __init__(self):
+        self.lib = _load_nvml()
+        if self.lib.nvmlInit_v2() != 0:
+            raise OSError("nvmlInit failed")
+        count = ctypes.c_uint()
+        if self.lib.nvmlDeviceGetCount_v2(ctypes.byref(count)) != 0 or not count.value:
+            self.lib.nvmlShutdown()
+            raise OSError("no NVML devices")
+        self.handles, self.names = [], []
+        for i in range(count.value):
+            h = ctypes.c_void_p()
+            self.lib.nvmlDeviceGetHandleByIndex_v2(i, ctypes.byref(h))
+            buf = ctypes.create_string_buffer(96)
+            self.lib.nvmlDeviceGetName(h, buf, 96)
+            self.handles.append(h)
+            self.names.append(buf.value.decode(errors="replace"))
+
+    def _uint(self, fn, h, *args):
+        v = ctypes.c_uint()
+        return v.value if fn(h, *args, ctypes.byref(v)) == 0 else None
+
+    def read(self):
+        lib, out = self.lib, []
+        for i, (h, name) in enumerate(zip(self.handles, self.names)):
+            g = empty_gpu()
+            g.update(index=i, name=name, backend=self.name)
+            util = _Utilization()
+            if lib.nvmlDeviceGetUtilizationRates(h, ctypes.byref(util)) == 0:
+                g["load"] = float(util.gpu)
+            mem = _Memory()
+            if lib.nvmlDeviceGetMemoryInfo(h, ctypes.byref(mem)) == 0:
+                g["vram_total"], g["vram_used"] = float(mem.total), float(mem.used)
+            temp = self._uint(lib.nvmlDeviceGetTemperature, h, NVML_TEMPERATURE_GPU)
+            g["temp"] = None if temp is None else float(temp)
+            power = self._uint(lib.nvmlDeviceGetPowerUsage, h)
+            g["power"] = None if power is None else power / 1000.0
+            limit = self._uint(lib.nvmlDeviceGetEnforcedPowerLimit, h)
+            g["power_limit"] = None if limit is None else limit / 1000.0
+            g["clock_core"] = self._uint(lib.nvmlDeviceGetClockInfo, h, NVML_CLOCK_GRAPHICS)
+            g["clock_mem"] = self._uint(lib.nvmlDeviceGetClockInfo, h, NVML_CLOCK_MEM)
+            out.append(g)
+        return out
+
+    def close(self):
+        if self.handles:
+            self.handles = []
+            self.lib.nvmlShutdown()
+
+# ---------------- Linux sysfs / DRM ----------------
+
+def _read_text(path):
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+def _read_num(path, scale=1.0):
+    v = _read_text(path)
+    try:
+        return float(v) * scale if v is not None else None
+    except ValueError:
+        return None
+
+def _dpm_clock(path):
+    # pp_dpm_sclk/mclk: "1: 1800Mhz *" marks the current level
+    text = _read_text(path)
+    for line in (text or "").splitlines():
+        if line.endswith("*"):
+            try:
+                return float(line.split(":")[1].strip().rstrip("*").strip().lower().replace("mhz", ""))
+            except (IndexError, ValueError):
+                return None
+    return None
+
+class SysfsBackend(GPUBackend):
+    # amdgpu (and partly i915) expose load, VRAM, hwmon temperature/power and clocks
+    # under /sys/class/drm/cardN/device. Paths are resolved once at start.
+    name = "sysfs"
+
+    def __init__(self, root="/sys/class/drm"):
+        self.cards = []
+        # cardN only; skip connectors like card0-DP-1
+        cards = [c for c in glob.glob(os.path.join(root, "card*")) if os.path.basename(c)[4:].isdigit()]
+        for card in sorted(cards, key=lambda c: int(os.path.basename(c)[4:])):
+            dev = os.path.join(card, "device")
+            hwmon = sorted(glob.glob(os.path.join(dev, "hwmon", "hwmon*")))
+            hw = hwmon[0] if hwmon else None
+            drv = os.path.join(dev, "driver")
+            driver = os.path.basename(os.path.realpath(drv)) if os.path.exists(drv) else "drm"
+            power = hw and os.path.join(hw, "power1_average")
+            if power and not os.path.exists(power): power = os.path.join(hw, "power1_input")
+            paths = {
+                "load": os.path.join(dev, "gpu_busy_percent"),
+                "vram_total": os.path.join(dev, "mem_info_vram_total"),
+                "vram_used": os.path.join(dev, "mem_info_vram_used"),
+                "sclk": os.path.join(dev, "pp_dpm_sclk"),
+                "mclk": os.path.join(dev, "pp_dpm_mclk"),
+                "gt_freq": os.path.join(card, "gt_cur_freq_mhz"),
+                "temp": hw and os.path.join(hw, "temp1_input"),
+                "power": power,
+                "power_limit": hw and os.path.join(hw, "power1_cap"),
+            }
+            paths = {k: p for k, p in paths.items() if p and os.path.exists(p)}
+            if not paths: continue
+            name = _read_text(os.path.join(dev, "product_name")) or f"{driver} {os.path.basename(card)}"
+            self.cards.append((name, paths))
+        if not self.cards:
+            raise OSError("no DRM devices with readable metrics")
+
+    def read(self):
+        out = []
+        for i, (name, p) in enumerate(self.cards):
+            g = empty_gpu()
+            g.update(index=i, name=name, backend=self.name)
+            if "load" in p: g["load"] = _read_num(p["load"])
+            if "vram_total" in p: g["vram_total"] = _read_num(p["vram_total"])
+            if "vram_used" in p: g["vram_used"] = _read_num(p["vram_used"])
+            if "temp" in p: g["temp"] = _read_num(p["temp"], 1e-3)
+            if "power" in p: g["power"] = _read_num(p["power"], 1e-6)
+            if "power_limit" in p: g["power_limit"] = _read_num(p["power_limit"], 1e-6)
+            if "sclk" in p: g["clock_core"] = _dpm_clock(p["sclk"])
+            elif "gt_freq" in p: g["clock_core"] = _read_num(p["gt_freq"])
+            if "mclk" in p: g["clock_mem"] = _dpm_clock(p["mclk"])
+            out.append(g)
+        return out
+
+# ---------------- GPUtil (nvidia-smi) ----------------
+
+class GPUtilBackend(GPUBackend):
+    # Last resort: GPUtil runs nvidia-smi on every read, so keep its interval long.
+    name = "gputil"
+
+    def __init__(self):
+        import GPUtil
+        self.GPUtil = GPUtil
+        if not GPUtil.getGPUs():
+            raise OSError("GPUtil found no GPUs")
+
+    def read(self):
+        out = []
+        for i, d in enumerate(self.GPUtil.getGPUs()):
+            g = empty_gpu()
+            g.update(index=i, name=d.name, backend=self.name, load=float(d.load) * 100.0,
+                     temp=float(d.temperature) if d.temperature is not None else None,
+                     vram_total=float(d.memoryTotal) * 1024**2, vram_used=float(d.memoryUsed) * 1024**2)
+            out.append(g)
+        return out
+
+# ---------------- fake ----------------
+
+class FakeBackend(GPUBackend):
+    # Deterministic synthetic GPUs for tests and demos (AUTODASH_GPU_BACKEND=fake).
+    name = "fake"
+
+    def __init__(self, count=2, clock=time.time):
+        self.count = count
+        self.clock = clock
+
+    def read(self):
+        t = self.clock()
+        out = []
+        for i in range(self.count):
+            load = 50.0 + 45.0 * math.sin(t / 10.0 + i)
+            g = empty_gpu()
+            g.update(index=i, name=f"Fake GPU {i}", backend=self.name, load=load, temp=40.0 + load * 0.4,
+                     vram_total=8.0 * 1024**3, vram_used=(2.0 + 4.0 * load / 100.0) * 1024**3,
+                     power=30.0 + load * 2.0, power_limit=250.0, clock_core=600.0 + load * 12.0, clock_mem=7000.0)
+            out.append(g)
+        return out
+
+BACKENDS = {"nvml": NVMLBackend, "sysfs": SysfsBackend, "gputil": GPUtilBackend, "fake": FakeBackend, "none": GPUBackend}
+AUTO_ORDER = ["nvml", "sysfs", "gputil"]
+
+def open_backend(name=None):
+    # name: a BACKENDS key or None for the first that works (AUTODASH_GPU_BACKEND overrides)
+    name = name or os.environ.get("AUTODASH_GPU_BACKEND")
+    if name:
+        return BACKENDS[name]()
+    for candidate in AUTO_ORDER:
+        try:
+            return BACKENDS[candidate]()
+        except Exception:
+            continue
+    return GPUBackend()
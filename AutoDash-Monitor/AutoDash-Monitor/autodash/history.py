@@ -0,0 +1,198 @@
+import threading
+import numpy as np
+
+class HistoryStore:
+    # Columnar ring buffer with a shared "t" (unix seconds) column.
+    #
+    # Every column is allocated as 2 * slots and each sample is written at i and
+    # i + slots, so the newest samples are always one contiguous slice: views can be
+    # handed to pyqtgraph as-is, no per-tick copies, and memory never grows.
+    # slots = capacity + margin: a view stays intact for `margin` further appends,
+    # which covers plots that are repainted a few ticks after their last setData.
+    def __init__(self, capacity, columns, dtype=np.float32, margin=64):
+        self.capacity = int(capacity)
+        self.margin = int(margin)
+        self.slots = self.capacity + self.margin
+        self.dtype = dtype
+        self.lock = threading.Lock()
+        self._cols = {"t": np.full(2 * self.slots, np.nan, dtype=np.float64)}
+        for name in columns:
+            self._cols[name] = np.full(2 * self.slots, np.nan, dtype=dtype)
+        self._pos = 0
+        self._len = 0
+
+    def __len__(self):
+        return self._len
+
+    def __contains__(self, name):
+        return name in self._cols
+
+    def __getitem__(self, name):
+        return self.view(name)
+
+    def keys(self):
+        with self.lock:
+            return [k for k in self._cols if k != "t"]
+
+    def nbytes(self):
+        return sum(a.nbytes for a in self._cols.values())
+
+    def add_column(self, name, dtype=None):
+        with self.lock:
+            if name not in self._cols:
+                self._cols[name] = np.full(2 * self.slots, np.nan, dtype=dtype or self.dtype)
+
+    def remove_column(self, name):
+        # views already handed out keep their array; later views(...) of it raise KeyError
+        with self.lock:
+            self._cols.pop(name, None)
+
+    def append(self, t, values):
+        # values: {column: number or None}; absent/None columns are stored as NaN
+        with self.lock:
+            i, j = self._pos, self._pos + self.slots
+            for name, col in self._cols.items():
+                v = t if name == "t" else values.get(name)
+                col[i] = col[j] = np.nan if v is None else v
+            self._pos = (self._pos + 1) % self.slots
+            self._len = min(self._len + 1, self.capacity)
+
+    def _slice(self, n):
+        n = self._len if n is None else max(0, min(n, self._len))
+        end = self._pos + self.slots
+        return end - n, end
+
+    def view(self, name, n=None):
+        with self.lock:
+            a, b = self._slice(n)
+            return self._cols[name][a:b]
+
+    def views(self, names, n=None):
+        # Consistent set of equally long views (all taken under one lock);
+        # names=None: every column, "t" first.
+        with self.lock:
+            a, b = self._slice(n)
+            if names is None: names = list(self._cols)
+            return {name: self._cols[name][a:b] for name in names}
+
+    def last(self, name):
+        with self.lock:
+            if not self._len: return None
+            v = self._cols[name][self._pos + self.slots - 1]
+            return None if np.isnan(v) else float(v)
+
+# (resolution seconds, buckets kept): 24 h of 10 s, 7 days of 1 min, 90 days of 1 h
+DEFAULT_TIERS = [(10, 8640), (60, 10080), (3600, 2160)]
+
+class _Rollup:
+    # Running min/mean/max for the bucket currently being filled.
+    def __init__(self, resolution, store, columns):
+        self.resolution = resolution
+        self.store = store
+        self.columns = columns
+        self.bucket = None
+        self._reset()
+
+    def _reset(self):
+        n = len(self.columns)
+        self.sum = np.zeros(n); self.count = np.zeros(n)
+        self.min = np.full(n, np.inf); self.max = np.full(n, -np.inf)
+
+    def add(self, t, v):
+        b = int(t // self.resolution)
+        if self.bucket is not None and b != self.bucket:
+            self.flush()
+        self.bucket = b
+        ok = ~np.isnan(v)
+        self.sum[ok] += v[ok]; self.count[ok] += 1
+        np.fmin(self.min, v, out=self.min); np.fmax(self.max, v, out=self.max)
+
+    def flush(self):
+        if self.bucket is None: return
+        seen = self.count > 0
+        mean = np.where(seen, self.sum / np.maximum(self.count, 1), np.nan)
+        lo = np.where(seen, self.min, np.nan); hi = np.where(seen, self.max, np.nan)
+        row = {}
+        for i, name in enumerate(self.columns):
+            row[name] = mean[i]; row[name + "_min"] = lo[i]; row[name + "_max"] = hi[i]
+        self.store.append(self.bucket * self.resolution, row)
+        self.bucket = None
+        self._reset()
+
+class TieredHistory:
+    # RRD-style history: tier 0 is the full-resolution store, coarser tiers hold
+    # min/mean/max per bucket (mean under the plain column name, so callers can
+    # plot any tier the same way).
+    def __init__(self, raw, raw_resolution, tiers=None):
+        self.columns = raw.keys()
+        self.tiers = [(raw_resolution, raw)]
+        self._rollups = []
+        agg_cols = [c + s for c in self.columns for s in ("", "_min", "_max")]
+        for resolution, capacity in (DEFAULT_TIERS if tiers is None else tiers):
+            store = HistoryStore(capacity, agg_cols, margin=4)
+            self.tiers.append((resolution, store))
+            self._rollups.append(_Rollup(resolution, store, self.columns))
+
+    def append(self, t, values):
+        self.tiers[0][1].append(t, values)
+        v = np.array([np.nan if values.get(c) is None else values[c] for c in self.columns], dtype=np.float64)
+        for r in self._rollups:
+            r.add(t, v)
+
+    def nbytes(self):
+        return sum(store.nbytes() for _, store in self.tiers)
+
+    def pick(self, x0, x1, max_points=2000):
+        # Finest tier that needs <= max_points for the span and reaches back to x0
+        # (5% slack for autorange padding). If none does, the one reaching furthest
+        # back, counting a bucket's end so a coarse tier only wins with older data.
+        span = max(0.0, x1 - x0)
+        best = None
+        for resolution, store in self.tiers:
+            if span / resolution > max_points:
+                continue
+            oldest = store.view("t")[:1]
+            if not len(oldest):
+                continue
+            if oldest[0] <= x0 + 0.05 * span:
+                return resolution, store
+            if best is None or oldest[0] + resolution < best[0]:
+                best = (oldest[0] + resolution, resolution, store)
+        return best[1:] if best else self.tiers[-1]
+
+class RingMatrix:
+    # Fixed-width rows (e.g. per-core CPU %) in the same double-written layout as
+    # HistoryStore: the newest rows are always one contiguous (n, width) block.
+    def __init__(self, capacity, width, dtype=np.float32, margin=16):
+        self.capacity = int(capacity)
+        self.width = int(width)
+        self.slots = self.capacity + int(margin)
+        self.lock = threading.Lock()
+        self._data = np.full((2 * self.slots, self.width), np.nan, dtype=dtype)
+        self._t = np.full(2 * self.slots, np.nan)
+        self._pos = 0
+        self._len = 0
+
+    def __len__(self):
+        return self._len
+
+    def append(self, t, row):
+        row = np.asarray(row, dtype=self._data.dtype)[:self.width]
+        with self.lock:
+            i, j = self._pos, self._pos + self.slots
+            self._data[i, :len(row)] = self._data[j, :len(row)] = row
+            self._data[i, len(row):] = self._data[j, len(row):] = np.nan
+            self._t[i] = self._t[j] = t
+            self._pos = (self._pos + 1) % self.slots
+            self._len = min(self._len + 1, self.capacity)
+
+    def view(self, n=None):
+        # -> (timestamps, rows) for the newest n rows
+        with self.lock:
+            n = self._len if n is None else max(0, min(n, self._len))
+            end = self._pos + self.slots
+            return self._t[end - n:end], self._data[end - n:end]
+
+    def last(self):
+        t, rows = self.view(1)
+        return rows[0] if len(rows) else None
@@ -1,19 +1,29 @@
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import QDialog, QVBoxLayout, QLabel
 
+from .relay import FrameRelay
+
 class HUD(QDialog):
-    def __init__(self, monitor, parent=None):
+    def __init__(self, bus, interval=1.0, parent=None):
         super().__init__(parent)
         self.setWindowFlags(self.windowFlags() | Qt.Tool | Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint)
         self.setAttribute(Qt.WA_TranslucentBackground)
-        self.monitor = monitor
+        self.relay = FrameRelay(bus, interval, self)
         self.label = QLabel("--", self)
         self.label.setStyleSheet("QLabel { background: rgba(15,21,29,180); color: #9ecfff; padding: 12px 16px; border-radius: 12px; font-size: 14pt; }")
         layout = QVBoxLayout(self); layout.addWidget(self.label)
-        self.timer = QTimer(self); self.timer.timeout.connect(self.refresh); self.timer.start(1000)
-        self.refresh()
+        self.relay.frame.connect(self.refresh, Qt.QueuedConnection)
+        if bus.latest: self.refresh(bus.latest)
+
+    def closeEvent(self, e):
+        self.relay.close()
+        super().closeEvent(e)
 
-    def refresh(self):
-        s = self.monitor.snapshot()
-        txt = f"CPU {int(s['cpu_total'])}% | RAM {int(s['ram_percent'])}% | NET ↓{int(s['net_down_bps']/1024)} KB/s ↑{int(s['net_up_bps']/1024)} KB/s"
+    def refresh(self, frame):
+        s = frame.snap
+        # replayed records (CSV logs, older schemas) can lack any of these
+        def num(key, scale=1):
+            v = s.get(key)
+            return "--" if v is None or v != v else int(v / scale)
+        txt = f"CPU {num('cpu_total')}% | RAM {num('ram_percent')}% | NET ↓{num('net_down_bps', 1024)} KB/s ↑{num('net_up_bps', 1024)} KB/s"
         self.label.setText(txt)
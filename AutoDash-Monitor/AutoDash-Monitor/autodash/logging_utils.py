@@ -1,4 +1,136 @@
-import csv, os, time, datetime
+import csv, os, time, datetime, json, struct
+
+from .profiler import PROFILER
+from .snapshot import RECORD_FIELDS, RECORD_NAMES, SNAPSHOT_VERSION, as_snapshot
+
+LOG_FIELDS = list(RECORD_NAMES)
+
+# Binary log layout: MAGIC, uint32 schema length, JSON schema, zero padding up to
+# HEADER_SIZE, then fixed-width little-endian rows (NaN = missing). Since version 2
+# a row is exactly a Snapshot record (snapshot.RECORD_FIELDS); version-1 files
+# (timestamp f8 + 8 x f4) remain readable since readers go by the header's fields.
+MAGIC = b"ADLOG01\n"
+HEADER_SIZE = 512
+LOG_SCHEMA = {
+    "version": 2,
+    "snapshot": SNAPSHOT_VERSION,
+    "fields": [[name, dt] for name, dt in RECORD_FIELDS],
+}
+
+_STRUCT_CODES = {"<f8": "d", "<f4": "f"}
+
+def _row_struct(schema):
+    return struct.Struct("<" + "".join(_STRUCT_CODES[dt] for _, dt in schema["fields"]))
+
+def read_header(f):
+    head = f.read(HEADER_SIZE)
+    if len(head) < len(MAGIC) + 4 or not head.startswith(MAGIC):
+        raise ValueError("not an AutoDash binary log")
+    (n,) = struct.unpack_from("<I", head, len(MAGIC))
+    return json.loads(head[len(MAGIC) + 4:len(MAGIC) + 4 + n].decode("utf-8"))
+
+def _header_bytes(schema):
+    body = json.dumps(schema).encode("utf-8")
+    head = MAGIC + struct.pack("<I", len(body)) + body
+    if len(head) > HEADER_SIZE:
+        raise ValueError("log schema too large for header")
+    return head.ljust(HEADER_SIZE, b"\0")
+
+def _set_aside(path, tag):
+    # metrics_<date>.adl -> metrics_<date>.<tag>.adl (or .<tag>-2.adl ... if taken)
+    base, ext = os.path.splitext(path)
+    dst, n = f"{base}.{tag}{ext}", 1
+    while os.path.exists(dst):
+        n += 1
+        dst = f"{base}.{tag}-{n}{ext}"
+    os.replace(path, dst)
+    return dst
+
+class BinaryLogger:
+    # Keeps today's file open and appends packed rows in batches: one write per
+    # `batch_rows` samples or `flush_interval` seconds, whichever comes first.
+    def __init__(self, log_dir="logs", batch_rows=60, flush_interval=10.0):
+        self.log_dir = log_dir
+        self.batch_rows = batch_rows
+        self.flush_interval = flush_interval
+        self.schema = LOG_SCHEMA
+        self._row_size = _row_struct(self.schema).size
+        self._buf = bytearray()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._f = None
+        os.makedirs(self.log_dir, exist_ok=True)
+        self.file_path = self._file_for_today()
+        self._open()
+
+    def _file_for_today(self):
+        date = datetime.date.today().isoformat()
+        return os.path.join(self.log_dir, f"metrics_{date}.adl")
+
+    def _open(self):
+        size = os.path.getsize(self.file_path) if os.path.exists(self.file_path) else 0
+        if size >= HEADER_SIZE:
+            with open(self.file_path, "rb") as f:
+                schema = read_header(f)
+            if schema != self.schema:
+                # today's file predates this schema: keep it aside (still readable) and start over
+                tag = f"v{schema.get('version', 0)}" + (f".{schema['snapshot']}" if "snapshot" in schema else "")
+                _set_aside(self.file_path, tag)
+                return self._open()
+            # drop a partial row left by an interrupted write
+            extra = (size - HEADER_SIZE) % self._row_size
+            if extra: os.truncate(self.file_path, size - extra)
+            self._f = open(self.file_path, "ab")
+        else:
+            self._f = open(self.file_path, "wb")
+            self._f.write(_header_bytes(self.schema))
+            self._f.flush()
+
+    def rotate_if_needed(self):
+        path = self._file_for_today()
+        if path != self.file_path:
+            self.flush()
+            self._f.close()
+            self.file_path = path
+            self._open()
+
+    def log(self, snap, t=None):
+        with PROFILER.stage("log"):
+            self.rotate_if_needed()
+            # the record's bytes are the row; no per-field packing
+            self._buf += as_snapshot(snap, t).to_bytes()
+            self._pending += 1
+            if self._pending >= self.batch_rows or time.monotonic() - self._last_flush >= self.flush_interval:
+                self.flush()
+
+    def flush(self):
+        if self._buf and self._f:
+            self._f.write(self._buf)
+            self._f.flush()
+            self._buf.clear()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        if self._f:
+            self.flush()
+            self._f.close()
+            self._f = None
+
+def export_csv(src, dst=None):
+    # Convert a binary log to the CSV layout written by CSVLogger.
+    dst = dst or os.path.splitext(src)[0] + ".csv"
+    with open(src, "rb") as f:
+        schema = read_header(f)
+        row = _row_struct(schema)
+        f.seek(HEADER_SIZE)
+        data = f.read()
+    with open(dst, "w", newline="", encoding="utf-8") as out:
+        w = csv.writer(out)
+        w.writerow([name for name, _ in schema["fields"]])
+        for values in row.iter_unpack(data[:len(data) - len(data) % row.size]):
+            w.writerow(["" if v != v else v for v in values])
+    return dst
 
 class CSVLogger:
     def __init__(self, log_dir="logs"):
@@ -12,10 +144,15 @@ class CSVLogger:
         return os.path.join(self.log_dir, f"metrics_{date}.csv")
 
     def _ensure_header(self):
-        if not os.path.exists(self.file_path):
-            with open(self.file_path, "w", newline="", encoding="utf-8") as f:
-                w = csv.writer(f)
-                w.writerow(["timestamp","cpu_total","ram_percent","net_up_bps","net_down_bps","disk_read_bps","disk_write_bps","gpu_load","gpu_temp"])
+        if os.path.exists(self.file_path):
+            with open(self.file_path, newline="", encoding="utf-8") as f:
+                header = next(csv.reader(f), None)
+            if header == LOG_FIELDS: return
+            if header:
+                # written with older columns: keep it aside, like BinaryLogger does
+                _set_aside(self.file_path, "old")
+        with open(self.file_path, "w", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerow(LOG_FIELDS)
 
     def rotate_if_needed(self):
         path = self._file_for_today()
@@ -23,18 +160,14 @@ class CSVLogger:
             self.file_path = path
             self._ensure_header()
 
-    def log(self, snap):
-        self.rotate_if_needed()
-        row = [
-            time.time(),
-            snap.get("cpu_total"),
-            snap.get("ram_percent"),
-            snap.get("net_up_bps"),
-            snap.get("net_down_bps"),
-            snap.get("disk_read_bps"),
-            snap.get("disk_write_bps"),
-            (snap.get("gpu") or {}).get("load"),
-            (snap.get("gpu") or {}).get("temp"),
-        ]
-        with open(self.file_path, "a", newline="", encoding="utf-8") as f:
-            csv.writer(f).writerow(row)
+    def log(self, snap, t=None):
+        with PROFILER.stage("log"):
+            self.rotate_if_needed()
+            rec = as_snapshot(snap, t).record
+            # NumPy scalars print at their stored precision (f4 "12.3", not "12.300000190734863")
+            row = ["" if v != v else v for v in (rec[name] for name in LOG_FIELDS)]
+            with open(self.file_path, "a", newline="", encoding="utf-8") as f:
+                csv.writer(f).writerow(row)
+
+    def close(self):
+        pass
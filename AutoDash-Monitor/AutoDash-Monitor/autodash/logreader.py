@@ -0,0 +1,93 @@
+import os, glob, time, datetime
+import numpy as np
+
+from .logging_utils import HEADER_SIZE, read_header
+
+# log field -> Monitor history column
+LOG_TO_HISTORY = {
+    "cpu_total": "cpu_total",
+    "net_up_bps": "net_up",
+    "net_down_bps": "net_down",
+    "disk_read_bps": "disk_read",
+    "disk_write_bps": "disk_write",
+    "gpu_load": "gpu_load",
+    "gpu_temp": "gpu_temp",
+    "psi_cpu_some": "psi_cpu",
+    "psi_memory_some": "psi_memory",
+    "psi_io_some": "psi_io",
+}
+
+class LogReader:
+    # Read-only access to the daily binary logs. Files are memory-mapped as
+    # structured arrays and ranges are located by binary search on the timestamp
+    # column, so a query touches only the pages it returns.
+    def __init__(self, log_dir="logs"):
+        self.log_dir = log_dir
+        self._maps = {}
+
+    def files(self):
+        out = []
+        for path in sorted(glob.glob(os.path.join(self.log_dir, "metrics_*.adl"))):
+            try:
+                day = datetime.date.fromisoformat(os.path.basename(path)[8:18])
+            except ValueError:
+                continue
+            out.append((day, path))
+        return out
+
+    def open(self, path):
+        size = os.path.getsize(path)
+        cached = self._maps.get(path)
+        if cached and cached[0] == size:
+            return cached[1]
+        with open(path, "rb") as f:
+            schema = read_header(f)
+        dtype = np.dtype([(name, dt) for name, dt in schema["fields"]])
+        rows = max(0, size - HEADER_SIZE) // dtype.itemsize
+        if rows:
+            arr = np.memmap(path, dtype=dtype, mode="r", offset=HEADER_SIZE, shape=(rows,))
+        else:
+            arr = np.zeros(0, dtype=dtype)
+        self._maps[path] = (size, arr)
+        return arr
+
+    def query(self, fields, t0=None, t1=None):
+        # -> {"timestamp": ..., field: ...} float64 arrays for t0 <= timestamp <= t1
+        if isinstance(fields, str): fields = [fields]
+        t0 = -np.inf if t0 is None else t0
+        t1 = np.inf if t1 is None else t1
+        d0 = datetime.date.fromtimestamp(t0) if np.isfinite(t0) else datetime.date.min
+        d1 = datetime.date.fromtimestamp(t1) if np.isfinite(t1) else datetime.date.max
+        chunks = []
+        for day, path in self.files():
+            if not d0 <= day <= d1: continue
+            arr = self.open(path)
+            ts = arr["timestamp"]
+            i = np.searchsorted(ts, t0, side="left")
+            j = np.searchsorted(ts, t1, side="right")
+            if j > i: chunks.append(arr[i:j])
+        # a day can have a file set aside by a log schema change (metrics_<date>.v1.adl)
+        chunks.sort(key=lambda c: c["timestamp"][0])
+        out = {}
+        for name in ["timestamp"] + list(fields):
+            # a field an older-schema chunk lacks reads as NaN, so arrays stay aligned with timestamp
+            parts = [c[name] if name in c.dtype.names else np.full(len(c), np.nan) for c in chunks]
+            out[name] = np.concatenate(parts).astype(np.float64) if parts else np.zeros(0)
+        return out
+
+    def last_days(self, fields, days=7, now=None):
+        now = time.time() if now is None else now
+        return self.query(fields, now - days * 86400, now)
+
+    def load_history(self, tiers, seconds=3600, now=None):
+        # Replay the tail of previous sessions into a TieredHistory so graphs start
+        # populated; a NaN row afterwards keeps the gap to the live data visible.
+        now = time.time() if now is None else now
+        data = self.query(list(LOG_TO_HISTORY), now - seconds, now)
+        ts = data["timestamp"]
+        if not len(ts): return 0
+        cols = {hist: data[log] for log, hist in LOG_TO_HISTORY.items()}
+        for k, t in enumerate(ts):
+            tiers.append(float(t), {hist: float(v[k]) for hist, v in cols.items()})
+        tiers.append(float(ts[-1]) + 1e-3, {})
+        return len(ts)
@@ -1,17 +1,29 @@
 import sys, os, time
-from PyQt5.QtCore import Qt, QTimer, QPropertyAnimation, QSequentialAnimationGroup
+import psutil
+from PyQt5.QtCore import Qt, QEvent, QRectF, QTimer, QPropertyAnimation, QSequentialAnimationGroup
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
-                             QLabel, QGroupBox, QProgressBar, QPushButton, QTabWidget, QTableWidget,
-                             QTableWidgetItem, QMessageBox, QCheckBox, QSpinBox)
+                             QLabel, QGroupBox, QProgressBar, QPushButton, QTabWidget, QTableView,
+                             QAbstractItemView, QMessageBox, QCheckBox, QSpinBox, QComboBox,
+                             QSystemTrayIcon, QStyle, QTableWidget, QTableWidgetItem, QHeaderView)
 import pyqtgraph as pg
 
 from .gauge import Gauge
 from .monitor import Monitor
-from .processes import list_processes, kill_process
-from .logging_utils import CSVLogger
+from .processes import kill_process, RANK_KEYS
+from .proctable import ProcessTableModel, ProcessSortProxy, EXTRA_COLUMNS
+from .logging_utils import BinaryLogger, export_csv
+from .logreader import LogReader
 from .themes import apply_dark, apply_light
 from .hud import HUD
 from .stress import CPUStressor
+from .tempmap import TempMap
+from .coreview import CoreStrip, CORE_LUT
+from .panels import PanelSet, PROCS, HISTORY
+from .sampler import Sampler
+from .bus import SnapshotBus
+from .relay import FrameRelay, AlertRelay
+from .alerts import AlertEngine, AlertLog
+from .profiler import PROFILER
 
 def human_bytes(n):
     if n is None: return "--"
@@ -28,27 +40,69 @@ def human_bps(n):
     return f"{n:.1f} PB/s"
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, export=None, collect=None, replay=None, exit_at_end=False):
         super().__init__()
-        self.setWindowTitle("AutoDash Monitor")
+        self.setWindowTitle("AutoDash Monitor" if replay is None else "AutoDash Monitor · replay")
         self.resize(1200, 800)
-        self.monitor = Monitor(history_len=600)
-        self.logger = CSVLogger(log_dir="logs")
+        # replay: a replay.ReplayMonitor standing in for the live Monitor; nothing is logged
+        self.replay = replay
+        self.exit_at_end = exit_at_end
+        self.monitor = replay or Monitor(history_len=2400)
+        self.logger = None
+        if replay is None:
+            self.logger = BinaryLogger(log_dir="logs")
+            try:
+                # start the graphs from the previous session's last hour
+                LogReader("logs").load_history(self.monitor.tiers, seconds=3600)
+            except Exception as e:
+                print(f"Could not load log history: {e}", file=sys.stderr)
         self.hud = None
         self.stressor = CPUStressor()
-
-        # Alerts thresholds
-        self.temp_threshold = 85
-        self.cpu_threshold = 95
-        self.ram_threshold = 95
+        # One sampler feeds every consumer through the bus; each picks its own rate.
+        self.bus = SnapshotBus()
+        self.sampler = Sampler(self.monitor, bus=self.bus, proc_limit=0 if replay else 40,
+                               tick_hist=replay.stats.tick if replay else None)
+        if self.logger:
+            self.bus.subscribe(lambda f: self.logger.log(f.snap, f.t), interval=1.0)
+        self.relay = FrameRelay(self.bus, parent=self)
+        # alert rules run on the sampler thread; events reach the log there and the GUI queued
+        self.alert_relay = AlertRelay(self)
+        self.alerts = AlertEngine(sinks=[self.alert_relay] if replay else [AlertLog("logs"), self.alert_relay])
+        self.alert_sub = self.bus.subscribe(self.alerts.evaluate)
+        self._latest = None
+        self._shown_procs = None
+        self._render_pending = False
+        self._diag_at = 0.0
+
+        self.collector = None
+        if collect:
+            from .remote import Collector
+            self.collector = Collector(*collect).start()
 
         self._make_ui()
+        self._make_panels()
         self._engine_start_animation()
-        self.timer = QTimer(self); self.timer.timeout.connect(self.refresh); self.timer.start(1000)
+        self.relay.frame.connect(self.on_frame, Qt.QueuedConnection)
+        self.alert_relay.alert.connect(self.on_alert, Qt.QueuedConnection)
+        self.tray = None
+        if QSystemTrayIcon.isSystemTrayAvailable():
+            self.tray = QSystemTrayIcon(self.style().standardIcon(QStyle.SP_ComputerIcon), self)
+            self.tray.setToolTip("AutoDash Monitor")
+            self.tray.show()
+        self.exporter = None
+        if export:
+            from .exporter import MetricsExporter
+            self.exporter = MetricsExporter(self.bus, self.monitor.history, *export)
+            self.exporter.start()
+        if replay is not None:
+            self._replay_timer = QTimer(self)
+            self._replay_timer.timeout.connect(self._poll_replay)
+            self._replay_timer.start(250)
+        self.sampler.start()
 
     # ---------------- UI ----------------
     def _make_ui(self):
-        tabs = QTabWidget(self)
+        self.tabs = tabs = QTabWidget(self)
         self.setCentralWidget(tabs)
 
         # Overview tab
@@ -56,14 +110,21 @@ class MainWindow(QMainWindow):
         ov_layout = QVBoxLayout(self.overview)
 
         # Top gauges
-        gbox = QGroupBox("Live Gauges")
+        self.gauge_box = gbox = QGroupBox("Live Gauges")
         gl = QGridLayout(gbox)
         self.cpu_gauges = []
-        cpu_cores = max(1, len(self.monitor.snapshot()["cpu_per_core"]))
-        for i in range(min(cpu_cores, 8)):
-            g = Gauge(label=f"CPU Core {i+1}")
-            self.cpu_gauges.append(g)
-            gl.addWidget(g, i//4, i%4)
+        cpu_cores = max(1, psutil.cpu_count() or 1)
+        # one gauge per core up to 8 cores; beyond that all cores go in a single heat strip
+        self.core_strip = None
+        if cpu_cores <= 8:
+            for i in range(cpu_cores):
+                g = Gauge(label=f"CPU Core {i+1}")
+                self.cpu_gauges.append(g)
+                gl.addWidget(g, i//4, i%4)
+        else:
+            self.core_strip = CoreStrip(cpu_cores)
+            self.core_strip.setToolTip(f"{cpu_cores} logical CPUs")
+            gl.addWidget(self.core_strip, 0, 0, 2, 4)
         self.gpu_gauge = Gauge(label="GPU Load")
         gl.addWidget(self.gpu_gauge, 2, 0)
         self.cpu_total_gauge = Gauge(label="CPU Total")
@@ -73,7 +134,7 @@ class MainWindow(QMainWindow):
         ov_layout.addWidget(gbox)
 
         # Middle stats
-        stats = QGroupBox("System Stats")
+        self.stats_box = stats = QGroupBox("System Stats")
         sl = QGridLayout(stats)
         self.label_gpu = QLabel("GPU: --")
         sl.addWidget(self.label_gpu, 0, 0)
@@ -85,25 +146,32 @@ class MainWindow(QMainWindow):
         sl.addWidget(self.label_disk, 1, 1)
         self.label_batt = QLabel("Battery: --")
         sl.addWidget(self.label_batt, 2, 0)
+        # cgroup mode: CPU and RAM above are the container's; throttling and pressure here
+        self.label_cgroup = QLabel("Container: --")
+        sl.addWidget(self.label_cgroup, 2, 1)
+        cgroup = getattr(self.monitor, "cgroup", None)
+        self.label_cgroup.setVisible(cgroup is not None)
+        if cgroup is not None:
+            self.ram_bar.setFormat("Container RAM %p%")
+            self.label_cgroup.setToolTip(cgroup.path)
         ov_layout.addWidget(stats)
 
         # Temperature map
-        tgroup = QGroupBox("Temperature Map")
+        self.temp_box = tgroup = QGroupBox("Temperature Map")
         tl = QVBoxLayout(tgroup)
-        self.temp_labels = []
-        self.temp_container = QWidget()
-        self.temp_layout = QGridLayout(self.temp_container)
-        tl.addWidget(self.temp_container)
+        self.temp_map = TempMap(parent=tgroup)
+        tl.addWidget(self.temp_map)
         ov_layout.addWidget(tgroup)
 
         # Graphs tab
         self.graphs = QWidget(); tabs.addTab(self.graphs, "Graphs")
         glay = QGridLayout(self.graphs)
         pg.setConfigOptions(antialias=True)
-        self.plot_net = pg.PlotWidget(title="Network (dl/ul)")
-        self.plot_disk = pg.PlotWidget(title="Disk (read/write)")
-        self.plot_cpu = pg.PlotWidget(title="CPU Total (%)")
-        self.plot_gpu = pg.PlotWidget(title="GPU Load/Temp")
+        # x axis is the history store's timestamp column, so views go straight to setData
+        self.plot_net = pg.PlotWidget(title="Network (dl/ul)", axisItems={"bottom": pg.DateAxisItem()})
+        self.plot_disk = pg.PlotWidget(title="Disk (read/write)", axisItems={"bottom": pg.DateAxisItem()})
+        self.plot_cpu = pg.PlotWidget(title="CPU Total (%)", axisItems={"bottom": pg.DateAxisItem()})
+        self.plot_gpu = pg.PlotWidget(title="GPU Load/Temp", axisItems={"bottom": pg.DateAxisItem()})
         for pl in [self.plot_net, self.plot_disk, self.plot_cpu, self.plot_gpu]:
             pl.showGrid(x=True, y=True, alpha=0.2)
         self.cur_net_down = self.plot_net.plot(pen=pg.mkPen(width=2))
@@ -113,23 +181,107 @@ class MainWindow(QMainWindow):
         self.cur_cpu = self.plot_cpu.plot(pen=pg.mkPen(width=2))
         self.cur_gpu = self.plot_gpu.plot(pen=pg.mkPen(width=2))
         self.cur_gpu_t = self.plot_gpu.plot(pen=pg.mkPen(style=Qt.DashLine,width=2))
+        # per plot: base title, curves and the history columns they show
+        self._graph_specs = [
+            (self.plot_net, "Network (dl/ul)", [(self.cur_net_down, "net_down"), (self.cur_net_up, "net_up")]),
+            (self.plot_disk, "Disk (read/write)", [(self.cur_disk_r, "disk_read"), (self.cur_disk_w, "disk_write")]),
+            (self.plot_cpu, "CPU Total (%)", [(self.cur_cpu, "cpu_total")]),
+            (self.plot_gpu, "GPU Load/Temp", [(self.cur_gpu, "gpu_load"), (self.cur_gpu_t, "gpu_temp")]),
+        ]
+        self._graph_tier = {}
+        # time x core heat image fed straight from Monitor.core_history
+        self.plot_cores = pg.PlotWidget(title="CPU per core (%)", axisItems={"bottom": pg.DateAxisItem()})
+        self.core_image = pg.ImageItem(lut=CORE_LUT, levels=(0, 100))
+        self.plot_cores.addItem(self.core_image)
+        self.plot_cores.setLabel("left", "core")
         glay.addWidget(self.plot_net, 0, 0)
         glay.addWidget(self.plot_disk, 0, 1)
         glay.addWidget(self.plot_cpu, 1, 0)
         glay.addWidget(self.plot_gpu, 1, 1)
+        glay.addWidget(self.plot_cores, 2, 0, 1, 2)
+
+        # Devices tab: per-interface / per-disk rates and the selected device's history
+        self.devices = QWidget(); tabs.addTab(self.devices, "Devices")
+        dvl = QVBoxLayout(self.devices)
+        self.dev_table = QTableWidget(0, 8)
+        self.dev_table.setHorizontalHeaderLabels(["Device", "Read / ↓", "Write / ↑", "R IOPS / ↓ pkt/s",
+                                                  "W IOPS / ↑ pkt/s", "R lat ms", "W lat ms", "Busy %"])
+        self.dev_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.dev_table.verticalHeader().setVisible(False)
+        self.dev_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.dev_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.dev_table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.dev_table.itemSelectionChanged.connect(lambda: self._latest and self._render_devices(self._latest))
+        dvl.addWidget(self.dev_table, 1)
+        self.plot_dev = pg.PlotWidget(title="Select a device", axisItems={"bottom": pg.DateAxisItem()})
+        self.plot_dev.showGrid(x=True, y=True, alpha=0.2)
+        self.cur_dev_a = self.plot_dev.plot(pen=pg.mkPen(width=2))
+        self.cur_dev_b = self.plot_dev.plot(pen=pg.mkPen(style=Qt.DashLine, width=2))
+        dvl.addWidget(self.plot_dev, 1)
+        self._dev_rows = []
 
         # Processes tab
         self.proc = QWidget(); tabs.addTab(self.proc, "Processes")
         pl = QVBoxLayout(self.proc)
-        self.table = QTableWidget(0, 4, self.proc)
-        self.table.setHorizontalHeaderLabels(["PID", "Name", "CPU %", "MEM %"])
+        self.proc_model = ProcessTableModel(self)
+        self.proc_proxy = ProcessSortProxy(self.proc_model, self)
+        self.table = QTableView(self.proc)
+        self.table.setModel(self.proc_proxy)
+        self.table.setSortingEnabled(True)
+        self.table.sortByColumn(2, Qt.DescendingOrder)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.verticalHeader().setVisible(False)
         pl.addWidget(self.table)
         row = QHBoxLayout()
         self.btn_kill = QPushButton("Kill Selected")
         self.btn_kill.clicked.connect(self.kill_selected)
         row.addWidget(self.btn_kill)
         row.addStretch(1)
+        row.addWidget(QLabel("Top 40 by"))
+        self.combo_rank = QComboBox()
+        for key, label in RANK_KEYS.items():
+            self.combo_rank.addItem(label, key)
+        self.combo_rank.currentIndexChanged.connect(lambda i: self.set_proc_rank(self.combo_rank.itemData(i)))
+        row.addWidget(self.combo_rank)
+        row.addWidget(QLabel("every"))
+        self.spin_proc = QSpinBox(); self.spin_proc.setRange(1, 60); self.spin_proc.setSuffix(" s")
+        self.spin_proc.setValue(int(self.sampler.proc_interval))
+        self.spin_proc.valueChanged.connect(lambda v: setattr(self.sampler, "proc_interval", float(v)))
+        row.addWidget(self.spin_proc)
         pl.addLayout(row)
+        self.set_proc_rank("cpu")
+
+        # Fleet tab: hosts streaming to this window's collector
+        self.fleet = None
+        if self.collector:
+            from .fleet import FleetView
+            self.fleet = FleetView(self.collector)
+            tabs.addTab(self.fleet, "Fleet")
+
+        # Diagnostics tab: what AutoDash itself costs, per stage (see profiler.py)
+        self.diag = QWidget(); tabs.addTab(self.diag, "Diagnostics")
+        dl = QVBoxLayout(self.diag)
+        drow = QHBoxLayout()
+        self.chk_profile = QCheckBox("Profile AutoDash")
+        self.chk_profile.setChecked(PROFILER.enabled)
+        self.chk_profile.stateChanged.connect(lambda state: PROFILER.enable(state == Qt.Checked))
+        drow.addWidget(self.chk_profile)
+        self.btn_profile_reset = QPushButton("Reset")
+        self.btn_profile_reset.clicked.connect(PROFILER.reset)
+        drow.addWidget(self.btn_profile_reset)
+        self.btn_profile_export = QPushButton("Export (JSON)")
+        self.btn_profile_export.clicked.connect(self.export_profile)
+        drow.addWidget(self.btn_profile_export)
+        drow.addStretch(1)
+        self.label_self = QLabel("AutoDash: --")
+        drow.addWidget(self.label_self)
+        dl.addLayout(drow)
+        self.diag_table = QTableWidget(0, 7)
+        self.diag_table.setHorizontalHeaderLabels(["Stage", "Count", "p50 ms", "p99 ms", "Max ms", "Total s", "% wall"])
+        self.diag_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.diag_table.verticalHeader().setVisible(False)
+        self.diag_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        dl.addWidget(self.diag_table)
 
         # Tools tab
         self.tools = QWidget(); tabs.addTab(self.tools, "Tools")
@@ -146,20 +298,29 @@ class MainWindow(QMainWindow):
         tl2.addWidget(self.theme_toggle, 0, 1)
         tl2.addWidget(self.btn_stress_start, 1, 0)
         tl2.addWidget(self.btn_stress_stop, 1, 1)
-
-        # Alerts
+        srow = QHBoxLayout()
+        srow.addWidget(QLabel("Stress load per worker"))
+        self.spin_load = QSpinBox(); self.spin_load.setRange(10, 100); self.spin_load.setValue(100); self.spin_load.setSuffix(" %")
+        srow.addWidget(self.spin_load)
+        srow.addStretch(1)
+        tl2.addLayout(srow, 1, 2)
+        self.btn_export = QPushButton("Export Today's Log (CSV)")
+        self.btn_export.clicked.connect(self.export_log)
+        tl2.addWidget(self.btn_export, 3, 0)
+
+        # Alerts: the spin boxes move the thresholds of the engine's default rules
         arow = QHBoxLayout()
         arow.addWidget(QLabel("Temp alert °C>"))
-        self.spin_temp = QSpinBox(); self.spin_temp.setRange(40, 110); self.spin_temp.setValue(self.temp_threshold)
-        self.spin_temp.valueChanged.connect(lambda v: setattr(self, "temp_threshold", v))
+        self.spin_temp = QSpinBox(); self.spin_temp.setRange(40, 110); self.spin_temp.setValue(int(self.alerts.rule("temp").threshold))
+        self.spin_temp.valueChanged.connect(lambda v: [self.alerts.rule(n).set_threshold(v) for n in ("temp", "gpu_temp")])
         arow.addWidget(self.spin_temp)
         arow.addWidget(QLabel("CPU %>"))
-        self.spin_cpu = QSpinBox(); self.spin_cpu.setRange(50, 100); self.spin_cpu.setValue(self.cpu_threshold)
-        self.spin_cpu.valueChanged.connect(lambda v: setattr(self, "cpu_threshold", v))
+        self.spin_cpu = QSpinBox(); self.spin_cpu.setRange(50, 100); self.spin_cpu.setValue(int(self.alerts.rule("cpu").threshold))
+        self.spin_cpu.valueChanged.connect(lambda v: self.alerts.rule("cpu").set_threshold(v))
         arow.addWidget(self.spin_cpu)
         arow.addWidget(QLabel("RAM %>"))
-        self.spin_ram = QSpinBox(); self.spin_ram.setRange(50, 100); self.spin_ram.setValue(self.ram_threshold)
-        self.spin_ram.valueChanged.connect(lambda v: setattr(self, "ram_threshold", v))
+        self.spin_ram = QSpinBox(); self.spin_ram.setRange(50, 100); self.spin_ram.setValue(int(self.alerts.rule("ram").threshold))
+        self.spin_ram.valueChanged.connect(lambda v: self.alerts.rule("ram").set_threshold(v))
         arow.addWidget(self.spin_ram)
         arow.addStretch(1)
         tl2.addLayout(arow, 2, 0, 1, 2)
@@ -186,26 +347,100 @@ class MainWindow(QMainWindow):
             self._anim_groups.append(seq)
 
     # ---------------- Refresh ----------------
-    def refresh(self):
-        s = self.monitor.snapshot()
-        # Gauges
+    def on_frame(self, frame):
+        # Frames can pile up while the GUI is busy; keep only the newest and render once.
+        self._latest = frame
+        if not self._render_pending:
+            self._render_pending = True
+            QTimer.singleShot(0, self._render_latest)
+
+    def _render_latest(self):
+        self._render_pending = False
+        if self._latest is not None:
+            self.refresh(self._latest)
+
+    def _make_panels(self):
+        # Each panel names the snapshot fields it shows; it repaints only when one of
+        # them changed and only while visible (see panels.PanelSet).
+        self.panels = PanelSet()
+        self.panels.add(self.gauge_box, self._render_gauges, ["cpu_per_core", "cpu_total", "gpu", "ram_percent"])
+        self.panels.add(self.stats_box, self._render_stats, ["gpu", "gpus", "net_up_bps", "net_down_bps", "disk_read_bps",
+                                                             "disk_write_bps", "battery", "cpu_throttled", "psi_cpu_some",
+                                                             "psi_memory_some", "psi_io_some"])
+        self.panels.add(self.temp_box, self._render_temps, ["temps"])
+        self.panels.add(self.graphs, self._render_graphs, [HISTORY])
+        self.panels.add(self.devices, self._render_devices, ["nics", "disks", HISTORY])
+        self.panels.add(self.proc, self._render_procs, [PROCS])
+        self.panels.add(self.diag, self._render_diag, [HISTORY])
+        # enumerate processes only while their tab is showing
+        self.tabs.currentChanged.connect(self._on_visibility_changed)
+        self._on_visibility_changed()
+
+    def _on_visibility_changed(self, *args):
+        showing = self.tabs.currentWidget() is self.proc and not self.isMinimized()
+        if showing and not self.sampler.procs_enabled:
+            self.sampler.refresh_procs()
+        self.sampler.procs_enabled = showing
+        # catch up panels that became visible
+        self.panels.flush()
+
+    def changeEvent(self, e):
+        super().changeEvent(e)
+        if e.type() == QEvent.WindowStateChange:
+            self._on_visibility_changed()
+
+    def refresh(self, frame):
+        t0 = time.perf_counter()
+        with PROFILER.stage("ui.refresh"):
+            self.panels.push(frame)
+        if self.replay is not None:
+            self.replay.stats.render.add(time.perf_counter() - t0)
+
+    def _poll_replay(self):
+        r = self.replay
+        if not r.finished.is_set():
+            when = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self._latest.t)) if self._latest else "--"
+            self.statusBar().showMessage(f"Replay {r.pos}/{len(r)} · {when}")
+            return
+        self._replay_timer.stop()
+        self._render_latest()
+        summary = r.stats.format()
+        print(summary, file=sys.stderr, flush=True)
+        self.statusBar().showMessage(summary.splitlines()[0])
+        if self.exit_at_end:
+            self.close()
+            QApplication.instance().quit()
+
+    def _render_gauges(self, frame):
+        s = frame.snap
         for i, val in enumerate(s["cpu_per_core"][:len(self.cpu_gauges)]):
             self.cpu_gauges[i].setValue(val)
+        if self.core_strip:
+            self.core_strip.setValues(s["cpu_per_core"])
         self.cpu_total_gauge.setValue(s["cpu_total"])
         if s["gpu"]["load"] is not None:
             self.gpu_gauge.setValue(s["gpu"]["load"])
             self.gpu_gauge.setLabel("GPU Load")
         else:
             self.gpu_gauge.setLabel("GPU Load (n/a)")
-
-        # Bars/labels
-        self.ram_bar.setValue(int(s["ram_percent"]))
-        gpu = s["gpu"]
-        self.label_gpu.setText(f"GPU: {gpu.get('name') or 'N/A'} | Load: {gpu.get('load') and int(gpu['load']) or 0}% | Temp: {gpu.get('temp') or '--'}°C")
-        vram_used = gpu.get("vram_used"); vram_total = gpu.get("vram_total")
-        if vram_total:
-            self.label_vram.setText(f"VRAM: {human_bytes(vram_used)} / {human_bytes(vram_total)}")
+        self.ram_bar.setValue(int(s["ram_percent"] or 0))
+
+    def _render_stats(self, frame):
+        s = frame.snap
+        gpus = s.get("gpus") or ()
+        if gpus:
+            lines, vram = [], []
+            for g in gpus:
+                line = f"GPU{g['index']}: {g.get('name') or 'N/A'} | Load: {int(g.get('load') or 0)}% | Temp: {g.get('temp') or '--'}°C"
+                if g.get("power") is not None: line += f" | {g['power']:.0f} W"
+                if g.get("clock_core") is not None: line += f" | {g['clock_core']:.0f} MHz"
+                lines.append(line)
+                if g.get("vram_total"):
+                    vram.append(f"VRAM{g['index']}: {human_bytes(g.get('vram_used'))} / {human_bytes(g['vram_total'])}")
+            self.label_gpu.setText("\n".join(lines))
+            self.label_vram.setText("\n".join(vram) or "VRAM: N/A")
         else:
+            self.label_gpu.setText("GPU: N/A")
             self.label_vram.setText("VRAM: N/A")
 
         self.label_net.setText(f"NET: ↓ {human_bps(s['net_down_bps'])} ↑ {human_bps(s['net_up_bps'])}")
@@ -216,92 +451,171 @@ class MainWindow(QMainWindow):
             self.label_batt.setText(f"Battery: {int(batt.percent)}% ({stat})")
         else:
             self.label_batt.setText("Battery: N/A")
-
-        # Temperature map
-        # Clear layout
-        while self.temp_layout.count():
-            item = self.temp_layout.takeAt(0)
-            w = item.widget()
-            if w: w.setParent(None)
-        r = c = 0
-        for name, entries in s["temps"].items():
-            group = QGroupBox(name)
-            vl = QVBoxLayout(group)
-            for e in entries:
-                lab = QLabel(f"{e['label']}: {e['current']} °C"); 
-                # Color by temp
-                t = e['current'] or 0
-                color = "#3795ff" if t < 60 else ("#ffb037" if t < 80 else "#ff4d4d")
-                lab.setStyleSheet(f"QLabel {{ background: #0f151d; border: 1px solid #1e2a36; padding: 6px 8px; border-radius: 8px; color: {color}; }}")
-                vl.addWidget(lab)
-            self.temp_layout.addWidget(group, r, c)
-            c += 1
-            if c >= 2:
-                r += 1; c = 0
-
-        # Graphs
-        x = list(range(len(self.monitor.history["net_down"])))
-        self.cur_net_down.setData(x, list(self.monitor.history["net_down"]))
-        self.cur_net_up.setData(x, list(self.monitor.history["net_up"]))
-        self.cur_disk_r.setData(x, list(self.monitor.history["disk_read"]))
-        self.cur_disk_w.setData(x, list(self.monitor.history["disk_write"]))
-        self.cur_cpu.setData(x, list(self.monitor.history["cpu_total"]))
-        self.cur_gpu.setData(x, list(self.monitor.history["gpu_load"]))
-        self.cur_gpu_t.setData(x, list(self.monitor.history["gpu_temp"]))
-
-        # Processes
-        procs = list_processes(limit=40)
-        self.table.setRowCount(len(procs))
-        for i, p in enumerate(procs):
-            for j, k in enumerate(["pid","name","cpu","mem"]):
-                item = QTableWidgetItem(str(int(p[k]) if isinstance(p[k], float) else p[k]))
-                if j in (2,3): item.setText(f"{float(p[k]):.1f}")
-                self.table.setItem(i, j, item)
-
-        # Logging
-        self.logger.log(s)
-
-        # Alerts
-        if self.monitor.history["gpu_temp"] and self.monitor.history["gpu_temp"][-1] and self.monitor.history["gpu_temp"][-1] > self.temp_threshold:
-            self._warn(f"GPU temperature high: {int(self.monitor.history['gpu_temp'][-1])}°C")
-        if s["cpu_total"] > self.cpu_threshold:
-            self._warn(f"CPU usage high: {int(s['cpu_total'])}%")
-        if s["ram_percent"] > self.ram_threshold:
-            self._warn(f"RAM usage high: {int(s['ram_percent'])}%")
-
-    def _warn(self, msg):
-        # Lightweight inline warning – could be expanded to tray notifications
-        self.statusBar().showMessage(msg, 3000)
+        if self.label_cgroup.isVisibleTo(self.stats_box):
+            def pct(key):
+                v = s.get(key)
+                return "--" if v is None else f"{v:.0f}%"
+            self.label_cgroup.setText(f"Container: throttled {pct('cpu_throttled')} · pressure CPU {pct('psi_cpu_some')} "
+                                      f"MEM {pct('psi_memory_some')} IO {pct('psi_io_some')}")
+
+    def _render_temps(self, frame):
+        # widgets are rebuilt only when the sensor set changes
+        self.temp_map.update_temps(frame.snap["temps"])
+
+    def _render_procs(self, frame):
+        # sampled at a slower rate; the model applies only the diff
+        if frame.procs is not self._shown_procs:
+            self._shown_procs = frame.procs
+            self.proc_model.update(frame.procs)
+
+    def _render_graphs(self, frame):
+        self._update_graphs()
+        t, rows = self.monitor.core_history.view()
+        if len(t) > 1:
+            self.core_image.setImage(rows, autoLevels=False, levels=(0, 100))
+            self.core_image.setRect(QRectF(t[0], 0, t[-1] - t[0], rows.shape[1]))
+
+    def _render_devices(self, frame):
+        s = frame.snap
+        rows = [("disk", n, d) for n, d in (s.get("disks") or {}).items()] + \
+               [("nic", n, d) for n, d in (s.get("nics") or {}).items()]
+        def ms(v): return "--" if v is None else f"{v:.2f}"
+        def num(v): return "--" if v is None else f"{v:.0f}"
+        if [r[:2] for r in rows] != self._dev_rows:
+            self._dev_rows = [r[:2] for r in rows]
+            self.dev_table.setRowCount(len(rows))
+        for row, (kind, name, d) in enumerate(rows):
+            if kind == "disk":
+                cells = [name, human_bps(d["read_bps"]), human_bps(d["write_bps"]), num(d["read_iops"]),
+                         num(d["write_iops"]), ms(d["read_lat_ms"]), ms(d["write_lat_ms"]), num(d["busy"])]
+            else:
+                cells = [name, human_bps(d["down_bps"]), human_bps(d["up_bps"]), num(d["down_pps"]),
+                         num(d["up_pps"]), "", "", ""]
+            for col, text in enumerate(cells):
+                item = self.dev_table.item(row, col)
+                if item is None:
+                    self.dev_table.setItem(row, col, QTableWidgetItem(text))
+                elif item.text() != text:
+                    item.setText(text)
+        # selected device: per-device series live in the raw history store only
+        sel = self.dev_table.selectionModel().selectedRows()
+        if not sel or sel[0].row() >= len(self._dev_rows):
+            return
+        kind, name = self._dev_rows[sel[0].row()]
+        cols = [f"disk.{name}.read", f"disk.{name}.write"] if kind == "disk" else [f"nic.{name}.down", f"nic.{name}.up"]
+        if not all(c in self.monitor.history for c in cols):
+            return
+        self.plot_dev.setTitle(f"{name} ({'read/write' if kind == 'disk' else 'dl/ul'})")
+        v = self.monitor.history.views(["t"] + cols)
+        self.cur_dev_a.setData(v["t"], v[cols[0]], connect="finite")
+        self.cur_dev_b.setData(v["t"], v[cols[1]], connect="finite")
+
+    def _render_diag(self, frame):
+        now = time.monotonic()
+        if now - self._diag_at < 1.0: return
+        self._diag_at = now
+        me = PROFILER.process()
+        self.label_self.setText(f"AutoDash: CPU {me['cpu_percent']:.1f}% · RSS {human_bytes(me['rss'])} · {me['threads']} threads")
+        stages = PROFILER.summary()
+        self.diag_table.setRowCount(len(stages))
+        for row, (name, s) in enumerate(stages.items()):
+            cells = [name, str(s["count"]), f"{s['p50'] * 1e3:.3f}", f"{s['p99'] * 1e3:.3f}", f"{s['max'] * 1e3:.3f}",
+                     f"{s['total']:.2f}", f"{s['share'] * 100:.2f}"]
+            for col, text in enumerate(cells):
+                item = self.diag_table.item(row, col)
+                if item is None:
+                    self.diag_table.setItem(row, col, QTableWidgetItem(text))
+                elif item.text() != text:
+                    item.setText(text)
+
+    def _update_graphs(self):
+        with PROFILER.stage("graphs.setData"):
+            # Each plot shows the history tier matching its visible x range; data are
+            # contiguous views into the ring buffers and NaN gaps are left unconnected.
+            for plot, title, curves in self._graph_specs:
+                x0, x1 = plot.getViewBox().viewRange()[0]
+                resolution, store = self.monitor.tiers.pick(x0, x1)
+                if self._graph_tier.get(plot) != resolution:
+                    self._graph_tier[plot] = resolution
+                    raw = store is self.monitor.history
+                    plot.setTitle(title if raw else f"{title} · {resolution:g} s avg")
+                v = store.views(["t"] + [col for _, col in curves])
+                for curve, col in curves:
+                    curve.setData(v["t"], v[col], connect="finite")
+
+    def on_alert(self, alert):
+        self.statusBar().showMessage(alert.message, 5000)
+        if self.tray and alert.state == "firing":
+            icon = QSystemTrayIcon.Warning if alert.severity == "warning" else QSystemTrayIcon.Information
+            self.tray.showMessage("AutoDash alert", alert.message, icon, 5000)
 
     # ---------------- Actions ----------------
     def kill_selected(self):
-        rows = set([idx.row() for idx in self.table.selectedIndexes()])
+        rows = set([idx.row() for idx in self.table.selectionModel().selectedRows()])
         if not rows: return
-        for r in rows:
-            pid_item = self.table.item(r, 0)
-            if not pid_item: continue
-            pid = int(pid_item.text())
+        for pid in [self.proc_proxy.pid_at(r) for r in rows]:
             ok, err = kill_process(pid)
             if not ok:
                 QMessageBox.warning(self, "Kill failed", f"Could not kill PID {pid}: {err}")
-        self.refresh()
+        self.sampler.refresh_procs()
+
+    def set_proc_rank(self, key):
+        self.sampler.proc_key = key
+        self.sampler.refresh_procs()
+        for k, col in EXTRA_COLUMNS.items():
+            self.table.setColumnHidden(col, k != key)
+        self.table.sortByColumn(self.proc_model.column_of(key), Qt.DescendingOrder)
 
     def toggle_hud(self):
         if self.hud and self.hud.isVisible():
             self.hud.close(); self.hud = None
         else:
-            self.hud = HUD(self.monitor, self); self.hud.show()
+            self.hud = HUD(self.bus, parent=self); self.hud.show()
 
     def toggle_theme(self, state):
         if state == Qt.Checked:
             apply_light(QApplication.instance())
         else:
             apply_dark(QApplication.instance())
+        for g in self.cpu_gauges + [self.gpu_gauge, self.cpu_total_gauge]:
+            g.setTheme("light" if state == Qt.Checked else "dark")
+        if self.fleet:
+            self.fleet.setTheme("light" if state == Qt.Checked else "dark")
+
+    def closeEvent(self, e):
+        self.sampler.stop()
+        self.monitor.close()
+        self.relay.close()
+        self.alert_sub.cancel()
+        if self.tray: self.tray.hide()
+        if self.exporter: self.exporter.stop()
+        if self.collector: self.collector.stop()
+        if self.logger: self.logger.close()
+        if self.hud: self.hud.close()
+        super().closeEvent(e)
+
+    def export_log(self):
+        if self.logger is None:
+            self.statusBar().showMessage("Nothing is logged while replaying", 5000)
+            return
+        try:
+            # the logger runs on the sampler thread; export what's on disk so far
+            path = export_csv(self.logger.file_path)
+            self.statusBar().showMessage(f"Exported {path}", 5000)
+        except Exception as e:
+            QMessageBox.warning(self, "Export", f"Could not export log: {e}")
+
+    def export_profile(self):
+        try:
+            path = PROFILER.export(os.path.join("logs", f"profile_{time.strftime('%Y%m%d-%H%M%S')}.json"))
+            self.statusBar().showMessage(f"Exported {path}", 5000)
+        except Exception as e:
+            QMessageBox.warning(self, "Export", f"Could not export profile: {e}")
 
     def start_stress(self):
         try:
-            self.stressor.start()
-            self.statusBar().showMessage("CPU stress started", 3000)
+            self.stressor.start(intensity=self.spin_load.value() / 100.0)
+            self.statusBar().showMessage(f"CPU stress started at {self.spin_load.value()}% per worker", 3000)
         except Exception as e:
             QMessageBox.warning(self, "Stress", f"Could not start stress: {e}")
 
@@ -312,10 +626,10 @@ class MainWindow(QMainWindow):
         except Exception as e:
             QMessageBox.warning(self, "Stress", f"Could not stop stress: {e}")
 
-def main():
+def main(export=None, collect=None, replay=None, exit_at_end=False):
     app = QApplication(sys.argv)
     apply_dark(app)
-    win = MainWindow()
+    win = MainWindow(export=export, collect=collect, replay=replay, exit_at_end=exit_at_end)
     win.show()
     sys.exit(app.exec_())
 
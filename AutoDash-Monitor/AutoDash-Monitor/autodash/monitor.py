@@ -1,43 +1,159 @@
-import time, psutil
-from collections import deque
-
-try:
-    import GPUtil
-except Exception:
-    GPUtil = None
-
-class Monitor:
-    def __init__(self, history_len=300):
-        self.prev_net = psutil.net_io_counters() if hasattr(psutil, "net_io_counters") else None
-        self.prev_disk = psutil.disk_io_counters() if hasattr(psutil, "disk_io_counters") else None
-        self.prev_time = time.time()
-        self.history = {
-            "net_up": deque(maxlen=history_len),
-            "net_down": deque(maxlen=history_len),
-            "disk_read": deque(maxlen=history_len),
-            "disk_write": deque(maxlen=history_len),
-            "cpu_total": deque(maxlen=history_len),
-            "ram_used": deque(maxlen=history_len),
-            "gpu_load": deque(maxlen=history_len),
-            "gpu_temp": deque(maxlen=history_len),
-        }
-
-    def snapshot(self):
-        now = time.time()
-        dt = max(1e-6, now - self.prev_time)
-        cpu_per_core = psutil.cpu_percent(percpu=True)
-        cpu_total = psutil.cpu_percent()
+import os, time, psutil
+
+from .history import HistoryStore, TieredHistory, RingMatrix
+from .profiler import PROFILER
+from .gpu import open_backend
+from .snapshot import Snapshot, COLLECTOR_FIELDS, COLLECTORS, OBJECT_FIELDS, freeze, new_record, as_snapshot
+from .cgroup import open_cgroup, CPU_FIELDS
+from .devices import CounterRates, NIC_FIELDS, DISK_FIELDS, nic_rates, disk_rates, is_whole_disk, device_series
+
+# Seconds between reads of each collector. Cheap counters are polled fast, slow
+# sensors (hwmon, battery) are cached between reads.
+DEFAULT_INTERVALS = {
+    "cpu": 0.25,
+    "ram": 1.0,
+    "net": 0.25,
+    "disk": 0.25,
+    "gpu": 1.0,
+    "temps": 5.0,
+    "battery": 30.0,
+    "pressure": 2.0,
+}
+
+_STAGES = {name: f"collect.{name}" for name in COLLECTOR_FIELDS}
+
+HISTORY_COLUMNS = ["net_up", "net_down", "disk_read", "disk_write", "cpu_total", "ram_used", "gpu_load", "gpu_temp",
+                   "psi_cpu", "psi_memory", "psi_io"]
+
+# history column -> Snapshot record field
+HISTORY_FIELDS = {
+    "net_up": "net_up_bps",
+    "net_down": "net_down_bps",
+    "disk_read": "disk_read_bps",
+    "disk_write": "disk_write_bps",
+    "cpu_total": "cpu_total",
+    "ram_used": "ram_used",
+    "gpu_load": "gpu_load",
+    "gpu_temp": "gpu_temp",
+    "psi_cpu": "psi_cpu_some",
+    "psi_memory": "psi_memory_some",
+    "psi_io": "psi_io_some",
+}
+
+def history_row(snap):
+    # snapshot -> HISTORY_COLUMNS values plus per-device series ("nic.eth0.down", "disk.sda.busy", ...);
+    # unmeasured values are NaN in the record, which keeps series aligned
+    rec = as_snapshot(snap).record
+    row = device_series(snap)
+    for col, field in HISTORY_FIELDS.items():
+        row[col] = rec[field]
+    return row
+
+class HistoryRecorder:
+    # The history a snapshot source keeps for the UI and exporters. Shared by Monitor
+    # and replay.ReplayMonitor so both can sit behind a Sampler.
+    def __init__(self, history_len, tick, tiers=None, core_history_len=600, cores=1):
+        # written by the sampler thread, read by the UI (the store locks internally)
+        self.history = HistoryStore(history_len, HISTORY_COLUMNS)
+        # history at full resolution plus min/mean/max rollups for long lookbacks
+        self.tiers = TieredHistory(self.history, tick, tiers)
+        # time x core CPU %, one row per sample, for the per-core heat map
+        self.core_history = RingMatrix(core_history_len, cores)
+        # per-device column -> sample number it was last present at
+        self._seen = {}
+        self._n = 0
+
+    def record(self, snap):
+        with PROFILER.stage("history"):
+            row = history_row(snap)
+            self._n += 1
+            for key in row:
+                if key in HISTORY_FIELDS: continue
+                # per-device series appear with their device (raw tier only)
+                if key not in self._seen: self.history.add_column(key)
+                self._seen[key] = self._n
+            if self._n % self.history.margin == 0: self._prune()
+            t = snap.timestamp
+            self.tiers.append(t, row)
+            self.core_history.append(t, snap.cpu_per_core)
+
+    def _prune(self):
+        # a device gone for a whole window has nothing left to plot: drop its columns
+        # so hot-plugged disks, VPN tunnels and container veths don't accumulate
+        gone = [key for key, n in self._seen.items() if self._n - n >= self.history.capacity]
+        for key in gone:
+            del self._seen[key]
+            self.history.remove_column(key)
+
+class Monitor(HistoryRecorder):
+    def __init__(self, history_len=300, intervals=None, tiers=None, core_history_len=600, gpu_backend=None,
+                 cgroup=None):
+        self.intervals = dict(DEFAULT_INTERVALS)
+        if intervals: self.intervals.update(intervals)
+        # one long-lived GPU handle (NVML, sysfs, ...); see gpu.open_backend
+        self.gpu_backend = open_backend(gpu_backend)
+        if self.gpu_backend.name == "gputil":
+            self.intervals["gpu"] = max(self.intervals["gpu"], 2.0)  # a subprocess per read
+        # container mode: CPU %, memory and disk I/O of one cgroup instead of the
+        # host, plus its pressure (PSI); see cgroup.open_cgroup
+        self.cgroup = open_cgroup(cgroup)
+        self.cgroup_cpu_rates = CounterRates(CPU_FIELDS)
+        self._host_ram = psutil.virtual_memory().total
+        self._cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+        # per-device counters -> rates; the first read only primes them
+        self.nic_rates = CounterRates(NIC_FIELDS)
+        self.disk_rates = CounterRates(DISK_FIELDS)
+        self._read_net(time.time()); self._read_disk(time.time())
+        if self.cgroup: self._read_cgroup_cpu(time.time())
+        # prime cpu_percent so the first sample covers a real interval
+        psutil.cpu_percent(); psutil.cpu_percent(percpu=True)
+        self._cache = {}
+        self._stamp = {}
+        super().__init__(history_len, self.tick_interval(), tiers, core_history_len, psutil.cpu_count() or 1)
+
+    def close(self):
+        self.gpu_backend.close()
+        if self.cgroup: self.cgroup.close()
+
+    def tick_interval(self):
+        return min(self.intervals.values())
+
+    def set_interval(self, collector, seconds):
+        self.intervals[collector] = seconds
+
+    # ---------------- Collectors ----------------
+    def _read_cpu(self, now):
+        out = {"cpu_per_core": tuple(psutil.cpu_percent(percpu=True)), "cpu_total": psutil.cpu_percent()}
+        if self.cgroup: out.update(self._read_cgroup_cpu(now))
+        return out
+
+    def _read_cgroup_cpu(self, now):
+        # usage as a share of the CPUs the cgroup may use (cpu.max quota or the CPUs we can run on)
+        _, d, dt = self.cgroup_cpu_rates.update({"cpu": self.cgroup.cpu_counters()}, now)
+        usage, periods, throttled = d[0].tolist()
+        cpus = min(self.cgroup.cpu_limit() or self._cpus, self._cpus)
+        total = usage / 1e6 / dt / cpus * 100.0
+        # NaN (priming read, counter reset) is no reading, not 0 %
+        return {"cpu_total": min(100.0, total) if total >= 0 else None,
+                "cpu_throttled": throttled / periods * 100.0 if periods > 0 else None}
+
+    def _read_ram(self, now):
+        if self.cgroup:
+            used, limit = self.cgroup.memory()
+            if used is not None:
+                total = min(limit, self._host_ram) if limit else self._host_ram
+                return {"ram_total": total, "ram_used": used, "ram_percent": used / total * 100.0}
         vm = psutil.virtual_memory()
-        ram_used = vm.used
-        ram_percent = vm.percent
+        return {"ram_total": vm.total, "ram_used": vm.used, "ram_percent": vm.percent}
 
-        # Battery
+    def _read_battery(self, now):
         batt = None
         if hasattr(psutil, "sensors_battery"):
             try: batt = psutil.sensors_battery()
             except Exception: batt = None
+        return {"battery": batt, "battery_percent": batt.percent if batt else None}
 
-        # Temperatures
+    def _read_temps(self, now):
         temps = {}
         if hasattr(psutil, "sensors_temperatures"):
             try:
@@ -45,61 +161,63 @@ class Monitor:
                     temps[name] = [{"label": e.label or name, "current": e.current} for e in entries]
             except Exception:
                 temps = {}
+        return {"temps": freeze(temps)}
 
-        # GPU
-        gpu = {"load": None, "temp": None, "vram_total": None, "vram_used": None, "name": None}
-        if GPUtil:
-            try:
-                gpus = GPUtil.getGPUs()
-                if gpus:
-                    g = gpus[0]
-                    gpu["name"] = g.name
-                    gpu["load"] = float(g.load) * 100.0
-                    gpu["temp"] = float(g.temperature) if g.temperature is not None else None
-                    gpu["vram_total"] = float(g.memoryTotal) * 1024**2
-                    gpu["vram_used"] = float(g.memoryUsed) * 1024**2
-            except Exception:
-                pass
-
-        # Network
-        up_bps = down_bps = 0.0
-        if self.prev_net:
-            cur = psutil.net_io_counters()
-            up_bps = max(0.0, (cur.bytes_sent - self.prev_net.bytes_sent) / dt)
-            down_bps = max(0.0, (cur.bytes_recv - self.prev_net.bytes_recv) / dt)
-            self.prev_net = cur
-
-        # Disk
-        read_bps = write_bps = 0.0
-        if self.prev_disk:
-            curd = psutil.disk_io_counters()
-            read_bps = max(0.0, (curd.read_bytes - self.prev_disk.read_bytes) / dt)
-            write_bps = max(0.0, (curd.write_bytes - self.prev_disk.write_bytes) / dt)
-            self.prev_disk = curd
-
-        self.prev_time = now
-
-        # push to history
-        self.history["net_up"].append(up_bps)
-        self.history["net_down"].append(down_bps)
-        self.history["disk_read"].append(read_bps)
-        self.history["disk_write"].append(write_bps)
-        self.history["cpu_total"].append(cpu_total)
-        self.history["ram_used"].append(ram_used)
-        if gpu["load"] is not None: self.history["gpu_load"].append(gpu["load"])
-        if gpu["temp"] is not None: self.history["gpu_temp"].append(gpu["temp"])
-
-        return {
-            "cpu_per_core": cpu_per_core,
-            "cpu_total": cpu_total,
-            "ram_total": vm.total,
-            "ram_used": vm.used,
-            "ram_percent": ram_percent,
-            "battery": batt,
-            "temps": temps,
-            "gpu": gpu,
-            "net_up_bps": up_bps,
-            "net_down_bps": down_bps,
-            "disk_read_bps": read_bps,
-            "disk_write_bps": write_bps,
-        }
+    def _read_gpu(self, now):
+        try:
+            gpus = self.gpu_backend.read()
+        except Exception:
+            gpus = []
+        # snap["gpu"] stays the first device so single-GPU consumers keep working
+        first = gpus[0] if gpus else {}
+        return {"gpus": freeze(gpus), "gpu_load": first.get("load"), "gpu_temp": first.get("temp")}
+
+    def _read_net(self, now):
+        try: counters = psutil.net_io_counters(pernic=True)
+        except Exception: counters = {}
+        nics, up_bps, down_bps = nic_rates(self.nic_rates, counters, now)
+        return {"net_up_bps": up_bps, "net_down_bps": down_bps, "nics": freeze(nics)}
+
+    def _read_disk(self, now):
+        if self.cgroup:
+            # the cgroup's own I/O per device (io.stat), rather than the host's disks
+            counters = self.cgroup.io_counters()
+        else:
+            try: counters = psutil.disk_io_counters(perdisk=True) or {}
+            except Exception: counters = {}
+            # partitions would count their I/O twice
+            counters = {name: c for name, c in counters.items() if is_whole_disk(name)}
+        disks, read_bps, write_bps = disk_rates(self.disk_rates, counters, now)
+        return {"disk_read_bps": read_bps, "disk_write_bps": write_bps, "disks": freeze(disks)}
+
+    def _read_pressure(self, now):
+        # PSI avg10: % of time some (or all, "full") tasks in the cgroup stalled on the resource
+        if not self.cgroup: return {}
+        cpu, mem, io = (self.cgroup.pressure(r) for r in ("cpu", "memory", "io"))
+        return {"psi_cpu_some": cpu.get("some"), "psi_memory_some": mem.get("some"), "psi_memory_full": mem.get("full"),
+                "psi_io_some": io.get("some"), "psi_io_full": io.get("full")}
+
+    def _collect(self, now):
+        for name in COLLECTORS:
+            interval = self.intervals.get(name, 1.0)
+            last = self._stamp.get(name)
+            # small slack so a collector due every N ticks isn't pushed to N+1 by timer jitter
+            if last is None or now - last >= interval - 0.01:
+                with PROFILER.stage(_STAGES[name]):
+                    self._cache[name] = getattr(self, f"_read_{name}")(now)
+                self._stamp[name] = now
+
+    def snapshot(self, now=None):
+        # -> Snapshot; collectors that weren't due contribute their cached (frozen) values
+        now = time.time() if now is None else now
+        self._collect(now)
+        rec = new_record()
+        rec["timestamp"] = now
+        objects = {}
+        for name in COLLECTORS:
+            for k, v in self._cache[name].items():
+                if k in OBJECT_FIELDS: objects[k] = v
+                elif v is not None: rec[k] = v
+        snap = Snapshot(rec, stamps=tuple(self._stamp[name] for name in COLLECTORS), **objects)
+        self.record(snap)
+        return snap
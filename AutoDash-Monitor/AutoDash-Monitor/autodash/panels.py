@@ -0,0 +1,56 @@
+# Snapshot keys with special meaning for Panel.fields:
+#   "procs"   - the frame's process list was re-sampled
+#   "history" - new history samples (every frame)
+PROCS = "procs"
+HISTORY = "history"
+
+class Panel:
+    # A part of the window fed from frames. It is marked dirty when any of its
+    # fields change and only rendered while its widget is actually on screen; a
+    # panel that was hidden renders the latest frame (and the history store's
+    # current contents) as soon as it becomes visible again.
+    def __init__(self, widget, render, fields):
+        self.widget = widget
+        self.render = render
+        self.fields = tuple(fields)
+        self.dirty = True
+
+    def visible(self):
+        return self.widget.isVisible() and not self.widget.window().isMinimized()
+
+class PanelSet:
+    def __init__(self):
+        self.panels = []
+        self.latest = None
+
+    def add(self, widget, render, fields):
+        panel = Panel(widget, render, fields)
+        self.panels.append(panel)
+        return panel
+
+    def _changed(self, frame, prev):
+        if prev is None: return None  # everything
+        changed = {HISTORY}
+        if frame.procs is not prev.procs: changed.add(PROCS)
+        s, p = frame.snap, prev.snap
+        if hasattr(s, "changed") and type(s) is type(p):
+            return changed | s.changed(p)
+        for key in s:
+            if s[key] != p.get(key): changed.add(key)
+        return changed
+
+    def push(self, frame):
+        changed = self._changed(frame, self.latest)
+        self.latest = frame
+        for panel in self.panels:
+            if changed is None or not changed.isdisjoint(panel.fields):
+                panel.dirty = True
+        self.flush()
+
+    def flush(self):
+        # render dirty panels that are visible; hidden ones stay dirty
+        if self.latest is None: return
+        for panel in self.panels:
+            if panel.dirty and panel.visible():
+                panel.dirty = False
+                panel.render(self.latest)
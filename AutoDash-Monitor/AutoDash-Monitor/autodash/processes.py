@@ -1,20 +1,73 @@
-import psutil
+import heapq, psutil
 
-def list_processes(limit=50):
-    procs = []
-    for p in psutil.process_iter(["pid","name","cpu_percent","memory_percent"]):
-        try:
-            info = p.info
-            procs.append({
-                "pid": info["pid"],
-                "name": info.get("name") or "Unknown",
-                "cpu": info.get("cpu_percent") or 0.0,
-                "mem": info.get("memory_percent") or 0.0,
-            })
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            continue
-    procs.sort(key=lambda x: (x["cpu"], x["mem"]), reverse=True)
-    return procs[:limit]
+# Keys processes can be ranked by; the extra ones are only read when ranking by them.
+RANK_KEYS = {"cpu": "CPU %", "mem": "MEM %", "rss": "RSS", "io": "I/O bytes", "threads": "Threads", "files": "Open files"}
+EXTRA_KEYS = ("rss", "io", "threads", "files")
+
+def _num_files(p):
+    return p.num_fds() if hasattr(p, "num_fds") else p.num_handles()
+
+class ProcessTracker:
+    # Keeps one psutil.Process per PID alive across ticks: cpu_percent() needs the
+    # previous call's CPU times on the same object, and reusing it avoids rebuilding
+    # Process state for every PID every tick. A process is identified by PID and
+    # create_time, so a reused PID starts a fresh entry.
+    def __init__(self):
+        self._procs = {}  # pid -> [Process, create_time]
+
+    def __len__(self):
+        return len(self._procs)
+
+    def _track(self, p):
+        entry = self._procs.get(p.pid)
+        # create_time is cached on the Process, so this costs no syscall
+        if entry is None or entry[1] != p.create_time():
+            entry = self._procs[p.pid] = [p, p.create_time()]
+        return entry
+
+    def _read(self, entry, mem_total, extra=()):
+        p = entry[0]
+        # oneshot: name/cpu times come from a single /proc/<pid>/stat read on Linux
+        with p.oneshot():
+            rss = p.memory_info().rss
+            info = {
+                "pid": p.pid,
+                "name": p.name() or "Unknown",
+                "cpu": p.cpu_percent() or 0.0,
+                "mem": 100.0 * rss / mem_total,
+                "rss": None, "io": None, "threads": None, "files": None,
+            }
+            for key in extra:
+                try:
+                    if key == "rss": info["rss"] = rss
+                    elif key == "io":
+                        io = p.io_counters(); info["io"] = io.read_bytes + io.write_bytes
+                    elif key == "threads": info["threads"] = p.num_threads()
+                    elif key == "files": info["files"] = _num_files(p)
+                except (psutil.AccessDenied, AttributeError):
+                    info[key] = 0
+            return info
+
+    def poll(self, extra=()):
+        # Generator: callers that keep only the top N never hold the full list.
+        mem_total = psutil.virtual_memory().total or 1
+        seen = set()
+        for p in psutil.process_iter():
+            seen.add(p.pid)
+            try:
+                yield self._read(self._track(p), mem_total, extra)
+            except (psutil.NoSuchProcess, psutil.ZombieProcess):
+                self._procs.pop(p.pid, None)
+            except psutil.AccessDenied:
+                continue
+        for pid in [pid for pid in self._procs if pid not in seen]:
+            del self._procs[pid]
+
+_tracker = ProcessTracker()
+
+def list_processes(limit=50, key="cpu", tracker=None):
+    extra = (key,) if key in EXTRA_KEYS else ()
+    return heapq.nlargest(limit, (tracker or _tracker).poll(extra), key=lambda x: (x[key] or 0, x["mem"]))
 
 def kill_process(pid):
     try:
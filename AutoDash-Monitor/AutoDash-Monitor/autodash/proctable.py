@@ -0,0 +1,99 @@
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
+
+from .profiler import PROFILER
+
+COLUMNS = [("pid", "PID"), ("name", "Name"), ("cpu", "CPU %"), ("mem", "MEM %"),
+           ("rss", "RSS (MB)"), ("io", "I/O (MB)"), ("threads", "Threads"), ("files", "Open files")]
+EXTRA_COLUMNS = {key: i for i, (key, _) in enumerate(COLUMNS) if i >= 4}
+SORT_ROLE = Qt.UserRole
+
+def _runs(rows):
+    # sorted row numbers -> [(first, last)] of consecutive runs
+    out = []
+    for r in rows:
+        if out and r == out[-1][1] + 1: out[-1][1] = r
+        else: out.append([r, r])
+    return out
+
+class ProcessTableModel(QAbstractTableModel):
+    # Rows keyed by PID. update() diffs the new process list against the current
+    # rows and emits only removes, inserts and dataChanged for cells that changed,
+    # so views keep their selection, scroll position and sort order.
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+        self._row_of = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return COLUMNS[section][1]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid(): return None
+        key = COLUMNS[index.column()][0]
+        v = self._rows[index.row()][key]
+        if role == Qt.DisplayRole:
+            if v is None: return ""
+            if key in ("cpu", "mem"): return f"{float(v):.1f}"
+            if key in ("rss", "io"): return f"{v / 1048576:.1f}"
+            return str(v)
+        if role == SORT_ROLE:
+            return -1 if v is None else v
+        if role == Qt.TextAlignmentRole and key != "name":
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+
+    def pid_at(self, row):
+        return self._rows[row]["pid"]
+
+    def column_of(self, key):
+        return [k for k, _ in COLUMNS].index(key)
+
+    def update(self, procs):
+        with PROFILER.stage("procs.model"):
+            new = {p["pid"]: p for p in procs}
+
+            gone = sorted(r for pid, r in self._row_of.items() if pid not in new)
+            for first, last in reversed(_runs(gone)):
+                self.beginRemoveRows(QModelIndex(), first, last)
+                del self._rows[first:last + 1]
+                self.endRemoveRows()
+            if gone:
+                self._row_of = {p["pid"]: r for r, p in enumerate(self._rows)}
+
+            changed = {}
+            for r, old in enumerate(self._rows):
+                p = new[old["pid"]]
+                cols = [c for c, (key, _) in enumerate(COLUMNS) if old[key] != p[key]]
+                self._rows[r] = p
+                if cols: changed[r] = cols
+            for first, last in _runs(sorted(changed)):
+                cols = [c for r in range(first, last + 1) for c in changed[r]]
+                self.dataChanged.emit(self.index(first, min(cols)), self.index(last, max(cols)), [Qt.DisplayRole, SORT_ROLE])
+
+            added = [p for pid, p in new.items() if pid not in self._row_of]
+            if added:
+                n = len(self._rows)
+                self.beginInsertRows(QModelIndex(), n, n + len(added) - 1)
+                for p in added:
+                    self._row_of[p["pid"]] = len(self._rows)
+                    self._rows.append(p)
+                self.endInsertRows()
+
+class ProcessSortProxy(QSortFilterProxyModel):
+    # Sorts on raw values (SORT_ROLE) and re-sorts as the source model changes.
+    def __init__(self, source, parent=None):
+        super().__init__(parent)
+        self.setSourceModel(source)
+        self.setSortRole(SORT_ROLE)
+        self.setDynamicSortFilter(True)
+
+    def pid_at(self, row):
+        return self.sourceModel().pid_at(self.mapToSource(self.index(row, 0)).row())
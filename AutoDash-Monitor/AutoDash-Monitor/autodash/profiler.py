@@ -0,0 +1,121 @@
+import json, math, threading, time
+
+# Log-scale latency histogram: BUCKETS_PER_OCTAVE buckets per doubling from 1 µs,
+# i.e. ~19% wide buckets up to ~2 minutes. Recording is O(1), quantiles walk the bins.
+BUCKETS_PER_OCTAVE = 4
+N_BUCKETS = 27 * BUCKETS_PER_OCTAVE
+
+class Histogram:
+    __slots__ = ("counts", "n", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * N_BUCKETS
+        self.n = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        us = seconds * 1e6
+        b = int(math.log2(us) * BUCKETS_PER_OCTAVE) if us > 1.0 else 0
+        self.counts[min(b, N_BUCKETS - 1)] += 1
+        self.n += 1
+        self.total += seconds
+        if seconds > self.max: self.max = seconds
+
+    def quantile(self, q):
+        if not self.n: return None
+        rank, seen = q * self.n, 0
+        for b, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank:
+                # geometric middle of the bucket, capped by the largest value seen
+                return min(self.max, 2 ** ((b + 0.5) / BUCKETS_PER_OCTAVE) * 1e-6)
+        return self.max
+
+class _Timer:
+    __slots__ = ("hist", "lock", "t0")
+
+    def __init__(self, hist, lock):
+        self.hist, self.lock = hist, lock
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+
+    def __exit__(self, *exc):
+        dt = time.perf_counter() - self.t0
+        with self.lock:
+            self.hist.add(dt)
+
+class _Off:
+    __slots__ = ()
+    def __enter__(self): pass
+    def __exit__(self, *exc): pass
+
+_OFF = _Off()
+
+class Profiler:
+    # Per-stage timers for AutoDash's own work. Disabled, stage() hands back a
+    # shared no-op context manager, so instrumented code costs one attribute test.
+    #
+    #   with PROFILER.stage("collect.cpu"):
+    #       ...
+    def __init__(self):
+        self.enabled = False
+        self.stages = {}
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._proc = None
+
+    def stage(self, name):
+        if not self.enabled: return _OFF
+        hist = self.stages.get(name)
+        if hist is None:
+            with self._lock:
+                hist = self.stages.setdefault(name, Histogram())
+        return _Timer(hist, self._lock)
+
+    def enable(self, on=True):
+        if on and not self.enabled:
+            self.reset()
+            self.process()  # starts the CPU% interval
+        self.enabled = on
+
+    def reset(self):
+        with self._lock:
+            self.stages = {}
+            self.started = time.time()
+
+    def process(self):
+        # AutoDash's own CPU% (since the previous call), RSS and thread count
+        import psutil
+        if self._proc is None:
+            self._proc = psutil.Process()
+            self._proc.cpu_percent(None)
+        with self._proc.oneshot():
+            return {"cpu_percent": self._proc.cpu_percent(None), "rss": self._proc.memory_info().rss,
+                    "threads": self._proc.num_threads()}
+
+    def summary(self):
+        # stage -> count, mean/p50/p99/max in seconds, total seconds and share of wall time
+        wall = max(1e-9, time.time() - self.started)
+        with self._lock:
+            items = [(name, h.n, h.total, h.max, h.quantile(0.5), h.quantile(0.99)) for name, h in self.stages.items()]
+        return {name: {"count": n, "mean": total / n if n else None, "p50": p50, "p99": p99, "max": mx,
+                       "total": total, "share": total / wall}
+                for name, n, total, mx, p50, p99 in sorted(items) if n}
+
+    def export(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"started": self.started, "wall": time.time() - self.started,
+                       "process": self.process(), "stages": self.summary()}, f, indent=1)
+        return path
+
+    def format(self):
+        lines = [f"{'stage':<24} {'count':>7} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'% wall':>7}"]
+        for name, s in self.summary().items():
+            lines.append(f"{name:<24} {s['count']:>7} {s['p50'] * 1e3:>8.3f} {s['p99'] * 1e3:>8.3f} "
+                         f"{s['max'] * 1e3:>8.3f} {s['share'] * 100:>6.2f}%")
+        return "\n".join(lines)
+
+# process-wide instance, off unless --profile or the Diagnostics tab turns it on
+PROFILER = Profiler()
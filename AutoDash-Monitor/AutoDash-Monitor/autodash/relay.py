@@ -0,0 +1,37 @@
+from PyQt5.QtCore import Qt, QObject, pyqtSignal
+
+class FrameRelay(QObject):
+    # Hands frames from the sampler thread to the GUI thread. At most one hand-off is
+    # queued at a time and it delivers the newest frame, so a sampler running faster
+    # than the GUI (e.g. a max-speed replay) can't flood the event queue.
+    frame = pyqtSignal(object)
+    _wake = pyqtSignal()
+
+    def __init__(self, bus, interval=None, parent=None):
+        super().__init__(parent)
+        self._latest = None
+        self._queued = False
+        self._wake.connect(self._deliver, Qt.QueuedConnection)
+        self.sub = bus.subscribe(self._offer, interval)
+
+    def _offer(self, frame):
+        self._latest = frame
+        if not self._queued:
+            self._queued = True
+            self._wake.emit()
+
+    def _deliver(self):
+        self._queued = False
+        if self._latest is not None:
+            self.frame.emit(self._latest)
+
+    def close(self):
+        if self.sub:
+            self.sub.cancel(); self.sub = None
+
+class AlertRelay(QObject):
+    # An AlertEngine sink that hands events to the GUI thread.
+    alert = pyqtSignal(object)
+
+    def __call__(self, alert):
+        self.alert.emit(alert)
@@ -0,0 +1,271 @@
+import json, selectors, socket, struct, threading, time
+
+from .exporter import to_jsonable
+from .history import HistoryStore
+from .monitor import HISTORY_COLUMNS, history_row
+
+# Wire format: each message is a 4-byte big-endian length followed by compact JSON.
+#   {"hello": name, "v": 1}                      first message on a connection
+#   {"t": t, "d": {...}, "k": 1, "r": [...]}     a sample: "d" holds the snapshot
+#                                                fields that changed since the last
+#                                                message ("k": keyframe, all fields;
+#                                                "r": fields that disappeared)
+PROTOCOL_VERSION = 1
+HEADER = struct.Struct("!I")
+MAX_MESSAGE = 1 << 20
+KEYFRAME_EVERY = 60
+SKIP_FIELDS = ("age",)  # per-tick bookkeeping, meaningless on the other end
+
+def _round(obj):
+    # one decimal is plenty for percentages, rates and temperatures, and keeps
+    # unchanged readings equal so they drop out of the delta
+    if isinstance(obj, float):
+        return round(obj, 1)
+    if isinstance(obj, dict):
+        return {k: _round(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_round(v) for v in obj]
+    return obj
+
+def pack(msg):
+    body = json.dumps(msg, separators=(",", ":")).encode("utf-8")
+    return HEADER.pack(len(body)) + body
+
+class DeltaEncoder:
+    def __init__(self, keyframe_every=KEYFRAME_EVERY):
+        self.keyframe_every = keyframe_every
+        self._last = {}
+        self._n = 0
+
+    def encode(self, t, snap):
+        cur = {k: _round(to_jsonable(v)) for k, v in snap.items() if k not in SKIP_FIELDS}
+        msg = {"t": t}
+        if self._n % self.keyframe_every == 0:
+            msg["k"] = 1
+            msg["d"] = cur
+        else:
+            msg["d"] = {k: v for k, v in cur.items() if k not in self._last or self._last[k] != v}
+            removed = [k for k in self._last if k not in cur]
+            if removed: msg["r"] = removed
+        self._last = cur
+        self._n += 1
+        return pack(msg)
+
+class DeltaDecoder:
+    def __init__(self):
+        self.state = {}
+
+    def apply(self, msg):
+        if msg.get("k"):
+            self.state = dict(msg["d"])
+        else:
+            self.state.update(msg["d"])
+            for k in msg.get("r", ()):
+                self.state.pop(k, None)
+        return self.state
+
+class Agent:
+    # Streams this host's frames to a collector. Frames are taken from the bus at
+    # `interval`; only the newest unsent one is kept, so a slow or absent collector
+    # never backs up the sampler. Reconnects every `retry` seconds and restarts the
+    # delta stream with a keyframe.
+    def __init__(self, bus, address, name=None, interval=1.0, retry=2.0):
+        self.address = address
+        self.name = name or socket.gethostname()
+        self.retry = retry
+        self.connected = False
+        self.sent = 0
+        self._pending = None
+        self._cond = threading.Condition()
+        self._stop = False
+        self._thread = None
+        self._sub = bus.subscribe(self._offer, interval)
+
+    def _offer(self, frame):
+        with self._cond:
+            self._pending = frame
+            self._cond.notify()
+
+    def start(self):
+        if self._thread: return
+        self._thread = threading.Thread(target=self._run, name="autodash-agent", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._sub.cancel()
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+        if self._thread: self._thread.join(2.0)
+        self._thread = None
+
+    def _next(self):
+        with self._cond:
+            while self._pending is None and not self._stop:
+                self._cond.wait()
+            frame, self._pending = self._pending, None
+            return frame
+
+    def _run(self):
+        while not self._stop:
+            try:
+                sock = socket.create_connection(self.address, timeout=5.0)
+            except OSError:
+                with self._cond:
+                    self._cond.wait_for(lambda: self._stop, self.retry)
+                continue
+            encoder = DeltaEncoder()
+            try:
+                with sock:
+                    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                    sock.sendall(pack({"hello": self.name, "v": PROTOCOL_VERSION}))
+                    self.connected = True
+                    while True:
+                        frame = self._next()
+                        if frame is None: return
+                        sock.sendall(encoder.encode(frame.t, frame.snap))
+                        self.sent += 1
+            except OSError:
+                pass
+            finally:
+                self.connected = False
+
+class RemoteHost:
+    def __init__(self, name, history_len):
+        self.name = name
+        self.snap = {}
+        self.t = None
+        self.history = HistoryStore(history_len, HISTORY_COLUMNS)
+        self.connected = False
+        self.peer = None
+        self.received = 0
+        self.bytes = 0
+        self._conn = None
+
+class Collector:
+    # Accepts agent connections and merges their streams into one RemoteHost
+    # (latest snapshot + HistoryStore) per host name, on a selector thread.
+    # Updated host names collect in a set; the GUI drains it on its own timer,
+    # so hundreds of hosts cost one batched UI pass per interval, not one per message.
+    def __init__(self, host="127.0.0.1", port=9109, history_len=600):
+        self.history_len = history_len
+        self.hosts = {}
+        self._lock = threading.Lock()
+        self._dirty = set()
+        self._sel = selectors.DefaultSelector()
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind((host, port))
+        self._sock.listen(512)
+        self._sock.setblocking(False)
+        self.address = self._sock.getsockname()
+        self._sel.register(self._sock, selectors.EVENT_READ, None)
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._sel.register(self._wake_r, selectors.EVENT_READ, "wake")
+        self._stop = False
+        self._thread = None
+
+    def drain(self):
+        # names of hosts updated (or connected/disconnected) since the last call
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+        return dirty
+
+    def start(self):
+        if self._thread: return self
+        self._thread = threading.Thread(target=self._serve, name="autodash-collector", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop = True
+        try: self._wake_w.send(b"x")
+        except OSError: pass
+        if self._thread: self._thread.join(2.0)
+        self._thread = None
+        for key in list(self._sel.get_map().values()):
+            key.fileobj.close()
+        self._sel.close()
+        self._wake_w.close()
+
+    def _serve(self):
+        while not self._stop:
+            for key, events in self._sel.select(timeout=1.0):
+                if key.data is None:
+                    self._accept()
+                elif key.data == "wake":
+                    key.fileobj.recv(64)
+                else:
+                    self._read(key)
+
+    def _accept(self):
+        try:
+            conn, peer = self._sock.accept()
+        except BlockingIOError:
+            return
+        conn.setblocking(False)
+        self._sel.register(conn, selectors.EVENT_READ, {"buf": bytearray(), "host": None, "peer": peer, "decoder": DeltaDecoder()})
+
+    def _close(self, conn, st):
+        self._sel.unregister(conn)
+        conn.close()
+        host = st["host"]
+        # a host that already reconnected on a new socket stays connected
+        if host and host._conn is conn:
+            host.connected = False
+            host._conn = None
+            with self._lock: self._dirty.add(host.name)
+
+    def _read(self, key):
+        conn, st = key.fileobj, key.data
+        try:
+            chunk = conn.recv(65536)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            chunk = b""
+        if not chunk:
+            return self._close(conn, st)
+        buf = st["buf"]
+        buf += chunk
+        pos = 0
+        try:
+            while len(buf) - pos >= HEADER.size:
+                (n,) = HEADER.unpack_from(buf, pos)
+                if n > MAX_MESSAGE: raise ValueError(f"message of {n} bytes")
+                if len(buf) - pos - HEADER.size < n: break
+                body = bytes(buf[pos + HEADER.size:pos + HEADER.size + n])
+                pos += HEADER.size + n
+                self._message(conn, st, json.loads(body), len(body))
+        except (ValueError, KeyError, TypeError):
+            # garbage or a protocol mismatch: drop the connection, the agent reconnects
+            return self._close(conn, st)
+        del buf[:pos]
+
+    def _message(self, conn, st, msg, size):
+        host = st["host"]
+        if host is None:
+            name = str(msg["hello"])
+            if msg.get("v") != PROTOCOL_VERSION: raise ValueError(f"protocol {msg.get('v')}")
+            with self._lock:
+                host = self.hosts.get(name)
+                if host is None:
+                    host = self.hosts[name] = RemoteHost(name, self.history_len)
+                host._conn, host.peer, host.connected = conn, st["peer"], True
+                self._dirty.add(name)
+            st["host"] = host
+            return
+        snap = dict(st["decoder"].apply(msg))
+        t = float(msg["t"])
+        host.history.append(t, history_row(snap))
+        # replace, don't mutate: the GUI thread may be reading the previous snapshot
+        host.snap, host.t = snap, t
+        host.received += 1
+        host.bytes += size
+        with self._lock: self._dirty.add(host.name)
+
+    def summary(self):
+        now = time.time()
+        with self._lock: hosts = list(self.hosts.values())
+        return {"hosts": len(hosts), "connected": sum(h.connected for h in hosts),
+                "stale": sum(1 for h in hosts if h.t is None or now - h.t > 5.0)}
@@ -0,0 +1,138 @@
+import csv, glob, os, threading, time
+import numpy as np
+
+from .logreader import LogReader
+from .monitor import HistoryRecorder
+from .profiler import Histogram
+from .snapshot import RECORD_DTYPE, Snapshot, freeze
+from .gpu import empty_gpu
+
+def read_csv_log(path):
+    # CSVLogger file (any column set) -> RECORD_DTYPE rows; unknown columns are ignored
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = csv.reader(f)
+        header = next(rows, None) or []
+        data = []
+        for row in rows:
+            if len(row) != len(header): continue  # torn last line
+            try:
+                data.append([float(v) if v else np.nan for v in row])
+            except ValueError:
+                continue
+    out = np.full(len(data), np.nan, dtype=RECORD_DTYPE)
+    if data:
+        arr = np.array(data, dtype=np.float64)
+        for i, name in enumerate(header):
+            if name in RECORD_DTYPE.fields: out[name] = arr[:, i]
+    return out
+
+def read_adl_log(path):
+    # binary log of any schema version -> RECORD_DTYPE rows
+    arr = LogReader(os.path.dirname(path)).open(path)
+    out = np.full(len(arr), np.nan, dtype=RECORD_DTYPE)
+    for name in arr.dtype.names:
+        if name in RECORD_DTYPE.fields: out[name] = arr[name]
+    return out
+
+def log_files(paths):
+    # files, glob patterns or log directories -> sorted list of .csv/.adl paths
+    out = []
+    for p in paths:
+        if os.path.isdir(p):
+            out += glob.glob(os.path.join(p, "metrics_*.csv")) + glob.glob(os.path.join(p, "metrics_*.adl"))
+        else:
+            out += glob.glob(p) or [p]
+    return sorted(set(out))
+
+def load_records(paths, t0=None, t1=None):
+    # all samples from the given logs in time order; a sample present in both a
+    # day's CSV and binary log is played once
+    parts = [read_adl_log(p) if p.endswith(".adl") else read_csv_log(p) for p in log_files(paths)]
+    rec = np.concatenate(parts) if parts else np.zeros(0, dtype=RECORD_DTYPE)
+    ts = rec["timestamp"]
+    keep = np.isfinite(ts)
+    if t0 is not None: keep &= ts >= t0
+    if t1 is not None: keep &= ts <= t1
+    rec = rec[keep]
+    _, first = np.unique(rec["timestamp"], return_index=True)
+    return rec[first]
+
+class ReplayStats:
+    # Wall-clock cost of a replay: frames published per second, the sampler tick
+    # (snapshot + every bus subscriber) and, with a GUI attached, each UI refresh.
+    def __init__(self):
+        self.tick = Histogram()
+        self.render = Histogram()
+        self.started = None
+        self.finished = None
+
+    def summary(self):
+        end = self.finished or time.perf_counter()
+        wall = max(1e-9, end - (self.started or end))
+        def ms(h):
+            return {"count": h.n, "mean": h.total / h.n * 1e3 if h.n else None,
+                    "p50": h.quantile(0.5) * 1e3 if h.n else None, "p99": h.quantile(0.99) * 1e3 if h.n else None,
+                    "max": h.max * 1e3}
+        return {"wall": wall, "fps": self.tick.n / wall, "render_fps": self.render.n / wall,
+                "tick": ms(self.tick), "render": ms(self.render)}
+
+    def format(self):
+        s = self.summary()
+        lines = [f"replay: {s['tick']['count']} frames in {s['wall']:.2f} s, {s['fps']:.1f} frames/s"
+                 + (f", {s['render']['count']} rendered ({s['render_fps']:.1f}/s)" if s["render"]["count"] else "")]
+        for name in ("tick", "render"):
+            h = s[name]
+            if h["count"]:
+                lines.append(f"  {name:<7} p50 {h['p50']:.3f} ms  p99 {h['p99']:.3f} ms  max {h['max']:.3f} ms")
+        return "\n".join(lines)
+
+class ReplayMonitor(HistoryRecorder):
+    # Plays recorded samples (see load_records) through a Sampler in Monitor's
+    # place. Frames carry the recorded timestamps, so alert windows, bus intervals
+    # and graph axes follow recorded time while the sampler ticks `speed` times
+    # faster than the recording (speed None or 0: as fast as possible). Gaps in the
+    # recording take one tick. snapshot() returns None at the end, which stops the
+    # sampler, and `finished` is set.
+    def __init__(self, records, speed=1.0, history_len=2400, tiers=None, core_history_len=600):
+        self.records = records
+        self.speed = speed
+        steps = np.diff(records["timestamp"])
+        steps = steps[steps > 0]
+        self.step = float(np.median(steps)) if len(steps) else 1.0
+        super().__init__(history_len, self.step, tiers, core_history_len)
+        self.stats = ReplayStats()
+        self.finished = threading.Event()
+        self.pos = 0
+
+    def __len__(self):
+        return len(self.records)
+
+    def tick_interval(self):
+        return self.step / self.speed if self.speed else 0.0
+
+    def set_interval(self, collector, seconds):
+        pass
+
+    def close(self):
+        pass
+
+    def snapshot(self, now=None):
+        if self.pos >= len(self.records):
+            if not self.finished.is_set():
+                self.stats.finished = time.perf_counter()
+                self.finished.set()
+            return None
+        if self.pos == 0: self.stats.started = time.perf_counter()
+        # a 0-d view of the row, no copy
+        rec = self.records[self.pos:self.pos + 1].reshape(())
+        self.pos += 1
+        load, temp = float(rec["gpu_load"]), float(rec["gpu_temp"])
+        gpus = ()
+        if load == load or temp == temp:
+            g = empty_gpu()
+            g.update(index=0, name="GPU (recorded)", backend="replay",
+                     load=load if load == load else None, temp=temp if temp == temp else None)
+            gpus = (freeze(g),)
+        snap = Snapshot(rec, gpus=gpus)
+        self.record(snap)
+        return snap
@@ -0,0 +1,89 @@
+import threading, time, traceback
+from collections import namedtuple
+
+from .processes import ProcessTracker, list_processes
+from .bus import SnapshotBus
+from .profiler import PROFILER
+from .snapshot import freeze
+
+# One published sample. Everything reachable from a Frame is read-only so it can be
+# handed across threads without copying (snap is a snapshot.Snapshot).
+Frame = namedtuple("Frame", ["t", "snap", "procs"])
+
+class Sampler:
+    def __init__(self, monitor, interval=None, bus=None, proc_limit=40, proc_interval=2.0, proc_key="cpu",
+                 tick_hist=None):
+        self.monitor = monitor
+        self.interval = interval or monitor.tick_interval()
+        self.bus = bus or SnapshotBus()
+        self.proc_limit = proc_limit
+        self.proc_interval = proc_interval
+        self.proc_key = proc_key
+        # process enumeration is the most expensive step; the UI turns it off while
+        # nobody is looking at the Processes tab
+        self.procs_enabled = True
+        self.tracker = ProcessTracker()
+        self._procs = ()
+        self._procs_at = None
+        # optional profiler.Histogram of whole-tick wall time (snapshot + every subscriber)
+        self.tick_hist = tick_hist
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread: return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="autodash-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=2.0):
+        if not self._thread: return
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def refresh_procs(self):
+        self._procs_at = None
+
+    def _due(self, last, interval, now):
+        return last is None or now - last >= interval - 0.01
+
+    def sample(self):
+        t0 = time.perf_counter()
+        with PROFILER.stage("snapshot"):
+            snap = self.monitor.snapshot(time.time())
+        if snap is None:
+            # a finite source (replay) ran out
+            self._stop.set()
+            return None
+        # frames carry the snapshot's own time, which is the recorded one when replaying
+        now = snap.timestamp
+        if self.proc_limit and self.procs_enabled and self._due(self._procs_at, self.proc_interval, now):
+            # frames between process reads carry the previous (identical) tuple forward
+            with PROFILER.stage("list_processes"):
+                self._procs = freeze(list_processes(limit=self.proc_limit, key=self.proc_key, tracker=self.tracker))
+            self._procs_at = now
+        frame = Frame(now, snap, self._procs)
+        # includes every bus subscriber that runs on this thread (logger, alerts, exporter ...)
+        with PROFILER.stage("publish"):
+            self.bus.publish(frame)
+        if self.tick_hist is not None:
+            self.tick_hist.add(time.perf_counter() - t0)
+        return frame
+
+    def _run(self):
+        deadline = time.monotonic()
+        while not self._stop.is_set():
+            try:
+                self.sample()
+            except Exception:
+                traceback.print_exc()
+            deadline += self.interval
+            delay = deadline - time.monotonic()
+            if delay < 0:
+                # fell behind (slow collector); skip missed ticks instead of bursting
+                deadline = time.monotonic(); delay = 0
+            self._stop.wait(delay)
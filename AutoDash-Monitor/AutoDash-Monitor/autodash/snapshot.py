@@ -0,0 +1,169 @@
+from collections.abc import Mapping
+from types import MappingProxyType
+import numpy as np
+
+from .gpu import empty_gpu
+
+# Bumped whenever RECORD_FIELDS changes; written into the binary log header.
+SNAPSHOT_VERSION = 2
+
+# Fixed-width numeric part of a sample: one packed little-endian record, NaN = not
+# measured. It doubles as the binary log row (see logging_utils), so the bytes of a
+# Snapshot go to disk as they are. The first nine fields are the version-1 log row.
+RECORD_FIELDS = [
+    ("timestamp", "<f8"),
+    ("cpu_total", "<f4"),
+    ("ram_percent", "<f4"),
+    ("net_up_bps", "<f4"),
+    ("net_down_bps", "<f4"),
+    ("disk_read_bps", "<f4"),
+    ("disk_write_bps", "<f4"),
+    ("gpu_load", "<f4"),
+    ("gpu_temp", "<f4"),
+    ("ram_total", "<f8"),
+    ("ram_used", "<f8"),
+    ("battery_percent", "<f4"),
+    # version 2: cgroup mode (see cgroup.py); % of CPU periods throttled, PSI avg10 %
+    ("cpu_throttled", "<f4"),
+    ("psi_cpu_some", "<f4"),
+    ("psi_memory_some", "<f4"),
+    ("psi_memory_full", "<f4"),
+    ("psi_io_some", "<f4"),
+    ("psi_io_full", "<f4"),
+]
+RECORD_DTYPE = np.dtype(RECORD_FIELDS)
+RECORD_NAMES = RECORD_DTYPE.names
+
+# Variable-size parts, kept as read-only containers and shared between snapshots
+# until their collector reads again.
+OBJECT_FIELDS = ("cpu_per_core", "gpus", "temps", "battery", "nics", "disks")
+
+# Snapshot fields produced by each Monitor collector (used for per-field staleness).
+COLLECTOR_FIELDS = {
+    "cpu": ["cpu_per_core", "cpu_total", "cpu_throttled"],
+    "ram": ["ram_total", "ram_used", "ram_percent"],
+    "net": ["net_up_bps", "net_down_bps", "nics"],
+    "disk": ["disk_read_bps", "disk_write_bps", "disks"],
+    "gpu": ["gpu", "gpus", "gpu_load", "gpu_temp"],
+    "temps": ["temps"],
+    "battery": ["battery", "battery_percent"],
+    "pressure": ["psi_cpu_some", "psi_memory_some", "psi_memory_full", "psi_io_some", "psi_io_full"],
+}
+COLLECTORS = tuple(COLLECTOR_FIELDS)
+
+KEYS = RECORD_NAMES + OBJECT_FIELDS + ("gpu", "age")
+
+EMPTY = MappingProxyType({})
+EMPTY_GPU = MappingProxyType(empty_gpu())
+
+def freeze(obj):
+    if isinstance(obj, dict):
+        return MappingProxyType({k: freeze(v) for k, v in obj.items()})
+    if isinstance(obj, list):
+        return tuple(freeze(v) for v in obj)
+    return obj
+
+def new_record():
+    return np.full((), np.nan, dtype=RECORD_DTYPE)
+
+class Snapshot(Mapping):
+    # One sample: a RECORD_DTYPE record plus the read-only per-device containers.
+    # Reads like the old snapshot dict (snap["cpu_total"], snap.get("gpu"), items()),
+    # scalars come back as float or None.
+    __slots__ = ("record",) + OBJECT_FIELDS + ("stamps",)
+
+    def __init__(self, record, cpu_per_core=(), gpus=(), temps=EMPTY, battery=None, nics=EMPTY, disks=EMPTY,
+                 stamps=None):
+        record.flags.writeable = False
+        self.record = record
+        self.cpu_per_core = cpu_per_core
+        self.gpus = gpus
+        self.temps = temps
+        self.battery = battery
+        self.nics = nics
+        self.disks = disks
+        self.stamps = stamps  # collector -> read time, aligned with COLLECTORS
+
+    @property
+    def timestamp(self):
+        return float(self.record["timestamp"])
+
+    def __getitem__(self, key):
+        if key in RECORD_DTYPE.fields:
+            v = float(self.record[key])
+            return None if v != v else v
+        if key in OBJECT_FIELDS:
+            return getattr(self, key)
+        if key == "gpu":
+            return self.gpus[0] if self.gpus else EMPTY_GPU
+        if key == "age":
+            return self.age()
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(KEYS)
+
+    def __len__(self):
+        return len(KEYS)
+
+    def __contains__(self, key):
+        return key in KEYS
+
+    def age(self):
+        # field -> seconds since its collector last read
+        if self.stamps is None: return EMPTY
+        t = self.timestamp
+        return MappingProxyType({f: t - stamp for name, stamp in zip(COLLECTORS, self.stamps)
+                                 for f in COLLECTOR_FIELDS[name]})
+
+    def to_bytes(self):
+        # the packed record, without copying (a memoryview of RECORD_DTYPE.itemsize bytes)
+        return memoryview(self.record.reshape(1).view(np.uint8))
+
+    @classmethod
+    def from_bytes(cls, buf, **objects):
+        # zero-copy view of a packed record (e.g. a log row); objects as in __init__
+        return cls(np.frombuffer(buf, RECORD_DTYPE, count=1).reshape(()), **objects)
+
+    @classmethod
+    def from_mapping(cls, snap, t=None):
+        # dict snapshot (remote agents, CSV rows, older code) -> Snapshot
+        rec = new_record()
+        gpu = snap.get("gpu") or {}
+        batt = snap.get("battery")
+        pct = batt.get("percent") if isinstance(batt, Mapping) else getattr(batt, "percent", None)
+        derived = {"gpu_load": gpu.get("load"), "gpu_temp": gpu.get("temp"), "battery_percent": pct}
+        for name in RECORD_NAMES:
+            v = snap.get(name)
+            if v is None: v = derived.get(name)
+            if v is not None: rec[name] = v
+        if t is not None: rec["timestamp"] = t
+        gpus = snap.get("gpus")
+        if gpus is None and snap.get("gpu"): gpus = (gpu,)
+        return cls(rec, freeze(snap.get("cpu_per_core") or ()), freeze(gpus or ()), freeze(snap.get("temps") or EMPTY),
+                   batt, freeze(snap.get("nics") or EMPTY), freeze(snap.get("disks") or EMPTY))
+
+    def with_timestamp(self, t):
+        rec = self.record.copy()
+        rec["timestamp"] = t
+        return Snapshot(rec, self.cpu_per_core, self.gpus, self.temps, self.battery, self.nics, self.disks, self.stamps)
+
+    def changed(self, prev):
+        # keys whose value differs from an earlier Snapshot; containers that were not
+        # re-read are the same objects, so most comparisons are identity checks
+        a, b = self.record, prev.record
+        out = set()
+        for name in RECORD_NAMES:
+            x, y = a[name], b[name]
+            if x != y and (x == x or y == y): out.add(name)
+        for name in OBJECT_FIELDS:
+            x, y = getattr(self, name), getattr(prev, name)
+            if x is not y and x != y: out.add(name)
+        if "gpus" in out: out.add("gpu")
+        if "timestamp" in out: out.add("age")
+        return out
+
+def as_snapshot(snap, t=None):
+    if isinstance(snap, Snapshot):
+        return snap if t is None or t == snap.timestamp else snap.with_timestamp(t)
+    return Snapshot.from_mapping(snap, t)
@@ -1,33 +1,359 @@
-import multiprocessing as mp, time, math
+import multiprocessing as mp, time, math, os, sys, json, random, socket, datetime, tempfile, mmap, platform
+import numpy as np
 
-def _worker(stop, intensity=1.0):
-    # Busy loop; do light math to avoid compiler optimization
-    while not stop.is_set():
-        x = 0.0
-        for i in range(int(5e5 * intensity)):
-            x += math.sqrt((i % 137) + 0.1)
-        if intensity < 1.0:
-            time.sleep(0.01)
+# ---------------- workloads ----------------
+# Each workload is setup(index, tmp_dir) -> state, step(state) -> ops done, and
+# cleanup(state). A step is a few milliseconds of work so the duty cycle loop
+# can stop close to its busy budget.
+
+def _noop_setup(index, tmp_dir):
+    return {}
+
+def _noop_cleanup(state):
+    pass
+
+def _cpu_step(state):
+    # scalar Python math; light work the interpreter can't skip
+    x = 0.0
+    for i in range(20000):
+        x += math.sqrt((i % 137) + 0.1)
+    return 20000
+
+def _numpy_setup(index, tmp_dir):
+    return {"a": np.random.default_rng(index).random(1 << 18), "out": np.empty(1 << 18)}
+
+def _numpy_step(state):
+    np.sqrt(state["a"], out=state["out"])
+    np.multiply(state["out"], state["a"], out=state["out"])
+    return state["a"].size
+
+def _memory_setup(index, tmp_dir):
+    n = 16 << 20
+    return {"src": np.ones(n, dtype=np.uint8), "dst": np.empty(n, dtype=np.uint8)}
+
+def _memory_step(state):
+    np.copyto(state["dst"], state["src"])
+    return 2 * state["src"].nbytes  # bytes read + written
+
+DISK_FILE_SIZE = 64 << 20
+SEQ_BLOCK = 1 << 20
+RAND_BLOCK = 4096
+
+# Positional I/O. Windows has no os.pwrite/pread/preadv; each worker owns its
+# descriptors, so seeking first is equivalent there.
+def _seek_write(fd, data, off):
+    os.lseek(fd, off, os.SEEK_SET)
+    return os.write(fd, data)
+
+def _seek_read_into(fd, buf, off):
+    os.lseek(fd, off, os.SEEK_SET)
+    return len(os.read(fd, len(buf)))
+
+_pwrite = getattr(os, "pwrite", _seek_write)
+
+if hasattr(os, "preadv"):
+    def _pread_into(fd, buf, off):
+        return os.preadv(fd, [buf], off)
+elif hasattr(os, "pread"):
+    def _pread_into(fd, buf, off):
+        return len(os.pread(fd, len(buf), off))
+else:
+    _pread_into = _seek_read_into
+
+def _disk_file(tmp_dir, index, fill):
+    fd, path = tempfile.mkstemp(prefix=f"autodash-bench-{index}-", dir=tmp_dir)
+    if fill:
+        block = os.urandom(SEQ_BLOCK)
+        for off in range(0, DISK_FILE_SIZE, SEQ_BLOCK):
+            _pwrite(fd, block, off)
+        os.fsync(fd)
+    return fd, path
+
+_sync = getattr(os, "fdatasync", os.fsync)
+
+def _seq_setup(index, tmp_dir):
+    fd, path = _disk_file(tmp_dir, index, fill=False)
+    return {"fd": fd, "path": path, "buf": os.urandom(SEQ_BLOCK), "off": 0}
+
+def _seq_step(state):
+    # sequential 1 MiB writes, made durable every 8 MiB so the page cache can't absorb them
+    _pwrite(state["fd"], state["buf"], state["off"])
+    state["off"] = (state["off"] + SEQ_BLOCK) % DISK_FILE_SIZE
+    if state["off"] % (8 * SEQ_BLOCK) == 0:
+        _sync(state["fd"])
+    return SEQ_BLOCK
+
+def _open_uncached(path):
+    # -> (read-only fd, whether reads bypass the page cache)
+    direct = getattr(os, "O_DIRECT", 0)
+    if direct:
+        try:
+            # needs an aligned buffer, which mmap gives us; some filesystems refuse it
+            return os.open(path, os.O_RDONLY | direct), True
+        except OSError:
+            pass
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    if sys.platform == "darwin":
+        import fcntl
+        try:
+            fcntl.fcntl(fd, getattr(fcntl, "F_NOCACHE", 48), 1)
+            return fd, True
+        except OSError:
+            pass
+    return fd, False
+
+def page_cache_bypassed(tmp_dir=None):
+    # Whether disk_rand reads in tmp_dir skip the page cache. If not (Windows, a
+    # filesystem refusing O_DIRECT) its 64 MiB file is read from RAM and the
+    # result isn't a disk figure.
+    fd, path = tempfile.mkstemp(prefix="autodash-probe-", dir=tmp_dir)
+    os.close(fd)
+    try:
+        fd, uncached = _open_uncached(path)
+        os.close(fd)
+        return uncached
+    finally:
+        os.unlink(path)
+
+def _rand_setup(index, tmp_dir):
+    fd, path = _disk_file(tmp_dir, index, fill=True)
+    os.close(fd)
+    fd, _ = _open_uncached(path)
+    return {"fd": fd, "path": path, "buf": mmap.mmap(-1, RAND_BLOCK), "rng": random.Random(index),
+            "blocks": DISK_FILE_SIZE // RAND_BLOCK}
+
+def _rand_step(state):
+    fd, buf, rng, blocks = state["fd"], state["buf"], state["rng"], state["blocks"]
+    for _ in range(16):
+        _pread_into(fd, buf, rng.randrange(blocks) * RAND_BLOCK)
+    return 16
+
+def _disk_cleanup(state):
+    os.close(state["fd"])
+    try: os.unlink(state["path"])
+    except OSError: pass
+
+# name -> (setup, step, cleanup, unit)
+WORKLOADS = {
+    "cpu": (_noop_setup, _cpu_step, _noop_cleanup, "ops"),
+    "numpy": (_numpy_setup, _numpy_step, _noop_cleanup, "elements"),
+    "memory": (_memory_setup, _memory_step, _noop_cleanup, "bytes"),
+    "disk_seq": (_seq_setup, _seq_step, _disk_cleanup, "bytes"),
+    "disk_rand": (_rand_setup, _rand_step, _disk_cleanup, "IOs"),
+}
+
+DUTY_PERIOD = 0.1  # seconds per busy/idle cycle
+
+def _worker(stop, workload, index, duty, counts, cpu, tmp_dir):
+    # Runs `workload` for duty * DUTY_PERIOD out of every DUTY_PERIOD seconds and
+    # adds the ops done to counts[index] (each worker owns its slot). cpu[index] is
+    # the CPU time the worker has actually been given.
+    setup, step, cleanup, _ = WORKLOADS[workload]
+    state = setup(index, tmp_dir)
+    try:
+        while not stop.is_set():
+            start = time.perf_counter()
+            busy_until = start + duty * DUTY_PERIOD
+            ops = 0
+            while True:
+                ops += step(state)
+                now = time.perf_counter()
+                if now >= busy_until: break
+            counts[index] += ops
+            cpu[index] = time.process_time()
+            rest = start + DUTY_PERIOD - now
+            if rest > 0: time.sleep(rest)
+    finally:
+        cleanup(state)
 
 class CPUStressor:
+    # `intensity` is a nominal duty cycle: each worker runs its workload for that share
+    # of every DUTY_PERIOD of wall time (0.5 -> busy 50% of the time). It is open loop,
+    # so under other load a worker gets less CPU than that; `busy` has what it got.
     def __init__(self):
         self.procs = []
         self.stop_event = None
+        self.counts = None
+        self.cpu = None
+        self.busy = []
+        self._last = None
 
-    def start(self, workers=None, intensity=1.0):
+    def start(self, workers=None, intensity=1.0, workload="cpu", tmp_dir=None):
         if self.procs: return
         if workers is None:
             workers = max(1, mp.cpu_count()-1)
+        duty = max(0.01, min(1.0, intensity))
         self.stop_event = mp.Event()
-        self.procs = [mp.Process(target=_worker, args=(self.stop_event, intensity)) for _ in range(workers)]
+        self.counts = mp.Array("d", workers, lock=False)
+        self.cpu = mp.Array("d", workers, lock=False)
+        self.procs = [mp.Process(target=_worker, args=(self.stop_event, workload, i, duty, self.counts, self.cpu, tmp_dir),
+                                 daemon=True)
+                      for i in range(workers)]
         for p in self.procs: p.start()
+        self._last = (time.perf_counter(), [0.0] * workers, [0.0] * workers)
+
+    def rates(self):
+        # ops/s per worker since the previous call (or start); `busy` is set to each
+        # worker's measured CPU time over the same interval, as a fraction of wall time
+        if not self.procs: return []
+        now, counts, cpu = time.perf_counter(), list(self.counts), list(self.cpu)
+        t0, prev, prev_cpu = self._last
+        self._last = (now, counts, cpu)
+        dt = max(1e-9, now - t0)
+        self.busy = [(c - p) / dt for c, p in zip(cpu, prev_cpu)]
+        return [(c - p) / dt for c, p in zip(counts, prev)]
 
     def stop(self):
         if not self.procs: return
         self.stop_event.set()
         for p in self.procs:
-            p.join(timeout=2)
+            p.join(timeout=5)
             if p.is_alive():
                 p.terminate()
         self.procs = []
         self.stop_event = None
+
+# ---------------- benchmark runs ----------------
+
+class ThermalRecorder:
+    # Records load, hottest sensor and CPU clock from the sampler's frames while a benchmark runs.
+    def __init__(self, bus, interval=1.0):
+        from .alerts import metrics
+        self._metrics = metrics
+        self.rows = []
+        self.sub = bus.subscribe(self._record, interval)
+
+    def _record(self, frame):
+        import psutil
+        m = self._metrics(frame.snap)
+        freq = psutil.cpu_freq() if hasattr(psutil, "cpu_freq") else None
+        self.rows.append((frame.t, m["cpu_total"], m["temp_max"], m["gpu_temp"], freq.current if freq else None))
+
+    def close(self):
+        self.sub.cancel()
+
+    def between(self, t0, t1):
+        return [r for r in self.rows if t0 <= r[0] <= t1]
+
+    def curve(self):
+        cols = ["t", "cpu_total", "temp_max", "gpu_temp", "freq_mhz"]
+        return {c: [r[i] for r in self.rows] for i, c in enumerate(cols)}
+
+def scaling_steps(cores):
+    n, steps = 1, []
+    while n < cores:
+        steps.append(n); n *= 2
+    return steps + [cores]
+
+class Benchmark:
+    # Runs each workload for `seconds` at nominal duty cycle `load`: once with one
+    # worker, and for `scaling` workloads with 1, 2, 4 ... cpu_count workers. Each run
+    # reports the requested load next to the CPU time the workers actually got; with
+    # a bus, the sampler's frames add the whole-system load and the thermal/clock curve.
+    def __init__(self, bus=None, workloads=("cpu", "numpy", "memory", "disk_seq", "disk_rand"), seconds=5.0,
+                 load=1.0, scaling=("cpu", "numpy"), warmup=1.0, tmp_dir=None):
+        self.bus = bus
+        self.workloads = [w for w in workloads if w in WORKLOADS]
+        self.seconds = seconds
+        self.load = load
+        self.scaling = scaling
+        self.warmup = warmup
+        self.tmp_dir = tmp_dir
+        self.cores = mp.cpu_count()
+
+    def _run_one(self, workload, workers, recorder):
+        stressor = CPUStressor()
+        stressor.start(workers=workers, intensity=self.load, workload=workload, tmp_dir=self.tmp_dir)
+        try:
+            # setup (e.g. filling the random-read file) counts as warm-up, not as measured time
+            time.sleep(self.warmup)
+            stressor.rates()
+            t0 = time.time()
+            time.sleep(self.seconds)
+            per_worker = stressor.rates()
+            busy = stressor.busy
+            t1 = time.time()
+        finally:
+            stressor.stop()
+        run = {"workload": workload, "workers": workers, "unit": WORKLOADS[workload][3], "seconds": t1 - t0,
+               "per_worker_per_s": per_worker, "total_per_s": sum(per_worker),
+               "target_load": min(100.0, 100.0 * workers * self.load / self.cores),
+               "worker_load": min(100.0, 100.0 * sum(busy) / self.cores)}
+        if workload == "disk_rand":
+            run["cached"] = not page_cache_bypassed(self.tmp_dir)
+        if recorder:
+            loads = [r[1] for r in recorder.between(t0, t1) if r[1] is not None]
+            run["achieved_load"] = sum(loads) / len(loads) if loads else None
+        return run
+
+    def run(self, progress=None):
+        started = datetime.datetime.now()
+        recorder = ThermalRecorder(self.bus) if self.bus else None
+        runs = []
+        try:
+            for w in self.workloads:
+                base = None
+                for n in (scaling_steps(self.cores) if w in self.scaling else [1]):
+                    if progress: progress(f"{w} × {n}")
+                    run = self._run_one(w, n, recorder)
+                    if base is None: base = run["total_per_s"]
+                    # 1.0 = perfect linear scaling from one worker
+                    run["efficiency"] = run["total_per_s"] / (n * base) if base else None
+                    runs.append(run)
+        finally:
+            if recorder: recorder.close()
+        return {"version": 1, "started": started.isoformat(timespec="seconds"), "host": socket.gethostname(),
+                "cpu_count": self.cores, "platform": platform.platform(), "python": platform.python_version(),
+                "numpy": np.__version__, "load": self.load, "runs": runs,
+                "thermal": recorder.curve() if recorder else None}
+
+def save_results(results, out_dir="benchmarks"):
+    os.makedirs(out_dir, exist_ok=True)
+    stamp = results["started"].replace(":", "").replace("-", "")
+    path = os.path.join(out_dir, f"bench_{stamp}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=1)
+    return path
+
+def load_results(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def compare(old, new):
+    # (workload, workers) -> new/old throughput ratio, for runs present in both
+    before = {(r["workload"], r["workers"]): r["total_per_s"] for r in old["runs"]}
+    return {(r["workload"], r["workers"]): r["total_per_s"] / before[(r["workload"], r["workers"])]
+            for r in new["runs"] if before.get((r["workload"], r["workers"]))}
+
+def _si(n):
+    for unit in ["", "k", "M", "G", "T"]:
+        if abs(n) < 1000.0: return f"{n:.1f}{unit}"
+        n /= 1000.0
+    return f"{n:.1f}P"
+
+def format_results(results, baseline=None):
+    ratios = compare(baseline, results) if baseline else {}
+    lines = [f"{'workload':<10} {'workers':>7} {'total/s':>16} {'per worker/s':>13} {'eff':>5} {'load req/got':>12} {'system':>6}"
+             + ("  vs baseline" if baseline else "")]
+    for r in results["runs"]:
+        per = r["total_per_s"] / r["workers"]
+        eff = f"{r['efficiency']:.2f}" if r.get("efficiency") is not None else "--"
+        load = f"{r['target_load']:.0f}%/" + (f"{r['worker_load']:.0f}%" if r.get("worker_load") is not None else "--")
+        system = f"{r['achieved_load']:.0f}%" if r.get("achieved_load") is not None else "--"
+        unit = r["unit"] + ("*" if r.get("cached") else "")
+        line = (f"{r['workload']:<10} {r['workers']:>7} {_si(r['total_per_s']) + ' ' + unit:>16} {_si(per):>13} {eff:>5} "
+                f"{load:>12} {system:>6}")
+        ratio = ratios.get((r["workload"], r["workers"]))
+        if ratio: line += f"  {ratio:6.2f}x"
+        lines.append(line)
+    lines.append("load: requested is a nominal, open-loop duty cycle; got is the CPU time the workers "
+                 "were given; system is whole-machine CPU %")
+    if any(r.get("cached") for r in results["runs"]):
+        lines.append("* read from the page cache (no O_DIRECT/F_NOCACHE for this directory): memory speed, not disk")
+    th = results.get("thermal")
+    if th and th["t"]:
+        temps = [v for v in th["temp_max"] if v is not None]
+        freqs = [v for v in th["freq_mhz"] if v is not None]
+        if temps: lines.append(f"hottest sensor: {min(temps):.0f}-{max(temps):.0f} °C")
+        if freqs: lines.append(f"CPU clock: {min(freqs):.0f}-{max(freqs):.0f} MHz")
+    return "\n".join(lines)
@@ -0,0 +1,64 @@
+from PyQt5.QtWidgets import QWidget, QGridLayout, QGroupBox, QVBoxLayout, QLabel
+
+from .profiler import PROFILER
+
+# One shared stylesheet; each label only flips its "level" property.
+TEMP_QSS = '''
+QLabel[level] { background: #0f151d; border: 1px solid #1e2a36; padding: 6px 8px; border-radius: 8px; }
+QLabel[level="ok"] { color: #3795ff; }
+QLabel[level="warm"] { color: #ffb037; }
+QLabel[level="hot"] { color: #ff4d4d; }
+'''
+
+def temp_level(t):
+    t = t or 0
+    return "ok" if t < 60 else ("warm" if t < 80 else "hot")
+
+class TempMap(QWidget):
+    # Sensor widgets are built once per sensor set; later updates only touch the
+    # text and level of labels whose reading changed.
+    def __init__(self, columns=2, parent=None):
+        super().__init__(parent)
+        self.columns = columns
+        self.setStyleSheet(TEMP_QSS)
+        self._layout = QGridLayout(self)
+        self._keys = None
+        self._slots = {}  # (sensor, index) -> [QLabel, text, level]
+
+    def _rebuild(self, temps):
+        with PROFILER.stage("temps.rebuild"):
+            while self._layout.count():
+                w = self._layout.takeAt(0).widget()
+                if w: w.deleteLater()
+            self._slots = {}
+            r = c = 0
+            for name, entries in temps.items():
+                group = QGroupBox(name)
+                vl = QVBoxLayout(group)
+                for i, e in enumerate(entries):
+                    lab = QLabel()
+                    vl.addWidget(lab)
+                    self._slots[(name, i)] = [lab, None, None]
+                self._layout.addWidget(group, r, c)
+                c += 1
+                if c >= self.columns:
+                    r += 1; c = 0
+
+    def update_temps(self, temps):
+        with PROFILER.stage("temps.update"):
+            keys = tuple((name, tuple(e["label"] for e in entries)) for name, entries in temps.items())
+            if keys != self._keys:
+                self._rebuild(temps)
+                self._keys = keys
+            for name, entries in temps.items():
+                for i, e in enumerate(entries):
+                    slot = self._slots[(name, i)]
+                    lab = slot[0]
+                    text = f"{e['label']}: {e['current']} °C"
+                    if text != slot[1]:
+                        lab.setText(text); slot[1] = text
+                    level = temp_level(e["current"])
+                    if level != slot[2]:
+                        lab.setProperty("level", level); slot[2] = level
+                        # re-evaluate the property selectors for this label only
+                        lab.style().unpolish(lab); lab.style().polish(lab)
@@ -13,7 +13,7 @@ QTabBar::tab { background: #0f151d; border: 1px solid #1e2a36; padding: 8px 12px
 QTabBar::tab:selected { background: #14202c; color: #9ecfff; }
 QProgressBar { border: 1px solid #1e2a36; border-radius: 8px; text-align: center; }
 QProgressBar::chunk { background-color: #3795ff; border-radius: 6px; }
-QTableWidget { gridline-color: #1e2a36; selection-background-color: #1a2a40; }
+QTableView { gridline-color: #1e2a36; selection-background-color: #1a2a40; }
 QToolTip { background: #0f151d; color: #e6e9ef; border: 1px solid #1e2a36; }
 '''
 
@@ -30,7 +30,7 @@ QTabBar::tab { background: #ffffff; border: 1px solid #d7dfe7; padding: 8px 12px
 QTabBar::tab:selected { background: #eef6ff; color: #024b94; }
 QProgressBar { border: 1px solid #d7dfe7; border-radius: 8px; text-align: center; }
 QProgressBar::chunk { background-color: #2a7bdf; border-radius: 6px; }
-QTableWidget { gridline-color: #d7dfe7; selection-background-color: #ddeeff; }
+QTableView { gridline-color: #d7dfe7; selection-background-color: #ddeeff; }
 QToolTip { background: #ffffff; color: #0b0f14; border: 1px solid #d7dfe7; }
 '''
 
@@ -0,0 +1,12 @@
+import os, sys
+import pytest
+
+# run from a checkout without installing: make the autodash package importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+@pytest.fixture(scope="session")
+def qapp():
+    # offscreen Qt for widget tests; skipped where PyQt5 isn't installed
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    QtWidgets = pytest.importorskip("PyQt5.QtWidgets")
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
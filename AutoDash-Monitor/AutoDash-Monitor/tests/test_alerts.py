@@ -0,0 +1,53 @@
+import random, statistics
+
+from autodash.alerts import AlertEngine, RollingStats, Rule, _zscore
+from autodash.sampler import Frame
+
+def busy_then_idle(add, seed, idle):
+    # 10 min of 300-700 MB/s writes at 4 Hz, then a 2.5 min idle stretch
+    rnd = random.Random(seed)
+    t = 0.0
+    for _ in range(2400):
+        add(t, rnd.uniform(300e6, 700e6)); t += 0.25
+    for i in range(600):
+        add(t, idle(i)); t += 0.25
+    return t
+
+def test_rolling_stats_after_large_values_leave():
+    for seed in range(4):
+        rs = RollingStats(120)
+        busy_then_idle(rs.add, seed, lambda i: 4096.0 if i % 3 == 0 else 0.0)
+        vals = [v for _, v in rs._q]
+        assert abs(rs.std - statistics.stdev(vals)) < 1e-6 * statistics.stdev(vals)
+        assert abs(rs.mean - statistics.fmean(vals)) < 1e-6
+
+def test_rolling_stats_constant_window_is_exact():
+    for seed in range(4):
+        rs = RollingStats(120)
+        busy_then_idle(rs.add, seed, lambda i: 0.0)
+        assert rs.std == 0.0 and rs.mean == 0.0
+
+def test_zscore_no_false_alarm_after_idle():
+    for seed in range(4):
+        z = _zscore(120)
+        t = busy_then_idle(z, seed, lambda i: 0.0)
+        assert z(t, 4096.0) == 0.0
+
+def test_wildcard_rule_matches_each_key():
+    engine = AlertEngine([Rule("core", "cpu_core[*] > 90 for 0s", clear=80)])
+    events = engine.evaluate(Frame(0.0, {"cpu_per_core": [95.0, 10.0, 99.0]}, None))
+    assert sorted(e.key for e in events) == ["cpu_core[0]", "cpu_core[2]"]
+    # a different key set of the same size is matched again
+    engine = AlertEngine([Rule("gpu", "gpu_temp[*] > 85 for 0s")])
+    engine.evaluate(Frame(0.0, {"gpus": [{"index": 0, "temp": 50.0}]}, None))
+    events = engine.evaluate(Frame(1.0, {"gpus": [{"index": 1, "temp": 90.0}]}, None))
+    assert [e.key for e in events] == ["gpu_temp[1]"]
+
+def test_departed_keys_lose_their_state():
+    engine = AlertEngine([Rule("gpu", "gpu_temp[*] > 85 for 0s")], forget_after=60.0)
+    engine.evaluate(Frame(0.0, {"gpus": [{"index": 0, "temp": 90.0}, {"index": 1, "temp": 90.0}]}, None))
+    assert len(engine.active()) == 2
+    for t in range(1, 120):
+        engine.evaluate(Frame(float(t), {"gpus": [{"index": 0, "temp": 90.0}]}, None))
+        if t == 30: assert ("gpu", "gpu_temp[1]") in engine.active()
+    assert engine.active() == [("gpu", "gpu_temp[0]")]
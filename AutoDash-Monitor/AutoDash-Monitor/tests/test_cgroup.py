@@ -0,0 +1,120 @@
+import os
+import pytest
+
+from autodash.cgroup import CgroupReader, find_cgroup, open_cgroup, parse_io_stat, parse_pressure
+from autodash.monitor import Monitor
+
+MiB = 1 << 20
+
+def write(path, text):
+    # in place, as the kernel updates them: the reader keeps its descriptors open
+    with open(path, "r+" if os.path.exists(path) else "w") as f:
+        f.truncate()
+        f.write(text)
+
+def cpu_stat(usage, periods, throttled):
+    return f"usage_usec {usage}\nuser_usec {usage // 2}\nsystem_usec {usage // 2}\n" \
+           f"nr_periods {periods}\nnr_throttled {throttled}\nthrottled_usec 0\n"
+
+def pressure(some, full=None):
+    out = f"some avg10={some:.2f} avg60=0.50 avg300=0.10 total=12345\n"
+    if full is not None: out += f"full avg10={full:.2f} avg60=0.00 avg300=0.00 total=678\n"
+    return out
+
+@pytest.fixture
+def cgroup(tmp_path):
+    cg = tmp_path / "sys/fs/cgroup/system.slice/app.scope"
+    cg.mkdir(parents=True)
+    (tmp_path / "sys/fs/cgroup/cgroup.controllers").write_text("cpu io memory pids\n")
+    files = {
+        "cpu.stat": cpu_stat(1_000_000, 100, 0),
+        "cpu.max": "50000 100000\n",
+        "memory.current": f"{600 * MiB}\n",
+        "memory.max": f"{1024 * MiB}\n",
+        "memory.stat": f"anon {400 * MiB}\nfile {200 * MiB}\ninactive_file {100 * MiB}\nactive_file {100 * MiB}\n",
+        "io.stat": "259:99 rbytes=1000 wbytes=2000 rios=10 wios=20 dbytes=0 dios=0\n",
+        "cpu.pressure": pressure(1.5, 0.0),
+        "memory.pressure": pressure(3.25, 1.0),
+        "io.pressure": pressure(7.0, 4.5),
+    }
+    for name, text in files.items():
+        write(cg / name, text)
+    return cg
+
+def test_parsers():
+    assert parse_pressure(pressure(2.5, 1.25)) == {"some": 2.5, "full": 1.25}
+    assert parse_pressure(pressure(2.5)) == {"some": 2.5}
+    io = parse_io_stat("8:0 rbytes=4096 wbytes=8192 rios=1 wios=2 dbytes=0 dios=0\n253:1 rbytes=5\n\n")
+    assert io["8:0"] == (4096, 8192, 1, 2)
+    assert io["253:1"] == (5, 0, 0, 0)
+
+def test_find_cgroup(tmp_path, cgroup):
+    proc = tmp_path / "cgroup"
+    proc.write_text("0::/system.slice/app.scope\n")
+    root = str(tmp_path / "sys/fs/cgroup")
+    assert find_cgroup(root, str(proc)) == str(cgroup)
+    proc.write_text("0::/not/here\n")  # cgroup namespace: fall back to the mount
+    assert find_cgroup(root, str(proc)) == root
+    assert find_cgroup(str(tmp_path / "nowhere"), str(proc)) is None
+
+def test_reader(tmp_path, cgroup):
+    block = tmp_path / "sys/dev/block/259:99"
+    block.mkdir(parents=True)
+    (block / "uevent").write_text("MAJOR=259\nMINOR=99\nDEVNAME=nvme9n1\nDEVTYPE=disk\n")
+    r = CgroupReader(str(cgroup), sys_block=str(tmp_path / "sys/dev/block"))
+    try:
+        assert r.cpu_counters() == (1_000_000, 100, 0)
+        assert r.cpu_limit() == 0.5
+        assert r.memory() == (500 * MiB, 1024 * MiB)
+        assert r.pressure("io") == {"some": 7.0, "full": 4.5}
+        assert r.io_counters() == {"nvme9n1": (1000, 2000, 10, 20)}
+        write(cgroup / "cpu.max", "max 100000\n")
+        write(cgroup / "memory.max", "max\n")
+        assert r.cpu_limit() is None
+        assert r.memory() == (500 * MiB, None)
+    finally:
+        r.close()
+
+def test_reader_without_controllers(tmp_path, cgroup):
+    for name in ("cpu.max", "io.stat", "cpu.pressure"):
+        os.remove(cgroup / name)
+    r = CgroupReader(str(cgroup))
+    assert not r.has("io.stat")
+    assert r.cpu_limit() is None and r.io_counters() == {} and r.pressure("cpu") == {}
+    r.close()
+    with pytest.raises(OSError):
+        CgroupReader(str(tmp_path))
+
+def test_open_cgroup(monkeypatch, cgroup):
+    monkeypatch.delenv("AUTODASH_CGROUP", raising=False)
+    assert open_cgroup() is None
+    monkeypatch.setenv("AUTODASH_CGROUP", str(cgroup))
+    r = open_cgroup()
+    assert r.path == str(cgroup)
+    r.close()
+    assert open_cgroup("off") is None
+
+def test_monitor_in_cgroup_mode(cgroup):
+    m = Monitor(cgroup=str(cgroup), gpu_backend="none")
+    try:
+        t0 = m.cgroup_cpu_rates._t
+        # one second later: 0.25 CPU-seconds used against a 0.5 CPU quota, 2 of 10 periods throttled
+        write(cgroup / "cpu.stat", cpu_stat(1_250_000, 110, 2))
+        write(cgroup / "io.stat", "259:99 rbytes=5000 wbytes=2000 rios=14 wios=20 dbytes=0 dios=0\n")
+        m.disk_rates._t = t0  # both were primed in __init__, microseconds apart
+        snap = m.snapshot(t0 + 1.0)
+        assert snap["cpu_total"] == pytest.approx(50.0)
+        assert snap["cpu_throttled"] == pytest.approx(20.0)
+        assert snap["ram_used"] == 500 * MiB and snap["ram_total"] == 1024 * MiB
+        assert snap["ram_percent"] == pytest.approx(500 / 1024 * 100)
+        assert snap["disk_read_bps"] == pytest.approx(4000.0) and snap["disk_write_bps"] == 0.0
+        assert snap["disks"]["259:99"]["read_iops"] == pytest.approx(4.0)
+        assert snap["psi_cpu_some"] == 1.5 and snap["psi_memory_full"] == 1.0 and snap["psi_io_some"] == 7.0
+        v = m.history.views(["psi_io", "psi_memory"])
+        assert v["psi_io"][-1] == 7.0 and v["psi_memory"][-1] == 3.25
+        # a reset usage counter is no reading, not 0 %
+        write(cgroup / "cpu.stat", cpu_stat(10_000, 120, 2))
+        snap = m.snapshot(t0 + 2.0)
+        assert snap["cpu_total"] is None
+    finally:
+        m.close()
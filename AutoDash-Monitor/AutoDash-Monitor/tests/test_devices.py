@@ -0,0 +1,30 @@
+import math
+from collections import namedtuple
+
+from autodash.devices import NIC_FIELDS, CounterRates, nic_rates
+
+Net = namedtuple("Net", NIC_FIELDS)
+
+def net(sent, recv):
+    return Net(sent, recv, 0, 0)
+
+def test_counter_reset_gives_no_reading():
+    rates = CounterRates(NIC_FIELDS)
+    rates.update({"eth0": net(3_000_000_000, 10)}, 0.0)
+    # a reset from the top half of the 32-bit range must not read as a wrap
+    names, d, dt = rates.update({"eth0": net(1000, 20)}, 1.0)
+    assert names == ["eth0"] and dt == 1.0
+    assert math.isnan(d[0, 0]) and d[0, 1] == 10
+    names, d, _ = rates.update({"eth0": net(5000, 30)}, 2.0)
+    assert d[0, 0] == 4000
+
+def test_device_appears_and_disappears():
+    rates = CounterRates(NIC_FIELDS)
+    nic_rates(rates, {"eth0": net(0, 0)}, 0.0)
+    rows, up, down = nic_rates(rates, {"eth0": net(100, 200), "tun0": net(5000, 5000)}, 1.0)
+    assert rows["eth0"]["up_bps"] == 100.0 and rows["eth0"]["down_bps"] == 200.0
+    assert rows["tun0"]["up_bps"] is None  # first read only primes it
+    assert (up, down) == (100.0, 200.0)
+    rows, up, down = nic_rates(rates, {"tun0": net(5100, 5300)}, 2.0)
+    assert list(rows) == ["tun0"]
+    assert (up, down) == (100.0, 300.0)
@@ -0,0 +1,64 @@
+import json, urllib.error, urllib.request
+import pytest
+
+from autodash.bus import SnapshotBus
+from autodash.exporter import MetricsExporter
+from autodash.history import HistoryStore
+from autodash.sampler import Frame
+from autodash.snapshot import Snapshot
+
+SNAP = {"cpu_total": 12.5, "cpu_per_core": [10.0, 15.0], "ram_used": 2e9, "ram_total": 8e9, "ram_percent": 25.0,
+        "net_up_bps": 100.0, "net_down_bps": 2000.0,
+        "gpus": [{"index": 0, "name": "Fake GPU", "load": 40.0, "temp": 55.0}],
+        "disks": {"sda": {"read_bps": 1.0, "write_bps": 2.0, "read_iops": 3.0, "write_iops": 4.0,
+                          "read_lat_ms": None, "write_lat_ms": 0.5, "busy": 7.0}}}
+
+@pytest.fixture
+def exporter():
+    bus = SnapshotBus()
+    history = HistoryStore(10, ["cpu_total"])
+    exp = MetricsExporter(bus, history, port=0, interval=None)  # ephemeral port
+    exp.start()
+    yield bus, history, exp
+    exp.stop()
+
+def get(exp, path):
+    host, port = exp.address
+    try:
+        with urllib.request.urlopen(f"http://{host}:{port}{path}", timeout=5) as r:
+            return r.status, r.headers["Content-Type"], r.read().decode()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers["Content-Type"], e.read().decode()
+
+def test_not_ready_until_first_frame(exporter):
+    _, _, exp = exporter
+    assert get(exp, "/metrics")[0] == 503
+    assert get(exp, "/nope")[0] == 404
+
+def test_scrape_metrics_and_json(exporter):
+    bus, history, exp = exporter
+    history.append(1000.0, {"cpu_total": 12.5})
+    bus.publish(Frame(1000.0, Snapshot.from_mapping(SNAP, 1000.0), None))
+
+    status, ctype, text = get(exp, "/metrics")
+    assert status == 200 and ctype.startswith("text/plain")
+    lines = text.splitlines()
+    assert "autodash_cpu_percent 12.5" in lines
+    assert 'autodash_cpu_core_percent{core="1"} 15.0' in lines
+    assert 'autodash_gpu_temperature_celsius{gpu="0",name="Fake GPU"} 55.0' in lines
+    assert 'autodash_disk_device_busy_percent{device="sda"} 7.0' in lines
+    # a None value (no reads this interval) is left out rather than exported
+    assert [l for l in lines if l.startswith("autodash_disk_device_latency_ms{")] == [
+        'autodash_disk_device_latency_ms{device="sda",direction="write"} 0.5']
+    assert "# TYPE autodash_memory_used_bytes gauge" in lines
+
+    status, ctype, text = get(exp, "/metrics.json")
+    assert status == 200 and ctype == "application/json"
+    body = json.loads(text)
+    assert body["t"] == 1000.0
+    assert body["snapshot"]["cpu_total"] == 12.5
+    assert body["snapshot"]["gpu"]["name"] == "Fake GPU"
+    assert body["snapshot"]["psi_cpu_some"] is None
+
+    hist = json.loads(get(exp, "/history.json")[2])
+    assert hist["t"][-1] == 1000.0 and hist["cpu_total"][-1] == 12.5
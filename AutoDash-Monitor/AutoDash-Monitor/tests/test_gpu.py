@@ -0,0 +1,49 @@
+import time
+import pytest
+
+from autodash.alerts import metrics
+from autodash.exporter import prometheus_text
+from autodash.gpu import GPU_FIELDS, FakeBackend, open_backend
+from autodash.monitor import Monitor
+from autodash.sampler import Frame
+
+def test_fake_backend_is_deterministic():
+    a, b = FakeBackend(clock=lambda: 12.0).read(), FakeBackend(clock=lambda: 12.0).read()
+    assert a == b and len(a) == 2
+    assert all(set(g) == set(GPU_FIELDS) for g in a)
+    assert [g["index"] for g in a] == [0, 1]
+
+def test_open_backend_by_name(monkeypatch):
+    assert open_backend("fake").name == "fake"
+    monkeypatch.setenv("AUTODASH_GPU_BACKEND", "none")
+    assert open_backend().read() == []
+
+@pytest.fixture
+def monitor():
+    m = Monitor(gpu_backend="fake")
+    yield m
+    m.close()
+
+def test_fake_gpus_through_snapshot(monitor):
+    now = time.time()
+    snap = monitor.snapshot(now)
+    gpus = snap["gpus"]
+    assert [g["name"] for g in gpus] == ["Fake GPU 0", "Fake GPU 1"]
+    assert all(g["backend"] == "fake" for g in gpus)
+    for g in gpus:
+        assert 5.0 <= g["load"] <= 95.0
+        assert g["temp"] == pytest.approx(40.0 + g["load"] * 0.4)
+    # snap["gpu"] and the record fields are the first device
+    assert snap["gpu"] is gpus[0]
+    assert snap["gpu_load"] == pytest.approx(gpus[0]["load"], rel=1e-6)
+    assert snap["gpu_temp"] == pytest.approx(gpus[0]["temp"], rel=1e-6)
+    assert monitor.history.views(["gpu_load"])["gpu_load"][-1] == pytest.approx(gpus[0]["load"], rel=1e-6)
+
+    # not due again yet (1 s interval): the cached, frozen list is reused as is
+    assert monitor.snapshot(now + 0.25)["gpus"] is gpus
+    assert monitor.snapshot(now + 1.0)["gpus"] is not gpus
+
+    m = metrics(snap)
+    assert m["gpu_temp[1]"] == gpus[1]["temp"]
+    text = prometheus_text(Frame(now, snap, None))
+    assert f'autodash_gpu_load_percent{{gpu="1",name="Fake GPU 1"}} {gpus[1]["load"]!r}' in text.splitlines()
@@ -0,0 +1,86 @@
+import math
+import pytest
+
+from autodash.history import HistoryStore, TieredHistory
+from autodash.monitor import HistoryRecorder
+from autodash.snapshot import as_snapshot
+
+def nic(up, down):
+    return {"up_bps": up, "down_bps": down}
+
+def test_recorder_drops_devices_gone_for_a_window():
+    rec = HistoryRecorder(128, 1.0, tiers=[])
+    for i in range(400):
+        nics = {"eth0": nic(1.0, 2.0)}
+        if i < 10: nics["tun0"] = nic(3.0, 4.0)
+        rec.record(as_snapshot({"nics": nics}, float(i)))
+        if i == 100: assert "nic.tun0.up" in rec.history
+    assert "nic.tun0.up" not in rec.history and "nic.tun0.down" not in rec.history
+    assert rec.history.last("nic.eth0.up") == 1.0
+    # a device that comes back starts a fresh column
+    rec.record(as_snapshot({"nics": {"tun0": nic(5.0, 6.0)}}, 400.0))
+    assert rec.history.last("nic.tun0.down") == 6.0
+    assert math.isnan(rec.history.view("nic.tun0.down", 2)[0])
+
+def test_store_wraps_and_keeps_newest_contiguous():
+    h = HistoryStore(5, ["a"], margin=2)  # 7 slots
+    for i in range(20):
+        h.append(float(i), {"a": i * 10})
+    assert len(h) == 5
+    v = h.views(["t", "a"])
+    assert v["t"].tolist() == [15.0, 16.0, 17.0, 18.0, 19.0]
+    assert v["a"].tolist() == [150, 160, 170, 180, 190]
+    assert v["t"].base is not None and v["t"].flags["C_CONTIGUOUS"]  # views, not copies
+    assert h.views(["t"], 2)["t"].tolist() == [18.0, 19.0]
+    assert h.view("a", 99).tolist() == v["a"].tolist()
+    # a view survives `margin` further appends unchanged
+    h.append(20.0, {"a": 200}); h.append(21.0, {"a": 210})
+    assert v["t"].tolist() == [15.0, 16.0, 17.0, 18.0, 19.0]
+
+def test_missing_values_and_new_columns_are_nan():
+    h = HistoryStore(4, ["a"])
+    assert h.last("a") is None
+    h.append(0.0, {"a": 1.0})
+    h.append(1.0, {"a": None})
+    assert h.last("a") is None
+    h.add_column("b")
+    h.append(2.0, {"a": 3.0, "b": 4.0})
+    assert h.last("a") == 3.0 and h.last("b") == 4.0
+    b = h.view("b")
+    assert math.isnan(b[0]) and math.isnan(b[1]) and b[2] == 4.0
+    assert h.keys() == ["a", "b"]
+
+def test_rollup_min_mean_max_per_bucket():
+    raw = HistoryStore(100, ["a"])
+    tiers = TieredHistory(raw, 1.0, tiers=[(10, 100)])
+    for t in range(25):
+        tiers.append(float(t), {"a": None if t == 3 else float(t)})
+    _, store = tiers.tiers[1]
+    v = store.views(["t", "a", "a_min", "a_max"])
+    # buckets 0 and 10 are flushed; 20 is still being filled
+    assert v["t"].tolist() == [0.0, 10.0]
+    assert v["a"][0] == pytest.approx((45 - 3) / 9)  # the NaN sample is skipped, not counted as 0
+    assert v["a"][1] == pytest.approx(14.5)
+    assert v["a_min"].tolist() == [0.0, 10.0] and v["a_max"].tolist() == [9.0, 19.0]
+
+def test_rollup_bucket_without_samples_is_nan():
+    raw = HistoryStore(100, ["a"])
+    tiers = TieredHistory(raw, 1.0, tiers=[(10, 100)])
+    for t in range(12):
+        tiers.append(float(t), {})
+    _, store = tiers.tiers[1]
+    assert store.view("t").tolist() == [0.0]
+    assert store.last("a") is None and store.last("a_min") is None and store.last("a_max") is None
+
+def test_pick_tier_for_zoom_span():
+    raw = HistoryStore(100, ["a"])
+    tiers = TieredHistory(raw, 1.0, tiers=[(10, 100), (60, 100)])
+    for t in range(300):
+        tiers.append(float(t), {"a": 1.0})
+    # raw holds t = 200..299, the 10 s tier reaches back to 0
+    assert tiers.pick(250, 299)[0] == 1.0
+    assert tiers.pick(50, 299)[0] == 10
+    assert tiers.pick(250, 299, max_points=10)[0] == 10  # raw would need too many points
+    assert tiers.pick(0, 299, max_points=10)[0] == 60
+    # nothing reaches back that far: the tier with the oldest data wins
+    assert tiers.pick(-10000, 299)[0] == 10
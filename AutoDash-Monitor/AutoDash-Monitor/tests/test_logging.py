@@ -0,0 +1,34 @@
+import csv, datetime, os
+
+from autodash.logging_utils import LOG_FIELDS, LOG_SCHEMA, BinaryLogger, CSVLogger, _header_bytes, read_header
+from autodash.logreader import LogReader
+from autodash.snapshot import Snapshot
+
+def test_schema_changes_set_aside_without_overwriting(tmp_path):
+    today = tmp_path / f"metrics_{datetime.date.today().isoformat()}.adl"
+    for _ in range(3):  # three schema changes on the same day
+        today.write_bytes(_header_bytes({"version": 1, "fields": [["timestamp", "<f8"]]}) + b"\0" * 8)
+        BinaryLogger(str(tmp_path)).close()
+    stem = today.name[:-4]
+    assert sorted(os.listdir(tmp_path)) == sorted([today.name, f"{stem}.v1.adl", f"{stem}.v1-2.adl", f"{stem}.v1-3.adl"])
+    with open(today, "rb") as f:
+        assert read_header(f) == LOG_SCHEMA
+    assert len(LogReader(str(tmp_path)).query([])["timestamp"]) == 3  # set-aside files still read
+
+def test_binary_row_is_the_record(tmp_path):
+    snap = Snapshot.from_mapping({"cpu_total": 42.0}, 1234.5)
+    logger = BinaryLogger(str(tmp_path))
+    logger.log(snap)
+    logger.close()
+    data = LogReader(str(tmp_path)).query(["cpu_total"])
+    assert list(data["timestamp"]) == [1234.5] and list(data["cpu_total"]) == [42.0]
+
+def test_csv_with_old_columns_is_set_aside(tmp_path):
+    path = tmp_path / f"metrics_{datetime.date.today().isoformat()}.csv"
+    for _ in range(2):
+        path.write_text("timestamp,cpu_total\n1.0,2.0\n")
+        CSVLogger(str(tmp_path))
+    stem = path.name[:-4]
+    assert sorted(os.listdir(tmp_path)) == sorted([path.name, f"{stem}.old.csv", f"{stem}.old-2.csv"])
+    with open(path, newline="") as f:
+        assert next(csv.reader(f)) == LOG_FIELDS
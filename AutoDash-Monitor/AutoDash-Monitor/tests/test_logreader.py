@@ -0,0 +1,42 @@
+import datetime, time
+import numpy as np
+
+from autodash.history import HistoryStore, TieredHistory
+from autodash.logging_utils import LOG_SCHEMA, _header_bytes
+from autodash.logreader import LogReader
+from autodash.monitor import HISTORY_COLUMNS
+from autodash.snapshot import RECORD_FIELDS
+
+V1_SCHEMA = {"version": 1, "fields": [[name, dt] for name, dt in RECORD_FIELDS[:9]]}
+
+def write_log(path, schema, ts):
+    rows = np.zeros(len(ts), dtype=np.dtype([(name, dt) for name, dt in schema["fields"]]))
+    for name in rows.dtype.names:
+        rows[name] = 1.0
+    rows["timestamp"] = ts
+    with open(path, "wb") as f:
+        f.write(_header_bytes(schema))
+        f.write(rows.tobytes())
+
+def mixed_logs(tmp_path, now):
+    # today's file set aside by a schema change, next to the current one
+    date = datetime.date.fromtimestamp(now).isoformat()
+    write_log(tmp_path / f"metrics_{date}.v1.adl", V1_SCHEMA, now - 100 + np.arange(5.0))
+    write_log(tmp_path / f"metrics_{date}.adl", LOG_SCHEMA, now - 50 + np.arange(3.0))
+
+def test_query_aligns_fields_across_schemas(tmp_path):
+    now = time.time()
+    mixed_logs(tmp_path, now)
+    data = LogReader(str(tmp_path)).query(["cpu_total", "psi_cpu_some"], now - 200, now)
+    assert len(data["timestamp"]) == 8
+    assert np.all(np.diff(data["timestamp"]) > 0)
+    assert len(data["cpu_total"]) == len(data["psi_cpu_some"]) == 8
+    assert np.isnan(data["psi_cpu_some"][:5]).all()
+    assert (data["psi_cpu_some"][5:] == 1.0).all()
+    assert (data["cpu_total"] == 1.0).all()
+
+def test_load_history_across_schemas(tmp_path):
+    now = time.time()
+    mixed_logs(tmp_path, now)
+    tiers = TieredHistory(HistoryStore(100, HISTORY_COLUMNS), 1.0)
+    assert LogReader(str(tmp_path)).load_history(tiers, 3600, now) == 8
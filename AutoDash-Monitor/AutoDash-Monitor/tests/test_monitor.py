@@ -0,0 +1,37 @@
+import pytest
+
+from autodash.monitor import Monitor
+
+@pytest.fixture
+def monitor():
+    m = Monitor(gpu_backend="none", intervals={"battery": 30.0})
+    reads = []
+    def read_battery(now):
+        reads.append(now)
+        return {"battery": None, "battery_percent": 50.0 + len(reads)}
+    m._read_battery = read_battery
+    m.reads = reads
+    yield m
+    m.close()
+
+def test_collector_is_read_only_when_due(monitor):
+    t0 = 1000.0
+    snap = monitor.snapshot(t0)
+    assert monitor.reads == [t0] and snap["battery_percent"] == 51.0
+    # not due yet: the cached value is reused and its age reported
+    snap = monitor.snapshot(t0 + 10.0)
+    assert monitor.reads == [t0] and snap["battery_percent"] == 51.0
+    assert snap["age"]["battery_percent"] == pytest.approx(10.0)
+    assert snap["age"]["cpu_total"] == 0.0  # cpu (0.25 s) was read this tick
+    # up to 10 ms early still counts as due (timer jitter)
+    snap = monitor.snapshot(t0 + 29.995)
+    assert monitor.reads == [t0, t0 + 29.995] and snap["battery_percent"] == 52.0
+    assert snap["age"]["battery"] == 0.0
+    snap = monitor.snapshot(t0 + 29.995 + 29.98)
+    assert len(monitor.reads) == 2 and snap["battery_percent"] == 52.0
+
+def test_set_interval_applies_to_next_tick(monitor):
+    monitor.snapshot(0.0)
+    monitor.set_interval("battery", 1.0)
+    monitor.snapshot(1.0)
+    assert monitor.reads == [0.0, 1.0]
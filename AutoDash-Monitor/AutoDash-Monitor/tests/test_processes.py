@@ -0,0 +1,40 @@
+import contextlib, os
+from collections import namedtuple
+
+from autodash import processes
+from autodash.processes import ProcessTracker, list_processes
+
+Mem = namedtuple("Mem", ["rss"])
+
+class FakeProcess:
+    def __init__(self, pid, create_time, cpu):
+        self.pid, self._create_time, self._cpu = pid, create_time, cpu
+
+    def create_time(self): return self._create_time
+    def oneshot(self): return contextlib.nullcontext()
+    def memory_info(self): return Mem(1 << 20)
+    def name(self): return f"proc-{self._create_time:g}"
+    def cpu_percent(self): return self._cpu
+
+def test_reused_pid_gets_a_fresh_entry(monkeypatch):
+    tracker = ProcessTracker()
+    old, new = FakeProcess(100, 1.0, 5.0), FakeProcess(100, 2.0, 50.0)
+    monkeypatch.setattr(processes.psutil, "process_iter", lambda: iter([old]))
+    assert [p["name"] for p in tracker.poll()] == ["proc-1"]
+    # the same object stays tracked while create_time matches
+    monkeypatch.setattr(processes.psutil, "process_iter", lambda: iter([FakeProcess(100, 1.0, 0.0)]))
+    assert [p["cpu"] for p in tracker.poll()] == [5.0]
+    # same PID, different process (which already has more CPU time): not the stale entry
+    monkeypatch.setattr(processes.psutil, "process_iter", lambda: iter([new]))
+    assert [(p["name"], p["cpu"]) for p in tracker.poll()] == [("proc-2", 50.0)]
+    assert tracker._procs[100] == [new, 2.0]
+    # exited processes are dropped
+    monkeypatch.setattr(processes.psutil, "process_iter", lambda: iter([]))
+    assert list(tracker.poll()) == [] and len(tracker) == 0
+
+def test_lists_this_process():
+    tracker = ProcessTracker()
+    list_processes(limit=10000, tracker=tracker)
+    procs = list_processes(limit=10000, key="threads", tracker=tracker)
+    me = [p for p in procs if p["pid"] == os.getpid()]
+    assert me and me[0]["threads"] >= 1
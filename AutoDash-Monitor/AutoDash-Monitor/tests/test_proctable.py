@@ -0,0 +1,42 @@
+import pytest
+
+def proc(pid, cpu=0.0, name=None):
+    return {"pid": pid, "name": name or f"p{pid}", "cpu": cpu, "mem": 1.0, "rss": 1 << 20, "io": None,
+            "threads": 1, "files": None}
+
+@pytest.fixture
+def model(qapp):
+    from autodash.proctable import ProcessTableModel
+    m = ProcessTableModel()
+    m.events = []
+    m.dataChanged.connect(lambda a, b, roles: m.events.append(("changed", a.row(), a.column(), b.row(), b.column())))
+    m.rowsInserted.connect(lambda parent, first, last: m.events.append(("inserted", first, last)))
+    m.rowsRemoved.connect(lambda parent, first, last: m.events.append(("removed", first, last)))
+    m.modelReset.connect(lambda: m.events.append(("reset",)))
+    return m
+
+def pids(model):
+    return [model.pid_at(r) for r in range(model.rowCount())]
+
+def test_update_emits_only_what_changed(model):
+    from autodash.proctable import COLUMNS
+    cpu = [k for k, _ in COLUMNS].index("cpu")
+    model.update([proc(1), proc(2), proc(3), proc(4)])
+    assert model.events == [("inserted", 0, 3)]
+    model.events.clear()
+    # same processes, same values: no signals at all
+    model.update([proc(1), proc(2), proc(3), proc(4)])
+    assert model.events == []
+    # one cell changed
+    model.update([proc(1), proc(2, cpu=50.0), proc(3), proc(4)])
+    assert model.events == [("changed", 1, cpu, 1, cpu)]
+    assert model.data(model.index(1, cpu)) == "50.0"
+
+def test_update_removes_exited_and_appends_new(model):
+    model.update([proc(1), proc(2), proc(3), proc(4), proc(5)])
+    model.events.clear()
+    # 2 and 3 (one run) and 5 exit, 9 starts
+    model.update([proc(4), proc(9), proc(1)])
+    assert model.events == [("removed", 4, 4), ("removed", 1, 2), ("inserted", 2, 2)]
+    assert pids(model) == [1, 4, 9]
+    assert ("reset",) not in model.events
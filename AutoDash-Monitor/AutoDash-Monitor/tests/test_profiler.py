@@ -0,0 +1,26 @@
+import pytest
+
+from autodash.profiler import BUCKETS_PER_OCTAVE, Histogram
+
+WIDTH = 2 ** (1 / BUCKETS_PER_OCTAVE)  # relative width of one bucket
+
+def test_quantiles_of_known_distribution():
+    h = Histogram()
+    assert h.quantile(0.5) is None
+    # 1 ... 1000 µs, uniform
+    for us in range(1, 1001):
+        h.add(us * 1e-6)
+    for q in (0.1, 0.5, 0.9, 0.99):
+        assert h.quantile(q) == pytest.approx(q * 1e-3, rel=WIDTH - 1)
+    assert h.quantile(1.0) == pytest.approx(1e-3, rel=WIDTH - 1)
+    assert h.quantile(1.0) <= h.max == 1e-3
+
+def test_quantiles_of_a_long_tail():
+    h = Histogram()
+    for seconds, n in ((100e-6, 900), (1e-3, 90), (10e-3, 10)):
+        for _ in range(n):
+            h.add(seconds)
+    assert h.quantile(0.5) == pytest.approx(100e-6, rel=WIDTH - 1)
+    assert h.quantile(0.95) == pytest.approx(1e-3, rel=WIDTH - 1)
+    assert h.quantile(0.999) == 10e-3  # capped by the largest value seen
+    assert h.n == 1000 and h.total == pytest.approx(0.09 + 0.09 + 0.1)
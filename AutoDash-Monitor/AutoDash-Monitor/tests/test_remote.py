@@ -0,0 +1,82 @@
+import json, time
+import pytest
+
+from autodash.bus import SnapshotBus
+from autodash.remote import HEADER, Agent, Collector, DeltaDecoder, DeltaEncoder
+from autodash.sampler import Frame
+from autodash.snapshot import Snapshot
+
+def unpack(data):
+    (n,) = HEADER.unpack_from(data)
+    assert len(data) == HEADER.size + n
+    return json.loads(data[HEADER.size:])
+
+def test_delta_round_trip():
+    enc, dec = DeltaEncoder(keyframe_every=3), DeltaDecoder()
+    snaps = [{"cpu_total": 10.0, "ram_percent": 50.0, "temps": {"cpu": [{"label": "x", "current": 40.0}]}},
+             {"cpu_total": 10.04, "ram_percent": 51.0, "temps": {"cpu": [{"label": "x", "current": 40.0}]}},
+             {"cpu_total": 12.0, "ram_percent": 51.0}]
+    msgs = [unpack(enc.encode(float(i), s)) for i, s in enumerate(snaps)]
+    assert msgs[0]["k"] == 1
+    assert msgs[1]["d"] == {"ram_percent": 51.0}  # 10.04 rounds to the value already sent
+    assert msgs[2]["d"] == {"cpu_total": 12.0} and msgs[2]["r"] == ["temps"]
+    for msg in msgs:
+        state = dec.apply(msg)
+    assert state == {"cpu_total": 12.0, "ram_percent": 51.0}
+    assert unpack(enc.encode(3.0, snaps[0]))["k"] == 1  # every keyframe_every messages
+
+def wait_for(cond, timeout=5.0):
+    end = time.monotonic() + timeout
+    while not cond():
+        if time.monotonic() > end: raise AssertionError("timed out")
+        time.sleep(0.005)
+
+@pytest.fixture
+def loopback():
+    collector = Collector(port=0).start()  # ephemeral port
+    bus = SnapshotBus()
+    agent = Agent(bus, collector.address, name="agent-1", interval=None)
+    agent.start()
+    yield bus, agent, collector
+    agent.stop()
+    collector.stop()
+
+def test_agent_to_collector(loopback):
+    bus, agent, collector = loopback
+    wait_for(lambda: "agent-1" in collector.hosts and collector.hosts["agent-1"].connected)
+    host = collector.hosts["agent-1"]
+    samples = [{"cpu_total": 20.0, "ram_percent": 40.0, "net_down_bps": 1000.0, "cpu_per_core": [10.0, 30.0]},
+               {"cpu_total": 25.0, "ram_percent": 40.0, "net_down_bps": 1000.0, "cpu_per_core": [10.0, 40.0]},
+               {"cpu_total": 25.0, "ram_percent": 45.0, "net_down_bps": 3000.0, "cpu_per_core": [10.0, 40.0]}]
+    for i, s in enumerate(samples):
+        bus.publish(Frame(100.0 + i, Snapshot.from_mapping(s, 100.0 + i), None))
+        wait_for(lambda: host.received == i + 1)  # the agent keeps only the newest unsent frame
+    assert host.t == 102.0
+    assert host.snap["cpu_total"] == 25.0 and host.snap["ram_percent"] == 45.0
+    assert host.snap["cpu_per_core"] == [10.0, 40.0]
+    assert host.snap["net_down_bps"] == 3000.0
+    assert "age" not in host.snap
+    v = host.history.views(["t", "cpu_total", "net_down"])
+    assert list(v["t"]) == [100.0, 101.0, 102.0]
+    assert list(v["cpu_total"]) == [20.0, 25.0, 25.0]
+    assert list(v["net_down"]) == [1000.0, 1000.0, 3000.0]
+    assert collector.drain() == {"agent-1"}
+
+    agent.stop()
+    wait_for(lambda: not host.connected)
+    assert collector.summary()["connected"] == 0
+
+def test_fleet_view_shows_host(qapp, loopback):
+    from autodash.fleet import FleetView
+    bus, agent, collector = loopback
+    wait_for(lambda: "agent-1" in collector.hosts)
+    bus.publish(Frame(time.time(), Snapshot.from_mapping({"cpu_total": 33.0, "net_down_bps": 2048.0}), None))
+    wait_for(lambda: collector.hosts["agent-1"].received == 1)
+    view = FleetView(collector)
+    view.show()
+    view.refresh()
+    tile = view.tiles["agent-1"]
+    assert tile.cpu.value == 33.0
+    assert "2 KB/s" in tile.io.text()
+    assert "1 hosts, 1 connected" in view.status.text()
+    view.close()
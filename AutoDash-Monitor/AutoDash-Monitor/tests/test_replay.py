@@ -0,0 +1,136 @@
+import csv, time
+import numpy as np
+import pytest
+
+from autodash.bus import SnapshotBus
+from autodash.logging_utils import LOG_SCHEMA, _header_bytes
+from autodash.replay import ReplayMonitor, load_records
+from autodash.sampler import Sampler
+from autodash.snapshot import RECORD_DTYPE
+
+def records(ts, **fields):
+    rec = np.full(len(ts), np.nan, dtype=RECORD_DTYPE)
+    rec["timestamp"] = ts
+    rec["cpu_total"] = np.arange(len(ts))
+    for name, v in fields.items():
+        rec[name] = v
+    return rec
+
+def test_load_records_merges_and_dedupes(tmp_path):
+    rec = records(1000.0 + np.arange(6.0))
+    with open(tmp_path / "metrics_2026-01-01.adl", "wb") as f:
+        f.write(_header_bytes(LOG_SCHEMA))
+        f.write(rec[2:].tobytes())
+    with open(tmp_path / "metrics_2026-01-01.csv", "w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["timestamp", "cpu_total", "not_a_field"])
+        for r in rec[:4]:  # rows 2 and 3 are in both logs
+            w.writerow([repr(float(r["timestamp"])), repr(float(r["cpu_total"])), "7"])
+    out = load_records([str(tmp_path)])
+    assert list(out["timestamp"]) == list(rec["timestamp"])
+    assert list(out["cpu_total"]) == list(rec["cpu_total"])
+    assert len(load_records([str(tmp_path)], t0=1002.0, t1=1003.0)) == 2
+
+def test_step_and_tick_interval():
+    rec = records(np.array([0.0, 1.0, 2.0, 3.0, 60.0, 61.0]))  # one gap
+    assert ReplayMonitor(rec, speed=1.0, tiers=[]).tick_interval() == 1.0
+    assert ReplayMonitor(rec, speed=20.0, tiers=[]).tick_interval() == 0.05
+    assert ReplayMonitor(rec, speed=None, tiers=[]).tick_interval() == 0.0
+
+def test_end_of_log():
+    rec = records(1000.0 + np.arange(3.0), gpu_load=50.0)
+    r = ReplayMonitor(rec, speed=None, tiers=[])
+    snaps = [r.snapshot() for _ in range(3)]
+    assert [s.timestamp for s in snaps] == [1000.0, 1001.0, 1002.0]
+    assert snaps[0]["gpu"]["load"] == 50.0 and snaps[0]["gpu"]["backend"] == "replay"
+    assert not r.finished.is_set()
+    assert r.snapshot() is None and r.snapshot() is None
+    assert r.finished.is_set()
+    assert list(r.history.views(["t"])["t"]) == [1000.0, 1001.0, 1002.0]
+
+def play(rec, speed):
+    monitor = ReplayMonitor(rec, speed=speed, tiers=[])
+    bus = SnapshotBus()
+    frames = []
+    bus.subscribe(frames.append)
+    sampler = Sampler(monitor, bus=bus, proc_limit=0, tick_hist=monitor.stats.tick)
+    t0 = time.monotonic()
+    sampler.start()
+    assert monitor.finished.wait(10.0)
+    wall = time.monotonic() - t0
+    time.sleep(0.05)
+    assert not sampler.is_running()  # the sampler stops itself at the end
+    sampler.stop()
+    return monitor, frames, wall
+
+def test_paced_replay():
+    rec = records(1000.0 + np.arange(20.0))
+    monitor, frames, wall = play(rec, speed=50.0)  # 20 s of recording at 50x: 0.4 s
+    assert [f.t for f in frames] == list(rec["timestamp"])
+    assert 0.3 <= wall < 2.0
+    s = monitor.stats.summary()
+    assert s["tick"]["count"] == 20 and 0.3 <= s["wall"] < 2.0
+
+def test_max_speed_replay():
+    rec = records(1000.0 + np.arange(2000.0))
+    monitor, frames, wall = play(rec, speed=None)
+    assert len(frames) == 2000 and frames[-1].t == 2999.0
+    assert wall < 5.0
+    assert "2000 frames" in monitor.stats.format()
+
+def test_replay_in_main_window(qapp):
+    pytest.importorskip("pyqtgraph")
+    from autodash.main import MainWindow
+    rec = records(1000.0 + np.arange(50.0), ram_percent=40.0, net_up_bps=0.0, net_down_bps=0.0,
+                  disk_read_bps=0.0, disk_write_bps=0.0)
+    monitor = ReplayMonitor(rec, speed=None)
+    win = MainWindow(replay=monitor)
+    win.show()
+    end = time.monotonic() + 10.0
+    while win._replay_timer.isActive() and time.monotonic() < end:
+        qapp.processEvents()
+        time.sleep(0.01)
+    assert monitor.finished.is_set() and not win._replay_timer.isActive()
+    assert win._latest.t == 1049.0
+    assert monitor.stats.render.n >= 1
+    assert win.statusBar().currentMessage().startswith("replay: 50 frames")
+    assert win.logger is None
+    win.close()
+
+def test_speed_argument():
+    from autodash.__main__ import build_parser
+    parse = lambda *a: build_parser().parse_args(["--replay", "logs", *a]).speed
+    assert parse() == 1.0
+    assert parse("--speed", "max") is None
+    assert parse("--speed", "1") == 1.0 and parse("--speed", "100") == 100.0 and parse("--speed", "2.5") == 2.5
+    for bad in ("0", "-5", "100.5", "nan", "fast"):
+        with pytest.raises(SystemExit):
+            parse("--speed", bad)
+
+def test_hud_with_missing_fields(qapp):
+    from autodash.hud import HUD
+    from autodash.snapshot import Snapshot
+    from autodash.sampler import Frame
+    bus = SnapshotBus()
+    hud = HUD(bus)
+    hud.refresh(Frame(1.0, Snapshot.from_mapping({"cpu_total": 12.7}, 1.0), None))
+    assert hud.label.text() == "CPU 12% | RAM --% | NET ↓-- KB/s ↑-- KB/s"
+    hud.refresh(Frame(2.0, {"cpu_total": None, "ram_percent": 40.0, "net_down_bps": 4096.0}, None))
+    assert hud.label.text() == "CPU --% | RAM 40% | NET ↓4 KB/s ↑-- KB/s"
+    hud.close()
+
+def test_main_window_replays_sparse_records(qapp):
+    pytest.importorskip("pyqtgraph")
+    from autodash.main import MainWindow
+    monitor = ReplayMonitor(records(1000.0 + np.arange(5.0)), speed=None)  # only timestamp and cpu_total
+    win = MainWindow(replay=monitor)
+    win.show()
+    win.toggle_hud()
+    end = time.monotonic() + 10.0
+    while win._replay_timer.isActive() and time.monotonic() < end:
+        qapp.processEvents()
+        time.sleep(0.01)
+    assert win._latest.t == 1004.0
+    qapp.processEvents()
+    assert win.hud.label.text().startswith("CPU 4% | RAM --%")
+    win.close()
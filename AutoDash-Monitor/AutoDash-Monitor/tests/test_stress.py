@@ -0,0 +1,49 @@
+import os, time
+
+from autodash.stress import CPUStressor, _seek_read_into, _seek_write, format_results, page_cache_bypassed
+
+def test_stressor_reports_measured_busy():
+    s = CPUStressor()
+    s.start(workers=1, intensity=0.5)
+    try:
+        time.sleep(0.5)
+        s.rates()
+        time.sleep(1.0)
+        rates = s.rates()
+    finally:
+        s.stop()
+    assert rates[0] > 0
+    # nominal 50% duty cycle; what the worker got is measured, not assumed
+    assert 0.05 < s.busy[0] < 0.75
+
+def test_format_results_shows_requested_and_measured_load():
+    run = {"workload": "cpu", "workers": 2, "unit": "ops", "total_per_s": 2e6, "efficiency": 1.0, "target_load": 50.0}
+    results = {"runs": [dict(run, worker_load=41.0, achieved_load=63.0), run], "thermal": None}
+    lines = format_results(results).splitlines()
+    assert "load req/got" in lines[0]
+    assert lines[1].split()[-2:] == ["50%/41%", "63%"]
+    assert lines[2].split()[-2:] == ["50%/--", "--"]  # results saved before worker_load existed
+    assert "nominal, open-loop" in lines[-1]
+
+def test_seek_fallbacks_match_positional_io(tmp_path):
+    # what the disk workloads use where os.pwrite/pread are missing (Windows)
+    fd = os.open(tmp_path / "f", os.O_RDWR | os.O_CREAT)
+    try:
+        _seek_write(fd, b"x" * 4096, 8192)
+        _seek_write(fd, b"y" * 4096, 0)
+        buf = bytearray(4096)
+        assert _seek_read_into(fd, buf, 8192) == 4096
+        assert os.pread(fd, 3, 8192 - 1) == b"\0xx" and os.pread(fd, 2, 4095) == b"y\0"
+    finally:
+        os.close(fd)
+
+def test_cached_disk_rand_is_marked():
+    run = {"workload": "disk_rand", "workers": 1, "unit": "IOs", "total_per_s": 3e5, "target_load": 10.0}
+    lines = format_results({"runs": [dict(run, cached=True)], "thermal": None}).splitlines()
+    assert "IOs*" in lines[1] and lines[-1].startswith("* read from the page cache")
+    lines = format_results({"runs": [run], "thermal": None}).splitlines()
+    assert "IOs*" not in lines[1] and not lines[-1].startswith("*")
+
+def test_page_cache_probe(tmp_path):
+    assert page_cache_bypassed(str(tmp_path)) in (True, False)
+    assert list(tmp_path.iterdir()) == []